@@ -31,6 +31,7 @@ from .plugin_helpers import AppDataController
 from .plugin_manager import (ExtensionPoint, SingletonPlugin,
                              implements, PluginGlobals)
 from .protocol import Step
+from .startup_profile import PROFILE_STARTUP_PARSER, STARTUP_PROFILER
 
 
 logger = logging.getLogger(__name__)
@@ -43,11 +44,18 @@ PluginGlobals.push_env('microdrop')
 
 
 def parse_args(args=None):
-    """Parses arguments, returns (options, args)."""
+    """
+    Parses arguments, returns (options, args).
+
+    .. versionchanged:: 2.36.0
+        Add ``--profile-startup`` argument (see
+        :mod:`microdrop.startup_profile`).
+    """
     if args is None:
         args = sys.argv[1:]
 
-    parser = ArgumentParser(parents=[MICRODROP_PARSER])
+    parser = ArgumentParser(parents=[MICRODROP_PARSER,
+                                     PROFILE_STARTUP_PARSER])
     args = parser.parse_args(args)
     return args
 
@@ -136,7 +144,8 @@ class App(SingletonPlugin, AppDataController):
 
         # config model
         try:
-            self.config = Config(args.config)
+            with STARTUP_PROFILER.phase('load config'):
+                self.config = Config(args.config)
         except IOError:
             logging.error('Could not read configuration file, `%s`.  Make sure'
                           ' it exists and is readable.', args.config)
@@ -319,6 +328,20 @@ class App(SingletonPlugin, AppDataController):
         .. versionchanged:: 2.27
             Check for default device setting in ``MICRODROP_DEFAULT_DEVICE``
             environment variable.
+
+        .. versionchanged:: 2.36.0
+            Only import plugins listed in ``config['plugins']['enabled']``.
+            Import of other plugins is deferred until requested by the plugin
+            manager dialog.
+
+        .. versionchanged:: 2.36.0
+            Enable plugins that do not depend on each other (according to
+            ``on_plugin_enable`` schedule requests) concurrently (see
+            :func:`plugin_manager.emit_signal_concurrent`).
+
+        .. versionchanged:: 2.36.0
+            Time each startup phase if startup profiling is enabled (see
+            :mod:`microdrop.startup_profile`).
         '''
         logger = _L()  # use logger with method context
         self.gtk_thread = threading.current_thread()
@@ -326,9 +349,13 @@ class App(SingletonPlugin, AppDataController):
         # set realtime mode to false on startup
         if self.name in self.config.data and \
                 'realtime_mode' in self.config.data[self.name]:
-            self.config.data[self.name]['realtime_mode'] = False
+            self.config.update_section(self.name, {'realtime_mode': False},
+                                       mark_dirty=False)
 
-        plugin_manager.emit_signal('on_plugin_enable')
+        with STARTUP_PROFILER.phase('enable core plugins'):
+            plugin_manager.emit_signal_concurrent('on_plugin_enable',
+                                                  durations=STARTUP_PROFILER
+                                                  .plugin_enable)
         log_file = self.get_app_values()['log_file']
         if not log_file:
             self.set_app_values({'log_file':
@@ -350,9 +377,12 @@ class App(SingletonPlugin, AppDataController):
         site_plugins_dir = ph.path(sys.prefix).joinpath('etc', 'microdrop',
                                                         'plugins', 'enabled')
         plugins_dirs += [site_plugins_dir]
-        for d in plugins_dirs:
-            if d.isdir():
-                plugin_manager.load_plugins(d, import_from_parent=False)
+        with STARTUP_PROFILER.phase('load plugins'):
+            for d in plugins_dirs:
+                if d.isdir():
+                    plugin_manager.load_plugins(d, import_from_parent=False,
+                                                enabled=self.config['plugins']
+                                                ['enabled'])
         self.update_log_file()
 
         logger.info('User data directory: %s', self.config['data_dir'])
@@ -380,21 +410,20 @@ class App(SingletonPlugin, AppDataController):
                 logger.error(exception, exc_info=True)
         # Remove marked plugins from "enabled" list to prevent trying to enable
         # it on future launches.
-        for package_name_i in plugins_to_disable_by_default:
-            self.config['plugins']['enabled'].remove(package_name_i)
+        if plugins_to_disable_by_default:
+            with self.config.locked() as data:
+                enabled = [package_name_i
+                           for package_name_i in data['plugins']['enabled']
+                           if package_name_i not in
+                           plugins_to_disable_by_default]
+                self.config.update_section('plugins', {'enabled': enabled})
 
         schedule = plugin_manager.get_schedule(observers, "on_plugin_enable")
 
         # Load optional plugins marked as enabled in config
-        for p in schedule:
-            try:
-                plugin_manager.enable(p)
-            except KeyError:
-                logger.warning('Requested plugin (%s) is not available.\n\n'
-                               'Please check that it exists in the plugins '
-                               'directory:\n\n    %s' %
-                               (p, self.config['plugins']['directory']),
-                               exc_info=True)
+        with STARTUP_PROFILER.phase('enable plugins'):
+            plugin_manager.enable_all(schedule, durations=STARTUP_PROFILER
+                                      .plugin_enable)
         plugin_manager.log_summary()
 
         self.experiment_log = None
@@ -412,7 +441,7 @@ class App(SingletonPlugin, AppDataController):
                 # No default device set in environment variable.
                 # Select first available device in device directory.
                 device_name = device_directory.dirs()[0].name
-            self.config['dmf_device']['name'] = device_name
+            self.config.update_section('dmf_device', {'name': device_name})
 
         # load the device from the config file
         if self.config['dmf_device']['name']:
@@ -420,12 +449,13 @@ class App(SingletonPlugin, AppDataController):
                 device_path = os.path.join(device_directory,
                                            self.config['dmf_device']['name'],
                                            DEVICE_FILENAME)
-                self.dmf_device_controller.load_device(device_path)
+                with STARTUP_PROFILER.phase('load device'):
+                    self.dmf_device_controller.load_device(device_path)
 
         # if we successfully loaded a device
         if self.dmf_device:
             # reapply the protocol name to the config file
-            self.config['protocol']['name'] = protocol_name
+            self.config.update_section('protocol', {'name': protocol_name})
 
             # load the protocol
             if self.config['protocol']['name']:
@@ -435,7 +465,8 @@ class App(SingletonPlugin, AppDataController):
                                             self.config['dmf_device']['name'],
                                             "protocols",
                                             self.config['protocol']['name'])
-                    self.protocol_controller.load_protocol(filename)
+                    with STARTUP_PROFILER.phase('load protocol'):
+                        self.protocol_controller.load_protocol(filename)
 
         if os.environ.get('MICRODROP_FIRST_RUN'):
             # Use default options for window allocation.
@@ -443,11 +474,38 @@ class App(SingletonPlugin, AppDataController):
         else:
             data = self.get_app_values()
 
-        self.main_window_controller.view.resize(data['width'], data['height'])
-        self.main_window_controller.view.move(data['x'], data['y'])
-        plugin_manager.emit_signal('on_gui_ready')
+        with STARTUP_PROFILER.phase('GUI setup'):
+            self.main_window_controller.view.resize(data['width'],
+                                                    data['height'])
+            self.main_window_controller.view.move(data['x'], data['y'])
+            plugin_manager.emit_signal('on_gui_ready')
+        if STARTUP_PROFILER.enabled:
+            self._save_startup_profile()
         self.main_window_controller.main()
 
+    def _save_startup_profile(self):
+        '''
+        Save startup profiling report to ``startup-profiles`` directory in
+        data directory.
+
+        .. versionadded:: 2.36.0
+        '''
+        plugin_versions = {}
+        for name in plugin_manager.get_service_names(env='microdrop.managed'):
+            service = plugin_manager.get_service_instance_by_name(name)
+            if service.enabled():
+                plugin_versions[name] = str(getattr(service, 'version', None))
+        try:
+            report_path = STARTUP_PROFILER.save(ph.path(self.config
+                                                        ['data_dir'])
+                                                .joinpath('startup-profiles'),
+                                                version=__version__,
+                                                plugins=plugin_versions)
+        except Exception:
+            _L().error('Error saving startup profile.', exc_info=True)
+        else:
+            _L().info('Saved startup profile: %s', report_path)
+
     def _set_log_level(self, level):
         '''
         .. versionchanged:: 2.20
@@ -14,11 +14,29 @@ def get_app():
     return plugin_manager.get_service_instance(class_, env='microdrop')
 
 
-def get_hub_uri():
+def get_hub_uri(external=False):
+    '''
+    .. versionchanged:: 2.36.0
+        Return in-process hub URI if hub is running in a thread of the
+        current process, unless :data:`external` is ``True``.
+
+    Parameters
+    ----------
+    external : bool, optional
+        If ``True``, return hub URI for plugins in other processes.
+
+    Returns
+    -------
+    str
+        Hub query URI.
+    '''
     from plugin_manager import get_service_instance_by_name
 
     hub_plugin = get_service_instance_by_name('microdrop.zmq_hub_plugin',
                                               env='microdrop')
+    inproc_uri = getattr(hub_plugin, 'inproc_uri', None)
+    if inproc_uri is not None and not external:
+        return inproc_uri
     hub_uri = hub_plugin.get_app_values().get('hub_uri')
     if hub_uri is not None:
         return hub_uri.replace('*', 'localhost')
@@ -42,8 +60,13 @@ MODE_REAL_TIME_MASK = MODE_REAL_TIME_PROGRAMMING | MODE_REAL_TIME_RUNNING
 MODE_RUNNING_MASK = MODE_RUNNING | MODE_REAL_TIME_RUNNING
 MODE_PROGRAMMING_MASK = MODE_PROGRAMMING | MODE_REAL_TIME_PROGRAMMING
 
-SCREEN_HEIGHT = int(os.environ.get('SCREEN_HEIGHT', gtk.gdk.screen_height()))
-SCREEN_WIDTH = int(os.environ.get('SCREEN_WIDTH', gtk.gdk.screen_width()))
+# .. versionchanged:: 2.36.0
+#     Only query screen dimensions if not set through environment variables
+#     (e.g., to support running without a display).
+SCREEN_HEIGHT = int(os.environ['SCREEN_HEIGHT'] if 'SCREEN_HEIGHT' in os.environ
+                    else gtk.gdk.screen_height())
+SCREEN_WIDTH = int(os.environ['SCREEN_WIDTH'] if 'SCREEN_WIDTH' in os.environ
+                   else gtk.gdk.screen_width())
 SCREEN_LEFT = int(os.environ.get('SCREEN_LEFT', 0))
 SCREEN_TOP = int(os.environ.get('SCREEN_TOP', 0))
 TITLEBAR_HEIGHT = int(os.environ.get('TITLEBAR_HEIGHT', 23))
@@ -0,0 +1,227 @@
+'''
+Benchmark full state vs. delta electrode actuation requests.
+
+Execute a sequence of actuations on simulated devices (120 and 480
+electrodes by default), where a few electrodes change state between
+consecutive actuations (e.g., droplets moving to neighbouring electrodes),
+and compare:
+
+ - ``full``: the full actuation state is sent to the actuator for each
+   actuation (i.e., the ``on-actuation-request`` signal); and
+ - ``delta``: only the electrodes turned on/off since the previous
+   actuation are sent (i.e., the ``on-actuation-delta-request`` signal; see
+   :class:`microdrop.core_plugins.electrode_controller_plugin.execute
+   .CommittedElectrodeStates`).
+
+Actuations are executed with the simulated actuator (see
+:mod:`microdrop.core_plugins.simulated_actuator_plugin`) without any
+simulated delays, so the measured time is the overhead of the actuation
+path itself.
+
+Example
+-------
+
+    python -m microdrop.bin.benchmark_actuation -n 500 --channels 120 480
+
+.. versionadded:: 2.36.0
+'''
+import argparse
+import cPickle as pickle
+import json
+import random
+import sys
+import timeit
+
+import blinker
+import numpy as np
+import pandas as pd
+import trollius as asyncio
+
+
+def parse_args(args=None):
+    '''Parses arguments, returns (options, args).'''
+    if args is None:
+        args = sys.argv[1:]
+
+    parser = argparse.ArgumentParser(description='Benchmark full state vs. '
+                                     'delta electrode actuation requests.')
+    parser.add_argument('-n', '--repeats', type=int, default=200,
+                        help='Number of actuations per device and method '
+                        '(default: %(default)s).')
+    parser.add_argument('--channels', type=int, nargs='+', default=[120, 480],
+                        help='Number of electrodes of each simulated device '
+                        '(default: %(default)s).')
+    parser.add_argument('--actuated', type=float, default=.25,
+                        help='Fraction of electrodes actuated at any time '
+                        '(default: %(default)s).')
+    parser.add_argument('--changed', type=int, default=4,
+                        help='Number of electrodes changed between '
+                        'consecutive actuations (default: %(default)s).')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Random seed (default: %(default)s).')
+    parser.add_argument('--json', action='store_true',
+                        help='Output results as JSON.')
+
+    return parser.parse_args(args)
+
+
+def simulated_states(electrode_ids, repeats, actuated, changed, seed=0):
+    '''
+    Parameters
+    ----------
+    electrode_ids : list
+        Electrode IDs.
+    repeats : int
+        Number of actuation states.
+    actuated : float
+        Fraction of electrodes actuated in each state.
+    changed : int
+        Number of actuated electrodes moved to a different (non-actuated)
+        electrode between consecutive states.
+    seed : int, optional
+        Random seed.
+
+    Returns
+    -------
+    list[pandas.Series]
+        Electrode states, indexed by electrode ID.
+    '''
+    random_ = random.Random(seed)
+    on = set(random_.sample(electrode_ids, int(actuated * len(electrode_ids))))
+    states = []
+    for i in xrange(repeats):
+        states.append(pd.Series(1, index=sorted(on)))
+        off = sorted(set(electrode_ids) - on)
+        n = min(changed, len(on), len(off))
+        on.difference_update(random_.sample(sorted(on), n))
+        on.update(random_.sample(off, n))
+    return states
+
+
+def benchmark_actuation(states, delta):
+    '''
+    Parameters
+    ----------
+    states : list[pandas.Series]
+        Electrode states of each actuation (see :func:`simulated_states`).
+    delta : bool
+        If ``True``, send delta actuation requests.
+
+    Returns
+    -------
+    dict
+        Mean duration of each actuation (``mean_ms``), and mean number of
+        electrodes (``mean_electrodes``) and mean pickled size
+        (``mean_bytes``) of each request sent to the actuator.
+    '''
+    from ..core_plugins.electrode_controller_plugin.execute import \
+        CommittedElectrodeStates, execute_actuation
+    from ..core_plugins import simulated_actuator_plugin
+    from ..plugin_manager import get_service_instance_by_name
+
+    actuator = get_service_instance_by_name(simulated_actuator_plugin
+                                            .SimulatedActuatorPlugin
+                                            .plugin_name, env='microdrop')
+    actuator.configure(time_scale=0, delta=delta)
+    actuator.clear_trace()
+
+    sizes = []
+
+    @asyncio.coroutine
+    def on_actuation_request(electrode_states, duration_s=0,
+                             volume_threshold=None):
+        sizes.append((len(electrode_states),
+                      len(pickle.dumps(electrode_states, -1))))
+        result = yield asyncio.From(actuator
+                                    .on_actuation_request(electrode_states,
+                                                          duration_s))
+        raise asyncio.Return(result)
+
+    @asyncio.coroutine
+    def on_actuation_delta_request(electrode_states, duration_s=0,
+                                   full=False):
+        sizes.append((len(electrode_states),
+                      len(pickle.dumps(electrode_states, -1))))
+        result = yield asyncio.From(actuator
+                                    .on_actuation_delta_request
+                                    (electrode_states, duration_s, full=full))
+        raise asyncio.Return(result)
+
+    signals = blinker.Namespace()
+    if delta:
+        signals.signal('on-actuation-delta-request')\
+            .connect(on_actuation_delta_request, weak=False)
+    else:
+        signals.signal('on-actuation-request')\
+            .connect(on_actuation_request, weak=False)
+    committed = CommittedElectrodeStates() if delta else None
+
+    @asyncio.coroutine
+    def _run():
+        durations = []
+        for states_i in states:
+            start = timeit.default_timer()
+            yield asyncio.From(execute_actuation(signals, states_i,
+                                                 pd.Series(), 100, 10e3, 0,
+                                                 waveform=False,
+                                                 committed=committed))
+            durations.append(timeit.default_timer() - start)
+        raise asyncio.Return(durations)
+
+    loop = asyncio.new_event_loop()
+    try:
+        asyncio.set_event_loop(loop)
+        durations = loop.run_until_complete(_run())
+    finally:
+        loop.close()
+
+    sizes = np.array(sizes, dtype=float)
+    return {'mean_ms': float(1e3 * np.mean(durations)),
+            'mean_electrodes': float(sizes[:, 0].mean()),
+            'mean_bytes': float(sizes[:, 1].mean())}
+
+
+def main(args=None):
+    '''
+    Parameters
+    ----------
+    args : argparse.Namespace, optional
+        Arguments as parsed by :func:`parse_args`.
+
+    Returns
+    -------
+    int
+        Return code.
+    '''
+    if args is None:
+        args = parse_args()
+
+    results = {}
+    for channels_i in args.channels:
+        electrode_ids = ['electrode%03d' % i for i in xrange(channels_i)]
+        states = simulated_states(electrode_ids, args.repeats, args.actuated,
+                                  args.changed, seed=args.seed)
+        results[channels_i] = {method_i: benchmark_actuation(states, delta)
+                               for method_i, delta in (('full', False),
+                                                       ('delta', True))}
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=4)
+        print
+        return 0
+
+    print '%d actuations per device and method:' % args.repeats
+    for channels_i in args.channels:
+        print '  %d electrodes:' % channels_i
+        for method_i in ('full', 'delta'):
+            print ('    %-6s mean: %7.3f ms, request: %7.1f electrodes, '
+                   '%8.1f bytes' % ((method_i, ) +
+                                    tuple(results[channels_i][method_i][k]
+                                          for k in ('mean_ms',
+                                                    'mean_electrodes',
+                                                    'mean_bytes'))))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
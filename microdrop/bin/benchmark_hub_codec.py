@@ -0,0 +1,266 @@
+'''
+Benchmark hub message encoding across message sizes.
+
+Compare round trips of :mod:`pandas` payloads (an electrode states
+:class:`pandas.Series` and an SVG vertex :class:`pandas.DataFrame`, each
+with ``N`` rows) using:
+
+ - ``json``: default JSON encoding (i.e.,
+   :class:`zmq_plugin.schema.PandasJsonEncoder` and
+   :func:`zmq_plugin.schema.pandas_object_hook`); and
+ - ``msgpack``: packed encoding (see :mod:`microdrop.hub_codec`).
+
+By default, only the encode/decode round trip is measured.  With ``--hub``,
+each payload is echoed by a plugin through a ZeroMQ hub (started in a
+separate process), i.e., a full request/reply round trip.
+
+Example
+-------
+
+    python -m microdrop.bin.benchmark_hub_codec --sizes 100 1000 10000
+    python -m microdrop.bin.benchmark_hub_codec --hub -n 20
+
+.. versionadded:: 2.36.0
+'''
+from multiprocessing import Process
+import argparse
+import json
+import logging
+import sys
+import threading
+import timeit
+
+import numpy as np
+import pandas as pd
+
+
+def parse_args(args=None):
+    '''Parses arguments, returns (options, args).'''
+    if args is None:
+        args = sys.argv[1:]
+
+    parser = argparse.ArgumentParser(description='Benchmark hub message '
+                                     'encoding across message sizes.')
+    parser.add_argument('-n', '--repeats', type=int, default=50,
+                        help='Number of round trips per payload, size, and '
+                        'encoding (default: %(default)s).')
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[10, 100, 1000, 10000, 100000],
+                        help='Number of payload rows (default: '
+                        '%(default)s).')
+    parser.add_argument('--hub', action='store_true',
+                        help='Measure full request/reply round trips '
+                        'through a ZeroMQ hub.')
+    parser.add_argument('--hub-uri', default='tcp://127.0.0.1:31100',
+                        help='Hub URI to bind with `--hub` (default: '
+                        '%(default)s).')
+    parser.add_argument('--json', action='store_true',
+                        help='Output results as JSON.')
+
+    return parser.parse_args(args)
+
+
+def payloads(size):
+    '''
+    Parameters
+    ----------
+    size : int
+        Number of rows.
+
+    Returns
+    -------
+    dict
+        Electrode states (``series``) and SVG vertices (``frame``) payloads.
+    '''
+    electrode_ids = ['electrode%03d' % i for i in xrange(size)]
+    random = np.random.RandomState(0)
+    return {'series': pd.Series(random.randint(0, 2, size),
+                                index=electrode_ids),
+            'frame': pd.DataFrame({'id': electrode_ids,
+                                   'vertex_i': np.arange(size),
+                                   'x': random.rand(size),
+                                   'y': random.rand(size)},
+                                  columns=['id', 'vertex_i', 'x', 'y'])}
+
+
+def codec_round_trips():
+    '''
+    Returns
+    -------
+    dict
+        Encode/decode round trip function for each encoding, each returning
+        the decoded payload and the encoded size (in bytes).
+    '''
+    from zmq_plugin.schema import PandasJsonEncoder, pandas_object_hook
+    from ..hub_codec import decode_data, encode_data, msgpack_available
+
+    def _json(payload):
+        encoded = json.dumps({'payload': payload}, cls=PandasJsonEncoder)
+        return (json.loads(encoded, object_hook=pandas_object_hook)
+                ['payload'], len(encoded))
+
+    def _msgpack(payload):
+        encoded = json.dumps(encode_data({'payload': payload}))
+        return decode_data(json.loads(encoded))['payload'], len(encoded)
+
+    round_trips = {'json': _json}
+    if msgpack_available():
+        round_trips['msgpack'] = _msgpack
+    return round_trips
+
+
+class HubEcho(object):
+    '''
+    Echo plugin connected to a ZeroMQ hub (started in a separate process).
+
+    Parameters
+    ----------
+    hub_uri : str
+        Hub URI to bind.
+    '''
+    def __init__(self, hub_uri):
+        from zmq_plugin.bin.hub import run_hub
+        from zmq_plugin.hub import Hub
+        from zmq_plugin.plugin import Plugin as ZmqPlugin
+        from ..hub_codec import decode_content_data, msgpack_reply
+
+        class EchoZmqPlugin(ZmqPlugin):
+            @msgpack_reply
+            def on_execute__echo(self, request):
+                return decode_content_data(request)['payload']
+
+        self.hub_process = Process(target=run_hub,
+                                   args=(Hub(hub_uri, 'benchmark_hub'),
+                                         logging.WARNING))
+        self.hub_process.daemon = True
+        self.hub_process.start()
+
+        connect_uri = hub_uri.replace('*', 'localhost')
+        self.echo = EchoZmqPlugin('benchmark_echo', connect_uri)
+        self.client = ZmqPlugin('benchmark_client', connect_uri)
+        self.stopped = threading.Event()
+        ready = threading.Event()
+        self.thread = threading.Thread(target=self._listen, args=(ready, ))
+        self.thread.daemon = True
+        self.thread.start()
+        ready.wait()
+        self.client.reset()
+
+    def _listen(self, ready):
+        import zmq
+
+        self.echo.reset()
+        ready.set()
+        while not self.stopped.wait(.001):
+            try:
+                msg_frames = self.echo.command_socket\
+                    .recv_multipart(zmq.NOBLOCK)
+                self.echo.on_command_recv(msg_frames)
+            except zmq.Again:
+                pass
+
+    def round_trips(self):
+        '''
+        Returns
+        -------
+        dict
+            Hub request/reply round trip function for each encoding.
+        '''
+        from ..hub_codec import decode_data, msgpack_available, packed_kwargs
+
+        def _json(payload):
+            return self.client.execute('benchmark_echo', 'echo',
+                                       payload=payload), None
+
+        def _msgpack(payload):
+            return decode_data(self.client
+                               .execute('benchmark_echo', 'echo',
+                                        **packed_kwargs(payload=payload))), \
+                None
+
+        round_trips = {'json': _json}
+        if msgpack_available():
+            round_trips['msgpack'] = _msgpack
+        return round_trips
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+        self.hub_process.terminate()
+
+
+def benchmark(round_trips, sizes, repeats):
+    '''
+    Parameters
+    ----------
+    round_trips : dict
+        Round trip function for each encoding.
+    sizes : list[int]
+        Number of payload rows.
+    repeats : int
+        Number of round trips per payload, size, and encoding.
+
+    Returns
+    -------
+    list[dict]
+        One record per payload, size, and encoding, with the mean round trip
+        duration (``mean_ms``) and encoded size (``bytes``, if available).
+    '''
+    results = []
+    for size in sizes:
+        for name, payload in sorted(payloads(size).iteritems()):
+            for encoding, round_trip in sorted(round_trips.iteritems()):
+                decoded, length = round_trip(payload)
+                if not decoded.equals(payload):
+                    raise ValueError('%s round trip of %s (size=%d) is not '
+                                     'equal to payload.' % (encoding, name,
+                                                            size))
+                start = timeit.default_timer()
+                for i in xrange(repeats):
+                    round_trip(payload)
+                duration_s = (timeit.default_timer() - start) / repeats
+                results.append({'payload': name, 'size': size,
+                                'encoding': encoding,
+                                'mean_ms': 1e3 * duration_s,
+                                'bytes': length})
+    return results
+
+
+def main(args=None):
+    '''
+    Parameters
+    ----------
+    args : argparse.Namespace, optional
+        Arguments as parsed by :func:`parse_args`.
+
+    Returns
+    -------
+    int
+        Return code.
+    '''
+    if args is None:
+        args = parse_args()
+
+    if args.hub:
+        hub_echo = HubEcho(args.hub_uri)
+        try:
+            results = benchmark(hub_echo.round_trips(), args.sizes,
+                                args.repeats)
+        finally:
+            hub_echo.stop()
+    else:
+        results = benchmark(codec_round_trips(), args.sizes, args.repeats)
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=4)
+        print
+        return 0
+
+    df_results = pd.DataFrame(results).set_index(['payload', 'size',
+                                                  'encoding'])
+    print df_results.unstack('encoding').to_string()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,170 @@
+'''
+Benchmark multi-droplet route planning.
+
+Plan non-colliding routes (see :class:`microdrop.droplet_routing
+.DropletRouter`) for random sets of droplets on a synthetic grid device
+(1,000 electrodes by default), and report, for each number of droplets:
+
+ - the planning time;
+ - the number of time steps of the planned routes (i.e., the *makespan*);
+   and
+ - the lower bound of the makespan, i.e., the longest shortest path of any
+   droplet ignoring all other droplets.
+
+Example
+-------
+
+    python -m microdrop.bin.benchmark_routing -n 20 --droplets 4 8 16 32
+
+.. versionadded:: 2.36.0
+'''
+import argparse
+import json
+import sys
+import timeit
+
+import numpy as np
+
+
+def parse_args(args=None):
+    '''Parses arguments, returns (options, args).'''
+    if args is None:
+        args = sys.argv[1:]
+
+    parser = argparse.ArgumentParser(description='Benchmark multi-droplet '
+                                     'route planning.')
+    parser.add_argument('-n', '--repeats', type=int, default=10,
+                        help='Number of random droplet sets per number of '
+                        'droplets (default: %(default)s).')
+    parser.add_argument('--rows', type=int, default=25,
+                        help='Synthetic device grid rows (default: '
+                        '%(default)s).')
+    parser.add_argument('--columns', type=int, default=40,
+                        help='Synthetic device grid columns (default: '
+                        '%(default)s).')
+    parser.add_argument('--droplets', type=int, nargs='+',
+                        default=[2, 4, 8, 16, 32],
+                        help='Number of droplets (default: %(default)s).')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Random seed (default: %(default)s).')
+    parser.add_argument('--json', action='store_true',
+                        help='Output results as JSON.')
+
+    return parser.parse_args(args)
+
+
+def random_droplets(router, count, random):
+    '''
+    Parameters
+    ----------
+    router : microdrop.droplet_routing.DropletRouter
+    count : int
+        Number of droplets.
+    random : numpy.random.RandomState
+
+    Returns
+    -------
+    list[tuple]
+        Source and target electrode ID of each droplet, where no sources (or
+        targets) are on the same or neighbouring electrodes.
+    '''
+    while True:
+        indexes = random.choice(len(router.electrode_ids), 2 * count,
+                                replace=False)
+        if not (router._conflicts(indexes[:count]) or
+                router._conflicts(indexes[count:])):
+            electrode_ids = router.electrode_ids[indexes]
+            return zip(electrode_ids[:count], electrode_ids[count:])
+
+
+def benchmark_routing(router, count, repeats, random):
+    '''
+    Parameters
+    ----------
+    router : microdrop.droplet_routing.DropletRouter
+    count : int
+        Number of droplets.
+    repeats : int
+        Number of random droplet sets.
+    random : numpy.random.RandomState
+
+    Returns
+    -------
+    dict
+        Mean and maximum planning time (``mean_ms``, ``max_ms``), mean
+        makespan (``mean_steps``), mean makespan lower bound
+        (``mean_min_steps``), and number of droplet sets that could not be
+        routed (``failed``).
+    '''
+    from ..droplet_routing import RoutingError
+
+    durations = []
+    steps = []
+    min_steps = []
+    failed = 0
+    for i in xrange(repeats):
+        droplets = random_droplets(router, count, random)
+        start = timeit.default_timer()
+        try:
+            routes = router.route(droplets)
+        except RoutingError:
+            failed += 1
+            continue
+        finally:
+            durations.append(timeit.default_timer() - start)
+        steps.append(routes.shape[0] - 1)
+        min_steps.append(max(router.distances(target)[source]
+                             for source, target in droplets))
+    durations_ms = 1e3 * np.asarray(durations)
+    return {'mean_ms': float(durations_ms.mean()),
+            'max_ms': float(durations_ms.max()),
+            'mean_steps': float(np.mean(steps)) if steps else None,
+            'mean_min_steps': (float(np.mean(min_steps)) if min_steps
+                               else None),
+            'failed': failed}
+
+
+def main(args=None):
+    '''
+    Parameters
+    ----------
+    args : argparse.Namespace, optional
+        Arguments as parsed by :func:`parse_args`.
+
+    Returns
+    -------
+    int
+        Return code.
+    '''
+    from ..droplet_routing import DropletRouter, grid_adjacency
+
+    if args is None:
+        args = parse_args()
+
+    router = DropletRouter(*grid_adjacency(args.rows, args.columns))
+    random = np.random.RandomState(args.seed)
+    results = {count: benchmark_routing(router, count, args.repeats, random)
+               for count in args.droplets}
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=4)
+        print
+        return 0
+
+    print ('%dx%d grid (%d electrodes), %d droplet sets per count:' %
+           (args.rows, args.columns, len(router.electrode_ids),
+            args.repeats))
+    for count in args.droplets:
+        result = results[count]
+        print ('  %3d droplets  mean: %8.2f ms, max: %8.2f ms, steps: %s '
+               '(lower bound: %s), failed: %d' %
+               (count, result['mean_ms'], result['max_ms'],
+                '-' if result['mean_steps'] is None
+                else '%.1f' % result['mean_steps'],
+                '-' if result['mean_min_steps'] is None
+                else '%.1f' % result['mean_min_steps'], result['failed']))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,144 @@
+'''
+Benchmark single step execution latency.
+
+Compare the latency (from submission until the result is available) of
+executing a step:
+
+ - ``thread``: on a new trollius event loop in a thread pool (i.e., how
+   ``ProtocolController.run_step`` executed steps prior to version 2.36.0);
+   and
+ - ``loop``: on a persistent event loop thread (see
+   :class:`microdrop.core_plugins.protocol_controller.execution_loop
+   .ExecutionLoop`).
+
+Steps are executed without any plugins enabled, so the measured latency is
+the overhead of step execution itself.
+
+Example
+-------
+
+    python -m microdrop.bin.benchmark_run_step -n 500
+
+.. versionadded:: 2.36.0
+'''
+import argparse
+import json
+import sys
+import timeit
+
+from asyncio_helpers import cancellable
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+
+def parse_args(args=None):
+    '''Parses arguments, returns (options, args).'''
+    if args is None:
+        args = sys.argv[1:]
+
+    parser = argparse.ArgumentParser(description='Benchmark single step '
+                                     'execution latency.')
+    parser.add_argument('-n', '--repeats', type=int, default=200,
+                        help='Number of steps to execute with each method '
+                        '(default: %(default)s).')
+    parser.add_argument('--json', action='store_true',
+                        help='Output latencies summary as JSON.')
+
+    return parser.parse_args(args)
+
+
+def summarize(durations):
+    '''
+    Parameters
+    ----------
+    durations : list[float]
+        Durations (in seconds).
+
+    Returns
+    -------
+    dict
+        Mean, median, 95th percentile, and maximum duration (in
+        milliseconds).
+    '''
+    durations_ms = 1e3 * np.asarray(durations)
+    return {'mean_ms': float(durations_ms.mean()),
+            'median_ms': float(np.median(durations_ms)),
+            'p95_ms': float(np.percentile(durations_ms, 95)),
+            'max_ms': float(durations_ms.max())}
+
+
+def benchmark_run_step(repeats):
+    '''
+    Parameters
+    ----------
+    repeats : int
+        Number of steps to execute with each method.
+
+    Returns
+    -------
+    dict
+        Latency summary (see :func:`summarize`) for each method (i.e.,
+        ``thread`` and ``loop``).
+    '''
+    from ..core_plugins.protocol_controller.execute import execute_step
+    from ..core_plugins.protocol_controller.execution_loop import \
+        ExecutionLoop
+
+    plugin_kwargs = {}
+    results = {}
+
+    executor = ThreadPoolExecutor()
+    durations = []
+    for i in xrange(repeats):
+        start = timeit.default_timer()
+        executor.submit(cancellable(execute_step), plugin_kwargs).result()
+        durations.append(timeit.default_timer() - start)
+    executor.shutdown()
+    results['thread'] = summarize(durations)
+
+    execution_loop = ExecutionLoop()
+    execution_loop.start()
+    durations = []
+    for i in xrange(repeats):
+        start = timeit.default_timer()
+        execution_loop.submit(execute_step, plugin_kwargs).result()
+        durations.append(timeit.default_timer() - start)
+    execution_loop.stop()
+    results['loop'] = summarize(durations)
+    return results
+
+
+def main(args=None):
+    '''
+    Parameters
+    ----------
+    args : argparse.Namespace, optional
+        Arguments as parsed by :func:`parse_args`.
+
+    Returns
+    -------
+    int
+        Return code.
+    '''
+    if args is None:
+        args = parse_args()
+
+    results = benchmark_run_step(args.repeats)
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=4)
+        print
+        return 0
+
+    print '%d steps per method:' % args.repeats
+    for method_i in ('thread', 'loop'):
+        print ('  %-8s mean: %7.3f ms, median: %7.3f ms, p95: %7.3f ms, max: '
+               '%7.3f ms' % ((method_i, ) +
+                             tuple(results[method_i][k]
+                                   for k in ('mean_ms', 'median_ms', 'p95_ms',
+                                             'max_ms'))))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
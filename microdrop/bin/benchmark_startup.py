@@ -0,0 +1,181 @@
+'''
+Benchmark MicroDrop startup time, broken down by import.
+
+Core plugin modules and plugins are imported in the same order as during
+MicroDrop startup, and the import duration of each module is reported.  By
+default, only plugins enabled in the MicroDrop configuration are imported
+(matching MicroDrop startup; see :func:`microdrop.plugin_manager
+.load_plugins`).
+
+Example
+-------
+
+Compare import time of only enabled plugins with import time of all
+installed plugins::
+
+    python -m microdrop.bin.benchmark_startup
+    python -m microdrop.bin.benchmark_startup --all
+
+Also measure import time of each core plugin module and common dependency
+in a separate Python process (i.e., including the import time of all
+dependencies of the module)::
+
+    python -m microdrop.bin.benchmark_startup --isolated
+
+.. versionadded:: 2.36.0
+'''
+import argparse
+import json
+import os
+import subprocess
+import sys
+import timeit
+
+import microdrop as md
+import path_helpers as ph
+
+#: Third-party modules imported during MicroDrop startup.
+DEPENDENCY_MODULES = ['gtk', 'pandas', 'zmq', 'jsonschema', 'networkx']
+
+
+def parse_args(args=None):
+    '''Parses arguments, returns (options, args).'''
+    if args is None:
+        args = sys.argv[1:]
+
+    parser = argparse.ArgumentParser(parents=[md.MICRODROP_PARSER],
+                                     description='Benchmark MicroDrop startup '
+                                     'time, broken down by import.')
+    parser.add_argument('-p', '--plugins-dir', dest='plugins_dirs',
+                        type=ph.path, action='append', default=None,
+                        help='Plugins directory (default: '
+                        '`MICRODROP_PLUGINS_PATH` directories and '
+                        '`<prefix>/etc/microdrop/plugins/enabled`).  May be '
+                        'specified multiple times.')
+    parser.add_argument('--all', action='store_true',
+                        help='Import all plugins (not only enabled plugins).')
+    parser.add_argument('--isolated', action='store_true',
+                        help='Also measure import time of each core plugin '
+                        'module and dependency in a separate process.')
+    parser.add_argument('--json', action='store_true',
+                        help='Output import durations as JSON.')
+
+    return parser.parse_args(args)
+
+
+def isolated_import_time(module_name):
+    '''
+    Parameters
+    ----------
+    module_name : str
+        Fully qualified module name.
+
+    Returns
+    -------
+    float
+        Duration (in seconds) to import module (including all dependencies)
+        in a new Python process.
+    '''
+    code = ('import timeit; start = timeit.default_timer(); import %s; '
+            'print(timeit.default_timer() - start)' % module_name)
+    return float(subprocess.check_output([sys.executable, '-c', code])
+                 .strip().splitlines()[-1])
+
+
+def benchmark_startup(plugins_dirs, enabled=None):
+    '''
+    Import core plugins and plugins in the same order as MicroDrop startup.
+
+    Parameters
+    ----------
+    plugins_dirs : list[str]
+        Plugins directories.
+    enabled : list[str], optional
+        Module names of plugins to import.  By default, import all plugins.
+
+    Returns
+    -------
+    dict
+        Benchmark results, with the keys ``imports`` (list of
+        ``(module_name, duration_s)`` tuples, in import order), ``total_s``,
+        and ``deferred`` (names of plugins that were not imported).
+    '''
+    start = timeit.default_timer()
+    from ..microdrop import initialize_core_plugins
+    from ..plugin_manager import IMPORT_TIMES, get_deferred_plugins, \
+        load_plugins
+
+    initialize_core_plugins()
+    for plugins_dir_i in plugins_dirs:
+        if plugins_dir_i.isdir():
+            load_plugins(plugins_dir_i, import_from_parent=False,
+                         enabled=enabled)
+    total_s = timeit.default_timer() - start
+    return {'imports': IMPORT_TIMES.items(), 'total_s': total_s,
+            'deferred': get_deferred_plugins().keys()}
+
+
+def main(args=None):
+    '''
+    Parameters
+    ----------
+    args : argparse.Namespace, optional
+        Arguments as parsed by :func:`parse_args`.
+
+    Returns
+    -------
+    int
+        Return code.
+    '''
+    if args is None:
+        args = parse_args()
+
+    import microdrop.config
+
+    config = microdrop.config.Config(args.config)
+
+    if args.plugins_dirs is None:
+        # Use same plugins directories as MicroDrop application.
+        plugins_dirs = [ph.path(p.strip())
+                        for p in os.environ.get('MICRODROP_PLUGINS_PATH',
+                                                '').split(';') if p.strip()]
+        plugins_dirs += [ph.path(sys.prefix).joinpath('etc', 'microdrop',
+                                                      'plugins', 'enabled')]
+    else:
+        plugins_dirs = args.plugins_dirs
+
+    enabled = None if args.all else list(config['plugins']['enabled'])
+
+    results = {}
+    if args.isolated:
+        from ..microdrop import CORE_PLUGIN_MODULES
+
+        results['isolated'] = [(module_name_i,
+                                isolated_import_time(module_name_i))
+                               for module_name_i in DEPENDENCY_MODULES +
+                               CORE_PLUGIN_MODULES]
+    results.update(benchmark_startup(plugins_dirs, enabled=enabled))
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=4)
+        print
+        return 0
+
+    if args.isolated:
+        print 'Isolated import (including dependencies):'
+        for module_name_i, duration_i in results['isolated']:
+            print '  %-60s %8.3f s' % (module_name_i, duration_i)
+        print
+    print 'Startup import (in import order):'
+    for module_name_i, duration_i in results['imports']:
+        print '  %-60s %8.3f s' % (module_name_i, duration_i)
+    print '%d modules imported, total: %.3f s' % (len(results['imports']),
+                                                  results['total_s'])
+    if results['deferred']:
+        print '%d plugins deferred: %s' % (len(results['deferred']),
+                                           ', '.join(results['deferred']))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,294 @@
+'''
+Execute a MicroDrop protocol without the graphical user interface (e.g., for
+batch runs or to benchmark protocol timing on a machine without a display).
+
+Only non-GUI core plugins are enabled, and electrode actuations and waveform
+settings are simulated (see
+:mod:`microdrop.core_plugins.simulated_actuator_plugin`).
+
+Example
+-------
+
+Execute protocol twice (as fast as possible) and print the wall time of each
+step as JSON::
+
+    microdrop-headless device.svg "my protocol" -r 2 --time-scale 0 --json
+
+.. versionadded:: 2.36.0
+'''
+import argparse
+import json
+import logging
+import os
+import sys
+import timeit
+
+import blinker
+import microdrop as md
+import path_helpers as ph
+import trollius as asyncio
+
+# Screen dimensions are queried when `app_context` is imported, which requires
+# a display unless set through environment variables.
+os.environ.setdefault('SCREEN_HEIGHT', '768')
+os.environ.setdefault('SCREEN_WIDTH', '1024')
+
+from ..dmf_device import DmfDevice
+from ..plugin_manager import (IPlugin, PluginGlobals, SingletonPlugin,
+                              get_service_instance_by_name, implements)
+from ..protocol import Protocol
+from ..core_plugins.protocol_controller.execute import execute_steps
+
+logger = logging.getLogger(__name__)
+
+#: Non-GUI core plugins enabled by default.
+HEADLESS_PLUGINS = ['microdrop.electrode_controller_plugin',
+                    'microdrop.simulated_actuator_plugin']
+
+
+PluginGlobals.push_env('microdrop')
+
+
+class HeadlessRunnerPlugin(SingletonPlugin):
+    '''
+    Handle warnings sent during execution of each step (normally handled by
+    GUI prompts).
+
+    Attributes
+    ----------
+    ignore_warnings : bool
+        If ``True``, log warnings sent during step execution.  Otherwise,
+        warnings cause the step to fail.
+    '''
+    implements(IPlugin)
+    plugin_name = 'microdrop.headless_runner'
+
+    def __init__(self):
+        self.name = self.plugin_name
+        self.ignore_warnings = False
+
+    @asyncio.coroutine
+    def on_step_run(self, plugin_kwargs, signals):
+        '''
+        Handler called whenever a step is executed.
+
+        Parameters
+        ----------
+        plugin_kwargs : dict
+            Plugin settings as JSON serializable dictionary.
+        signals : blinker.Namespace
+            Signals namespace.
+        '''
+        @asyncio.coroutine
+        def on_warning(message, key=None, title='Warning'):
+            if not self.ignore_warnings:
+                raise RuntimeWarning(message)
+            logger.warning('%s: %s', title, message)
+
+        signals.signal('warning').connect(on_warning, weak=False)
+
+
+PluginGlobals.pop_env()
+
+
+def parse_args(args=None):
+    '''Parses arguments, returns (options, args).'''
+    if args is None:
+        args = sys.argv[1:]
+
+    parser = argparse.ArgumentParser(parents=[md.MICRODROP_PARSER],
+                                     description='Execute MicroDrop protocol '
+                                     'without graphical user interface.')
+    parser.add_argument('device', type=ph.path, help='Device SVG file.')
+    parser.add_argument('protocol', type=ph.path, help='Protocol file.')
+    parser.add_argument('-r', '--repeats', type=int, default=None,
+                        help='Number of protocol repetitions (default: '
+                        'protocol setting).')
+    parser.add_argument('-t', '--time-scale', type=float, default=1.,
+                        help='Scale factor for actuation durations (e.g., '
+                        '`0` to execute as fast as possible; default: '
+                        '%(default)s).')
+    parser.add_argument('--latency', type=float, default=0.,
+                        help='Simulated actuation latency in seconds '
+                        '(default: %(default)s).')
+    parser.add_argument('--jitter', type=float, default=0.,
+                        help='Maximum simulated random actuation jitter in '
+                        'seconds (default: %(default)s).')
+    parser.add_argument('--failure-rate', type=float, default=0.,
+                        help='Probability of simulated actuation failure '
+                        '(default: %(default)s).')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Random seed for simulated jitter and '
+                        'failures.')
+    parser.add_argument('--delta', action='store_true',
+                        help='Send delta actuation requests (i.e., only '
+                        'electrodes changed since the previous actuation) '
+                        'to the simulated actuator.')
+    parser.add_argument('--trace', type=ph.path, default=None,
+                        help='Write trace of simulated actuations to CSV '
+                        'file.')
+    parser.add_argument('--pipeline', action='store_true',
+                        help='Prepare each step while the previous step is '
+                        'executing.')
+    parser.add_argument('-p', '--plugin', dest='plugins', action='append',
+                        default=[], help='Additional (non-GUI) plugin to '
+                        'enable.  May be specified multiple times.')
+    parser.add_argument('--ignore-warnings', action='store_true',
+                        help='Log warnings during step execution instead of '
+                        'failing.')
+    parser.add_argument('--json', action='store_true',
+                        help='Output step timing as JSON.')
+    log_levels = ('critical', 'error', 'warning', 'info', 'debug', 'notset')
+    parser.add_argument('-l', '--log-level', type=str, choices=log_levels,
+                        default='warning')
+
+    args = parser.parse_args(args)
+    args.log_level = getattr(logging, args.log_level.upper())
+    return args
+
+
+def run_protocol(device, protocol, repeats=None, time_scale=1., plugins=None,
+                 ignore_warnings=False, pipeline=False, **kwargs):
+    '''
+    Execute protocol on a (new) trollius event loop, with simulated electrode
+    actuations.
+
+    Parameters
+    ----------
+    device : microdrop.dmf_device.DmfDevice
+        Device.
+    protocol : microdrop.protocol.Protocol
+        Protocol to execute.
+    repeats : int, optional
+        Number of protocol repetitions.  By default, use
+        :attr:`protocol.n_repeats`.
+    time_scale : float, optional
+        Scale factor for actuation durations.
+    plugins : list[str], optional
+        Names of plugins to enable, in addition to :data:`HEADLESS_PLUGINS`.
+    ignore_warnings : bool, optional
+        If ``True``, log warnings during step execution instead of failing.
+    pipeline : bool, optional
+        If ``True``, prepare each step while the previous step is executing
+        (see :func:`execute_steps`).
+    **kwargs
+        Simulated actuator parameters (e.g., ``latency_s``, ``jitter_s``,
+        ``failure_rate``, ``seed``); see
+        :meth:`SimulatedActuatorPlugin.configure`.
+
+    Returns
+    -------
+    list[dict]
+        Timing of each executed step, with the keys ``repeat``, ``step``,
+        ``start`` (seconds since start of run), ``duration_s``, and the step
+        timing keys returned by :func:`execute_steps` (e.g.,
+        ``dead_time_s``).
+    '''
+    # Import (i.e., register) core plugins.
+    from ..core_plugins.electrode_controller_plugin import pyutilib
+    from ..core_plugins import simulated_actuator_plugin
+
+    runner = get_service_instance_by_name(HeadlessRunnerPlugin.plugin_name,
+                                          env='microdrop')
+    runner.ignore_warnings = ignore_warnings
+    runner.enable()
+    actuator = get_service_instance_by_name(simulated_actuator_plugin
+                                            .SimulatedActuatorPlugin
+                                            .plugin_name, env='microdrop')
+    actuator.configure(time_scale=time_scale,
+                       electrode_ids=device.df_shape_centers.index, **kwargs)
+    for name_i in HEADLESS_PLUGINS + list(plugins or []):
+        get_service_instance_by_name(name_i, env='microdrop').enable()
+
+    if repeats is None:
+        repeats = protocol.n_repeats
+
+    steps = protocol.snapshot()
+    timings = []
+    run_start = timeit.default_timer()
+    started = {}
+
+    @asyncio.coroutine
+    def on_step_started(sender, **kwargs):
+        started[kwargs['i']] = timeit.default_timer()
+
+    @asyncio.coroutine
+    def on_step_completed(sender, **kwargs):
+        end = timeit.default_timer()
+        start = started.pop(kwargs['i'])
+        timing = {'repeat': repeat_i, 'step': kwargs['i'],
+                  'start': start - run_start, 'duration_s': end - start}
+        timing.update((k, v) for k, v in kwargs['timing'].iteritems()
+                      if k not in ('i', 'duration_s'))
+        timings.append(timing)
+
+    signals = blinker.Namespace()
+    signals.signal('step-started').connect(on_step_started, weak=False)
+    signals.signal('step-completed').connect(on_step_completed, weak=False)
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        for repeat_i in xrange(repeats):
+            loop.run_until_complete(execute_steps(steps, signals=signals,
+                                                  pipeline=pipeline))
+    finally:
+        loop.close()
+    return timings
+
+
+def main(args=None):
+    '''
+    Parameters
+    ----------
+    args : argparse.Namespace, optional
+        Arguments as parsed by :func:`parse_args`.
+
+    Returns
+    -------
+    int
+        Return code.
+    '''
+    if args is None:
+        args = parse_args()
+
+    logging.basicConfig(level=args.log_level)
+
+    device = DmfDevice.load(args.device)
+    protocol = Protocol.load(args.protocol)
+
+    timings = run_protocol(device, protocol, repeats=args.repeats,
+                           time_scale=args.time_scale, plugins=args.plugins,
+                           ignore_warnings=args.ignore_warnings,
+                           latency_s=args.latency, jitter_s=args.jitter,
+                           failure_rate=args.failure_rate, seed=args.seed,
+                           delta=args.delta, pipeline=args.pipeline)
+
+    if args.trace is not None:
+        from ..core_plugins.simulated_actuator_plugin import \
+            SimulatedActuatorPlugin
+
+        SimulatedActuatorPlugin.__instance__.trace_frame().to_csv(args.trace,
+                                                                  index=False)
+
+    if args.json:
+        json.dump(timings, sys.stdout, indent=4)
+        print
+    else:
+        for timing_i in timings:
+            print ('repeat %(repeat)3d  step %(step)4d  %(duration_s)9.4f s'
+                   % timing_i)
+        total_s = sum(t['duration_s'] for t in timings)
+        print '%d steps, total: %.4f s, mean: %.4f s' % \
+            (len(timings), total_s, total_s / max(1, len(timings)))
+        dead_times = [t['dead_time_s'] for t in timings
+                      if t['dead_time_s'] is not None]
+        if dead_times:
+            print ('dead time between steps: mean: %.2f ms, max: %.2f ms' %
+                   (1e3 * sum(dead_times) / len(dead_times),
+                    1e3 * max(dead_times)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,8 @@
+from StringIO import StringIO
+import contextlib
 import os
+import tempfile
+import threading
 import warnings
 import logging
 
@@ -17,6 +21,43 @@ class ValidationError(Exception):
     pass
 
 
+def replace_file(source, destination):
+    '''
+    Atomically rename :data:`source` to :data:`destination`, replacing
+    :data:`destination` if it exists.
+
+    On Windows, :func:`os.rename` fails if :data:`destination` exists, so
+    use ``MoveFileExW`` with ``MOVEFILE_REPLACE_EXISTING`` instead.
+
+    Parameters
+    ----------
+    source : str
+        Source file path.
+    destination : str
+        Destination file path.
+
+    Raises
+    ------
+    OSError
+        If file could not be renamed.
+
+
+    .. versionadded:: 2.36.0
+    '''
+    if os.name != 'nt':
+        os.rename(source, destination)
+        return
+    import ctypes
+
+    MOVEFILE_REPLACE_EXISTING = 0x1
+    MOVEFILE_WRITE_THROUGH = 0x8
+    if not ctypes.windll.kernel32.MoveFileExW(unicode(source),
+                                              unicode(destination),
+                                              MOVEFILE_REPLACE_EXISTING |
+                                              MOVEFILE_WRITE_THROUGH):
+        raise ctypes.WinError()
+
+
 class Config(object):
     if os.name == 'nt':
         default_config_directory = home_dir().joinpath('MicroDrop')
@@ -41,7 +82,19 @@ class Config(object):
         enabled = string_list(default=list())
         """
 
+    #: .. versionadded:: 2.36.0
+    #:
+    #: Delay (in seconds) after the most recent call to :meth:`mark_dirty`
+    #: before changes are written to disk.
+    flush_delay_s = 1.
+
     def __init__(self, filename=None):
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._save_count = 0
+        self._written = {}
+        self._dirty = set()
+        self._flush_timer = None
         self.load(filename)
 
     def __getitem__(self, i):
@@ -73,12 +126,158 @@ class Config(object):
         self._validate()
 
     def save(self, filename=None):
+        '''
+        .. versionchanged:: 2.36.0
+            Write to temporary file and rename to :data:`filename`, such that
+            the config file is never left partially written.  Cancel pending
+            flush (see :meth:`mark_dirty`) when saving to :attr:`filename`.
+            On Windows, replace existing file atomically (see
+            :func:`replace_file`).
+        '''
         if filename is None:
             filename = self.filename
-        # make sure that the parent directory exists
-        path(filename).realpath().parent.makedirs_p()
-        with open(filename, 'w') as f:
-            self.data.write(outfile=f)
+        filename = path(filename).realpath()
+        with self._lock:
+            if filename == path(self.filename).realpath():
+                self._cancel_flush()
+                self._dirty.clear()
+            # Serialize while holding lock, but write to disk without holding
+            # lock to avoid blocking calls to `mark_dirty()`.
+            buffer_ = StringIO()
+            self.data.write(outfile=buffer_)
+            self._save_count += 1
+            save_i = self._save_count
+        with self._write_lock:
+            if save_i < self._written.get(filename, 0):
+                # A more recent version has already been written.
+                return
+            self._written[filename] = save_i
+            # make sure that the parent directory exists
+            filename.parent.makedirs_p()
+            fd, temp_path = tempfile.mkstemp(dir=filename.parent,
+                                             prefix=filename.name + '.',
+                                             suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    f.write(buffer_.getvalue())
+                replace_file(temp_path, filename)
+            except Exception:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+
+    def mark_dirty(self, section=None):
+        '''
+        Mark config as modified and schedule write to disk in a background
+        thread :attr:`flush_delay_s` seconds after the most recent call.
+
+        Use :meth:`flush` (or :meth:`save`) to write changes immediately.
+
+        Parameters
+        ----------
+        section : str, optional
+            Name of modified section.
+
+        .. versionadded:: 2.36.0
+        '''
+        with self._lock:
+            self._dirty.add(section)
+            self._cancel_flush()
+            self._flush_timer = threading.Timer(self.flush_delay_s,
+                                                self._background_flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def update_section(self, name, values, mark_dirty=True):
+        '''
+        Update config section (thread-safe), creating the section if it does
+        not exist.
+
+        Config data **MUST** only be modified through this method while the
+        config may be written in a background thread (see
+        :meth:`mark_dirty`).
+
+        Parameters
+        ----------
+        name : str
+            Section name.
+        values : dict
+            Values to set in section.
+        mark_dirty : bool, optional
+            If ``True``, mark section as modified (see :meth:`mark_dirty`).
+
+        .. versionadded:: 2.36.0
+        '''
+        with self._lock:
+            if name not in self.data:
+                self.data[name] = {}
+            self.data[name].update(values)
+            if mark_dirty:
+                self.mark_dirty(name)
+
+    @contextlib.contextmanager
+    def locked(self):
+        '''
+        Context manager holding the config lock, e.g., to read and modify
+        config data atomically with respect to :meth:`update_section` and
+        background writes (see :meth:`mark_dirty`).
+
+        Yields
+        ------
+        configobj.ConfigObj
+            Config data.
+
+        Example
+        -------
+
+            with config.locked() as data:
+                enabled = list(data['plugins']['enabled'])
+                ...
+                config.update_section('plugins', {'enabled': enabled})
+
+        .. versionadded:: 2.36.0
+        '''
+        with self._lock:
+            yield self.data
+
+    @property
+    def dirty(self):
+        '''
+        .. versionadded:: 2.36.0
+        '''
+        return bool(self._dirty)
+
+    def flush(self):
+        '''
+        Write changes to disk if config has been marked as modified (see
+        :meth:`mark_dirty`).
+
+        Returns
+        -------
+        bool
+            ``True`` if config was written to disk.
+
+        .. versionadded:: 2.36.0
+        '''
+        with self._lock:
+            if not self._dirty:
+                return False
+            sections = sorted(self._dirty)
+            self.save()
+        _L().debug('Saved modified config sections: %s', sections)
+        return True
+
+    def _cancel_flush(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+    def _background_flush(self):
+        try:
+            self.flush()
+        except Exception:
+            _L().error('Error saving config file: `%s`', self.filename,
+                       exc_info=True)
 
     def _validate(self):
         logger = _L()  # use logger with method context
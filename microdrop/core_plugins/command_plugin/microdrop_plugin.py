@@ -9,7 +9,7 @@ from .plugin import CommandZmqPlugin
 from ...app_context import get_hub_uri
 from ...plugin_helpers import hub_execute
 from ...plugin_manager import (PluginGlobals, SingletonPlugin, IPlugin,
-                               implements)
+                               implements, ScheduleRequest)
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +23,11 @@ class CommandPlugin(SingletonPlugin):
     """
     implements(IPlugin)
     plugin_name = 'microdrop.command_plugin'
+    #: ``on_plugin_enable`` may be called from a background thread (see
+    #: :func:`microdrop.plugin_manager.emit_signal_concurrent`).
+    #:
+    #: .. versionadded:: 2.36.0
+    threadsafe_callbacks = ('on_plugin_enable', )
 
     def __init__(self):
         self.name = self.plugin_name
@@ -102,5 +107,15 @@ class CommandPlugin(SingletonPlugin):
         """
         self.cleanup()
 
+    def get_schedule_requests(self, function_name):
+        '''
+        .. versionadded:: 2.36.0
+            Enable _after_ zmq hub to ensure hub is running before connecting
+            to it.
+        '''
+        if function_name == 'on_plugin_enable':
+            return [ScheduleRequest('microdrop.zmq_hub_plugin', self.name)]
+        return []
+
 
 PluginGlobals.pop_env()
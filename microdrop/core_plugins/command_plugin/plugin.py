@@ -1,38 +1,72 @@
+from collections import OrderedDict, deque
 from multiprocessing import Process
 import logging
 import sys
 
 from zmq_plugin.plugin import Plugin as ZmqPlugin
-from zmq_plugin.schema import decode_content_data
+import numpy as np
 import pandas as pd
 
 from logging_helpers import _L  #: .. versionadded:: 2.20
+#: .. versionchanged:: 2.36.0
+#:     Accept packed request data (see :mod:`microdrop.hub_codec`).
+from microdrop.hub_codec import decode_content_data, msgpack_reply
 
 
 logger = logging.getLogger(__name__)
 
+#: .. versionadded:: 2.36.0
+COMMAND_COLUMNS = ['namespace', 'plugin_name', 'command_name', 'title']
+
 
 class CommandZmqPlugin(ZmqPlugin):
     '''
     API for registering commands.
+
+    .. versionchanged:: 2.36.0
+        Store registered commands in a dictionary keyed by
+        ``(namespace, plugin_name, command_name)``, along with a
+        :attr:`version` counter which is incremented on each change.  The
+        commands table returned by :attr:`commands` is cached between
+        changes.
+
+    Attributes
+    ----------
+    version : int
+        Registry version, incremented each time a command is registered or
+        unregistered.
     '''
+    #: Maximum number of registry changes retained to compute changes since a
+    #: client version (see :meth:`get_changes`).
+    #:
+    #: .. versionadded:: 2.36.0
+    change_log_size = 1000
+
     def __init__(self, parent, *args, **kwargs):
         self.parent = parent
         self.control_board = None
-        self._commands = pd.DataFrame(None, columns=['namespace',
-                                                     'plugin_name',
-                                                     'command_name', 'title'])
+        # Command title, keyed by `(namespace, plugin_name, command_name)`.
+        self._commands = OrderedDict()
+        self.version = 0
+        # Each change is a `(version, registered, key, title)` tuple.
+        self._changes = deque(maxlen=self.change_log_size)
+        self._commands_frame = None
         super(CommandZmqPlugin, self).__init__(*args, **kwargs)
 
+    def _log_change(self, registered, key, title):
+        self.version += 1
+        self._changes.append((self.version, registered, key, title))
+        self._commands_frame = None
+
     def on_execute__unregister_command(self, request):
+        '''
+        .. versionchanged:: 2.36.0
+            Look up command by key instead of scanning commands table.
+        '''
         data = decode_content_data(request)
-        commands = self._commands
-        ix = commands.loc[(commands.namespace == data['namespace']) &
-                          (commands.plugin_name == data['plugin_name']) &
-                          (commands.command_name == data['command_name']) &
-                          (commands.title == data['title'])].index
-        self._commands.drop(ix, inplace=True)
-        self._commands.reset_index(drop=True, inplace=True)
+        self.unregister_command(data['plugin_name'], data['command_name'],
+                                namespace=data['namespace'],
+                                title=data.get('title'))
         return self.commands
 
     def on_execute__register_command(self, request):
@@ -42,7 +76,21 @@ class CommandZmqPlugin(ZmqPlugin):
                                      namespace=data.get('namespace', ''),
                                      title=data.get('title'))
 
+    @msgpack_reply
     def on_execute__get_commands(self, request):
+        '''
+        .. versionchanged:: 2.36.0
+            If ``since_version`` is specified in request data, only return
+            changes since the specified registry version (see
+            :meth:`get_changes`).
+
+        .. versionchanged:: 2.36.0
+            Pack reply if request data is packed (see
+            :func:`microdrop.hub_codec.msgpack_reply`).
+        '''
+        data = decode_content_data(request)
+        if data and data.get('since_version') is not None:
+            return self.get_changes(data['since_version'])
         return self.commands
 
     def register_command(self, plugin_name, command_name, namespace='',
@@ -53,25 +101,127 @@ class CommandZmqPlugin(ZmqPlugin):
         Each command is unique by:
 
             (namespace, plugin_name, command_name)
+
+        .. versionchanged:: 2.36.0
+            Registering an existing command replaces the command title
+            (rather than adding a duplicate command).
         '''
         if title is None:
             title = (command_name[:1].upper() +
                      command_name[1:]).replace('_', ' ')
-        row_i = dict(zip(self._commands, [namespace, plugin_name, command_name,
-                                          title]))
-        self._commands = self._commands.append(row_i, ignore_index=True)
+        key = (namespace, plugin_name, command_name)
+        if self._commands.get(key) != title:
+            self._commands[key] = title
+            self._log_change(True, key, title)
         return self.commands
 
+    def unregister_command(self, plugin_name, command_name, namespace='',
+                           title=None):
+        '''
+        Unregister command.
+
+        If :data:`title` is specified, the command is only unregistered if
+        its registered title matches.
+
+        .. versionadded:: 2.36.0
+        '''
+        key = (namespace, plugin_name, command_name)
+        if key in self._commands and (title is None or
+                                      self._commands[key] == title):
+            title = self._commands.pop(key)
+            self._log_change(False, key, title)
+        return self.commands
+
+    def get_changes(self, since_version):
+        '''
+        Parameters
+        ----------
+        since_version : int
+            Registry version known to client.
+
+        Returns
+        -------
+        dict
+            Changes since :data:`since_version`, with the following keys:
+
+             - ``version``: current registry version.
+             - ``reset``: if ``True``, changes since :data:`since_version`
+               are not available (or :data:`since_version` is invalid) and
+               ``registered`` contains **all** registered commands.
+             - ``registered``: commands registered (or with a changed title)
+               since :data:`since_version`, as a :class:`pandas.DataFrame`.
+             - ``unregistered``: commands unregistered since
+               :data:`since_version`, as a :class:`pandas.DataFrame`.
+
+
+        .. versionadded:: 2.36.0
+        '''
+        oldest_version = (self._changes[0][0] if self._changes
+                          else self.version + 1)
+        if not (oldest_version - 1 <= since_version <= self.version):
+            return {'version': self.version, 'reset': True,
+                    'registered': self.commands,
+                    'unregistered': _commands_frame([])}
+
+        # Keep only the last change for each command.
+        changes = OrderedDict()
+        for version_i, registered_i, key_i, title_i in self._changes:
+            if version_i > since_version:
+                changes.pop(key_i, None)
+                changes[key_i] = (registered_i, title_i)
+        registered = [key_i + (title_i, )
+                      for key_i, (registered_i, title_i) in changes.iteritems()
+                      if registered_i]
+        unregistered = [key_i + (title_i, )
+                        for key_i, (registered_i, title_i)
+                        in changes.iteritems() if not registered_i]
+        return {'version': self.version, 'reset': False,
+                'registered': _commands_frame(registered),
+                'unregistered': _commands_frame(unregistered)}
+
     @property
     def commands(self):
         '''
         Returns
         -------
-        pd.Series
-            Series of command groups, where each group name maps to a series of
-            commands.
+        pd.DataFrame
+            Table of registered commands, with the columns ``namespace``,
+            ``plugin_name``, ``command_name``, and ``title``.
+
+
+        .. versionchanged:: 2.36.0
+            Return cached, read-only table (only rebuilt after registry
+            changes) instead of a copy.
         '''
-        return self._commands.copy()
+        if self._commands_frame is None:
+            self._commands_frame = _commands_frame([key_i + (title_i, )
+                                                    for key_i, title_i in
+                                                    self._commands
+                                                    .iteritems()])
+        return self._commands_frame
+
+
+def _commands_frame(rows):
+    '''
+    Parameters
+    ----------
+    rows : list[tuple]
+        List of ``(namespace, plugin_name, command_name, title)`` tuples.
+
+    Returns
+    -------
+    pd.DataFrame
+        Read-only commands table.
+
+
+    .. versionadded:: 2.36.0
+    '''
+    values = np.empty((len(rows), len(COMMAND_COLUMNS)), dtype=object)
+    for i, row_i in enumerate(rows):
+        values[i] = row_i
+    values.flags.writeable = False
+    # Table shares (read-only) values array.
+    return pd.DataFrame(values, columns=COMMAND_COLUMNS, copy=False)
 
 
 def parse_args(args=None):
@@ -4,28 +4,132 @@ import threading
 from pygtkhelpers.gthreads import gtk_threadsafe
 from pygtkhelpers.schema import schema_dialog
 from zmq_plugin.plugin import Plugin as ZmqPlugin
-from zmq_plugin.schema import decode_content_data
 import zmq
 
 from ...app_context import get_app, get_hub_uri
+from ...gtk_dispatch import gtk_coalesce
+from ...hub_codec import decode_content_data, msgpack_reply
 from ...plugin_helpers import hub_execute, hub_execute_async
 from ...plugin_manager import (IPlugin, PluginGlobals, ScheduleRequest,
                                SingletonPlugin, emit_signal, implements)
 
 
+#: .. versionadded:: 2.36.0
+#:
+#: Response status if device snapshot is up to date (see
+#: :meth:`DeviceInfoZmqPlugin.check_version`).
+NOT_MODIFIED = 'not-modified'
+
+
 class DeviceInfoZmqPlugin(ZmqPlugin):
+    '''
+    .. versionchanged:: 2.36.0
+        The ``get_device``, ``dumps``, ``get_svg_frame``, and
+        ``get_electrode_channels`` commands accept an optional ``if_version``
+        argument (see :meth:`check_version`).
+    '''
+    def __init__(self, *args, **kwargs):
+        super(DeviceInfoZmqPlugin, self).__init__(*args, **kwargs)
+        # Pickled device, with the respective device version tag.
+        self._dumps_cache = (None, None)
+
+    def check_version(self, request, channels=True):
+        '''
+        Compare the ``if_version`` request argument (i.e., the
+        :attr:`microdrop.dmf_device.DmfDevice.etag` of a device snapshot held
+        by the requester) with the current device.
+
+        Parameters
+        ----------
+        request : dict
+            Request, with optional ``if_version`` data field.
+        channels : bool, optional
+            If ``False``, the requested data does not depend on electrode
+            channels, so channel edits do not modify it.
+
+        Returns
+        -------
+        dict or None
+            ``None`` if a full response is required.  Otherwise, a dictionary
+            with the current device ``version`` and the ``status``:
+
+            - :data:`NOT_MODIFIED`: snapshot is up to date; or
+            - ``"delta"``: snapshot is up to date, except for the channels of
+              the electrodes in ``electrode_channels`` (channel lists indexed
+              by electrode ID).
+
+
+        .. versionadded:: 2.36.0
+        '''
+        data = decode_content_data(request) or {}
+        if_version = data.get('if_version')
+        if if_version is None:
+            return None
+        device = get_app().dmf_device
+        edits = device.channel_edits(if_version)
+        if edits is None:
+            return None
+        elif not edits or not channels:
+            return {'status': NOT_MODIFIED, 'version': device.etag}
+        return {'status': 'delta', 'version': device.etag,
+                'electrode_channels': edits}
+
     def on_execute__get_device(self, request):
+        '''
+        .. versionchanged:: 2.36.0
+            Accept ``if_version`` argument (see :meth:`check_version`).
+        '''
+        response = self.check_version(request)
+        if response is not None:
+            return response
         app = get_app()
         return app.dmf_device
 
+    @msgpack_reply
     def on_execute__get_svg_frame(self, request):
+        '''
+        .. versionchanged:: 2.36.0
+            Accept ``if_version`` argument (see :meth:`check_version`).
+
+        .. versionchanged:: 2.36.0
+            Pack reply if request data is packed (see
+            :func:`microdrop.hub_codec.msgpack_reply`).
+        '''
+        response = self.check_version(request, channels=False)
+        if response is not None:
+            return response
         app = get_app()
         return app.dmf_device.get_svg_frame()
 
+    @msgpack_reply
     def on_execute__get_electrode_channels(self, request):
+        '''
+        .. versionchanged:: 2.36.0
+            Accept ``if_version`` argument (see :meth:`check_version`).
+
+        .. versionchanged:: 2.36.0
+            Pack reply if request data is packed (see
+            :func:`microdrop.hub_codec.msgpack_reply`).
+        '''
+        response = self.check_version(request, channels=False)
+        if response is not None:
+            return response
         app = get_app()
         return app.dmf_device.get_electrode_channels()
 
+    def on_execute__get_device_version(self, request):
+        '''
+        Returns
+        -------
+        str
+            Current device version tag (see
+            :attr:`microdrop.dmf_device.DmfDevice.etag`).
+
+        .. versionadded:: 2.36.0
+        '''
+        app = get_app()
+        return app.dmf_device.etag
+
     def on_execute__set_electrode_channels(self, request):
         '''
         Set channels for electrode `electrode_id` to `channels`.
@@ -44,6 +148,10 @@ class DeviceInfoZmqPlugin(ZmqPlugin):
         .. versionchanged:: 2.25
             Emit ``on_dmf_device_changed`` in main GTK thread to ensure
             thread-safety.
+
+        .. versionchanged:: 2.36.0
+            Coalesce ``on_dmf_device_changed`` signals emitted before the GUI
+            is updated (see :func:`microdrop.gtk_dispatch.gtk_coalesce`).
         '''
         data = decode_content_data(request)
         app = get_app()
@@ -51,13 +159,27 @@ class DeviceInfoZmqPlugin(ZmqPlugin):
                     .set_electrode_channels(data['electrode_id'],
                                             data['channels']))
         if modified:
-            gtk_threadsafe(emit_signal)("on_dmf_device_changed",
-                                        [app.dmf_device])
+            gtk_coalesce(emit_signal,
+                         key='on_dmf_device_changed')("on_dmf_device_changed",
+                                                      [app.dmf_device])
         return modified
 
     def on_execute__dumps(self, request):
+        '''
+        .. versionchanged:: 2.36.0
+            Accept ``if_version`` argument (see :meth:`check_version`).
+            Reuse pickled device until device is modified or swapped.
+        '''
+        response = self.check_version(request)
+        if response is not None:
+            return response
         app = get_app()
-        return pickle.dumps(app.dmf_device)
+        etag, dumped = self._dumps_cache
+        if etag != app.dmf_device.etag:
+            etag = app.dmf_device.etag
+            dumped = pickle.dumps(app.dmf_device)
+            self._dumps_cache = (etag, dumped)
+        return dumped
 
     def on_execute__edit_electrode_channels(self, request):
         '''
@@ -125,6 +247,11 @@ class DeviceInfoPlugin(SingletonPlugin):
     """
     implements(IPlugin)
     plugin_name = 'microdrop.device_info_plugin'
+    #: ``on_plugin_enable`` may be called from a background thread (see
+    #: :func:`microdrop.plugin_manager.emit_signal_concurrent`).
+    #:
+    #: .. versionadded:: 2.36.0
+    threadsafe_callbacks = ('on_plugin_enable', )
 
     def __init__(self):
         self.name = self.plugin_name
@@ -3,14 +3,148 @@
 '''
 import datetime as dt
 import logging
+import timeit
 
 from logging_helpers import _L
+import numpy as np
 import pandas as pd
 import si_prefix as si
 import trollius as asyncio
 
+from ...step_timing import STEP_TIMING, receiver_name
+
 NAME = 'microdrop.electrode_controller_plugin'
 
+#: .. versionadded:: 2.36.0
+#:
+#: Default maximum time (in seconds) to wait for each `IElectrodeMutator`
+#: plugin to respond to a dynamic electrode states request.
+MUTATOR_TIMEOUT_S = 5.
+
+
+class ElectrodeStatesMerger(object):
+    '''
+    Merge electrode states into a preallocated array (rather than
+    concatenating :class:`pandas.Series` objects).
+
+    Parameters
+    ----------
+    electrode_ids : list or pandas.Index, optional
+        Electrode IDs.  Unknown electrode IDs are added as necessary.
+
+    Attributes
+    ----------
+    merge_s : float
+        Duration (in seconds) of most recent merge.
+
+
+    .. versionadded:: 2.36.0
+    '''
+    def __init__(self, electrode_ids=None):
+        self.electrode_ids = pd.Index([] if electrode_ids is None
+                                      else electrode_ids).unique()
+        self._values = np.zeros(len(self.electrode_ids))
+        self.merge_s = 0
+
+    def merge(self, requests):
+        '''
+        Parameters
+        ----------
+        requests : list[pandas.Series]
+            Electrode states, indexed by electrode ID.
+
+        Returns
+        -------
+        pandas.Series
+            Maximum state of each actuated electrode (i.e., electrodes with a
+            state greater than zero in any request), indexed by electrode ID.
+        '''
+        start = timeit.default_timer()
+        # Note: use `numpy` operations, since filtering each
+        # `pandas.Series` is relatively slow.
+        updates = []
+        for request_i in requests:
+            values_i = np.asarray(request_i.values)
+            actuated_i = values_i > 0
+            index_i = self.electrode_ids.get_indexer(request_i.index)
+            unknown_i = actuated_i & (index_i < 0)
+            if unknown_i.any():
+                # Append unknown electrode IDs (existing positions are
+                # unchanged).
+                self.electrode_ids = \
+                    self.electrode_ids.append(request_i.index[unknown_i]
+                                              .unique())
+                index_i = self.electrode_ids.get_indexer(request_i.index)
+            updates.append((index_i[actuated_i], values_i[actuated_i]))
+        if self._values.shape[0] != len(self.electrode_ids):
+            self._values = np.zeros(len(self.electrode_ids))
+        else:
+            self._values[:] = 0
+        for index_i, values_i in updates:
+            np.maximum.at(self._values, index_i, values_i)
+        actuated = self._values > 0
+        states = pd.Series(self._values[actuated],
+                           index=self.electrode_ids[actuated])
+        self.merge_s = timeit.default_timer() - start
+        return states
+
+
+class CommittedElectrodeStates(object):
+    '''
+    Track electrodes actuated by the most recently *committed* (i.e.,
+    successfully completed) actuation, to compute actuation deltas.
+
+    Until the first actuation is committed, or after :meth:`reset` (e.g.,
+    after an actuation error), :meth:`delta` returns the full actuation
+    state, i.e., a *resync*.
+
+    Attributes
+    ----------
+    actuated : set
+        Committed actuated electrode IDs (``None`` if a resync is required).
+    counts : dict
+        Number of ``full`` and ``delta`` requests computed.
+
+
+    .. versionadded:: 2.36.0
+    '''
+    def __init__(self):
+        self.actuated = None
+        self.counts = {'full': 0, 'delta': 0}
+
+    def delta(self, electrodes):
+        '''
+        Parameters
+        ----------
+        electrodes : set
+            Electrode IDs to actuate.
+
+        Returns
+        -------
+        delta : pandas.Series
+            If :data:`full` is ``True``, ``True`` for each electrode to
+            actuate (all other electrodes are off).  Otherwise, ``True`` for
+            each electrode turned on and ``False`` for each electrode turned
+            off since the committed state.
+        full : bool
+            ``True`` if :data:`delta` is the full actuation state.
+        '''
+        electrodes = set(electrodes)
+        if self.actuated is None:
+            self.counts['full'] += 1
+            return pd.Series(True, index=sorted(electrodes), dtype=bool), True
+        added = sorted(electrodes - self.actuated)
+        removed = sorted(self.actuated - electrodes)
+        self.counts['delta'] += 1
+        return (pd.Series([True] * len(added) + [False] * len(removed),
+                          index=added + removed, dtype=bool), False)
+
+    def commit(self, electrodes):
+        self.actuated = set(electrodes)
+
+    def reset(self):
+        self.actuated = None
+
 
 @asyncio.coroutine
 def _warning(signal, message, **kwargs):
@@ -40,7 +174,8 @@ def _warning(signal, message, **kwargs):
 
 @asyncio.coroutine
 def execute_actuation(signals, static_states, dynamic_states,
-                        voltage, frequency, duration_s):
+                        voltage, frequency, duration_s, waveform=True,
+                        committed=None):
     '''
     XXX Coroutine XXX
 
@@ -62,6 +197,14 @@ def execute_actuation(signals, static_states, dynamic_states,
     duration_s : float
         Actuation duration (in seconds).  If not specified, use value from
         step options.
+    waveform : bool, optional
+        If ``False``, do not set waveform :data:`voltage` and
+        :data:`frequency` (e.g., if they are already set).
+    committed : CommittedElectrodeStates, optional
+        Committed electrode states, used to compute the request sent to
+        *delta* electrode actuators.  Committed on success, reset on
+        error or cancellation.  If ``None``, delta actuators are sent the
+        full actuation state.
 
     Returns
     -------
@@ -95,6 +238,23 @@ def execute_actuation(signals, static_states, dynamic_states,
     .. versionchanged:: 2.31.1
         Prevent error dialog prompt if coroutine is cancelled while calling
         ``set_waveform()`` callbacks.
+
+    .. versionchanged:: 2.36.0
+        Record start and finish of each waveform set call and actuation
+        request (see :data:`microdrop.step_timing.STEP_TIMING`).
+
+    .. versionchanged:: 2.36.0
+        Add :data:`waveform` parameter.
+
+    .. versionchanged:: 2.36.0
+        Cancel pending actuation requests if cancelled.
+
+    .. versionchanged:: 2.36.0
+        Add :data:`committed` parameter.  Send actuation changes since the
+        committed state to receivers of the ``on-actuation-delta-request``
+        signal, i.e., actuators that opt in to delta requests (see
+        :meth:`microdrop.interfaces.IElectrodeActuator
+        .on_actuation_delta_request`).
     '''
     # Notify other plugins that dynamic electrodes states have changed.
     responses = (signals.signal('dynamic-electrode-states-changed')
@@ -123,8 +283,10 @@ def execute_actuation(signals, static_states, dynamic_states,
             try:
                 receivers, co_callbacks = zip(*result)
                 if receivers:
-                    results = yield asyncio.From(asyncio
-                                                 .gather(*co_callbacks))
+                    results = yield asyncio.From(asyncio.gather(*(
+                        STEP_TIMING.timed('set-%s' % key, co_i,
+                                          plugin=receiver_name(receiver_i))
+                        for receiver_i, co_i in result)))
             except asyncio.CancelledError:
                 raise
             except Exception as exception:
@@ -142,16 +304,26 @@ def execute_actuation(signals, static_states, dynamic_states,
                                     title='Warning: failed to set %s' % key,
                                     key='waveform-%s' % key))
 
-    for key, value, unit in (('frequency', frequency, 'Hz'),
-                             ('voltage', voltage, 'V')):
+    for key, value, unit in ((('frequency', frequency, 'Hz'),
+                              ('voltage', voltage, 'V')) if waveform else []):
         waveform_result = yield asyncio.From(set_waveform(key, value))
 
         if waveform_result:
             _L().info('%s set to %s%s (receivers: `%s`)', key,
                       si.si_format(value), unit, zip(*waveform_result)[0])
 
-    electrode_actuators = signals.signal('on-actuation-request')\
-        .send(s_electrodes_to_actuate, duration_s=duration_s)
+    if committed is None:
+        delta, full = s_electrodes_to_actuate, True
+    else:
+        delta, full = committed.delta(electrodes_to_actuate)
+
+    electrode_actuators = \
+        ([('on-actuation-request', r)
+          for r in signals.signal('on-actuation-request')
+          .send(s_electrodes_to_actuate, duration_s=duration_s)] +
+         [('on-actuation-delta-request', r)
+          for r in signals.signal('on-actuation-delta-request')
+          .send(delta, duration_s=duration_s, full=full)])
 
     if not electrode_actuators:
         title = 'Warning: failed to actuate all electrodes'
@@ -164,11 +336,25 @@ def execute_actuation(signals, static_states, dynamic_states,
         # Simulate actuation by waiting for specified duration.
         yield asyncio.From(asyncio.sleep(duration_s))
     else:
-        actuation_tasks = zip(*electrode_actuators)[1]
+        loop = asyncio.get_event_loop()
+        actuation_tasks = [loop.create_task(STEP_TIMING
+                                            .timed(event_i, co_i,
+                                                   plugin=receiver_name
+                                                   (receiver_i)))
+                           for event_i, (receiver_i, co_i)
+                           in electrode_actuators]
 
         # Wait for actuations to complete.
         start = dt.datetime.now()
-        done, pending = yield asyncio.From(asyncio.wait(actuation_tasks))
+        try:
+            done, pending = yield asyncio.From(asyncio.wait(actuation_tasks))
+        except asyncio.CancelledError:
+            # Note: `asyncio.wait()` does not cancel the tasks it waits for.
+            for task_i in actuation_tasks:
+                task_i.cancel()
+            if committed is not None:
+                committed.reset()
+            raise
         end = dt.datetime.now()
 
         actuated_electrodes = set()
@@ -184,6 +370,10 @@ def execute_actuation(signals, static_states, dynamic_states,
                 exceptions.append(exception)
 
         if (electrodes_to_actuate - actuated_electrodes) or exceptions:
+            if committed is not None:
+                # Actuator states are unknown; resync on next actuation.
+                committed.reset()
+
             def _error_message():
                 missing_electrodes = (electrodes_to_actuate -
                                       actuated_electrodes)
@@ -217,6 +407,8 @@ def execute_actuation(signals, static_states, dynamic_states,
                 yield asyncio.From(asyncio.sleep(remaining_duration))
         else:
             # Requested actuations were completed successfully.
+            if committed is not None:
+                committed.commit(electrodes_to_actuate)
             _L().info('actuation completed (actuated electrodes: %s)',
                       actuated_electrodes)
 
@@ -226,7 +418,8 @@ def execute_actuation(signals, static_states, dynamic_states,
 
 @asyncio.coroutine
 def execute_actuations(signals, static_states, voltage, frequency,
-                       duration_s=0, dynamic=False):
+                       duration_s=0, dynamic=False, electrode_ids=None,
+                       mutator_timeout_s=MUTATOR_TIMEOUT_S, committed=None):
     '''
     XXX Coroutine XXX
 
@@ -255,6 +448,15 @@ def execute_actuations(signals, static_states, voltage, frequency,
         If ``True``, query `IElectrodeMutator` plugins for **dynamic**
         actuation states.  Otherwise, only apply local **static** electrode
         actuation states.
+    electrode_ids : list or pandas.Index, optional
+        Device electrode IDs, used to preallocate merged dynamic electrode
+        states (see :class:`ElectrodeStatesMerger`).
+    mutator_timeout_s : float, optional
+        Maximum time (in seconds) to wait for each `IElectrodeMutator` plugin
+        to respond to a dynamic electrode states request.  States from
+        plugins that time out are ignored for the respective loop iteration.
+    committed : CommittedElectrodeStates, optional
+        Committed electrode states (see :func:`execute_actuation`).
 
     Returns
     -------
@@ -294,29 +496,55 @@ def execute_actuations(signals, static_states, voltage, frequency,
         apply during the execution of a step.  Instead, the changes will
         **only** take effect on _subsequent_ executions of the modified
         step.
+
+    .. versionchanged:: 2.36.0
+        Request dynamic electrode states from all `IElectrodeMutator`
+        plugins concurrently, each with a timeout (see
+        :data:`mutator_timeout_s`).  Merge states into a preallocated array
+        (see :class:`ElectrodeStatesMerger`), and record the merge time of
+        each loop iteration as ``merge-dynamic-states`` events (see
+        :data:`microdrop.step_timing.STEP_TIMING`).
+
+    .. versionchanged:: 2.36.0
+        Add :data:`committed` parameter.
     '''
+    merger = ElectrodeStatesMerger(electrode_ids)
+
     @asyncio.coroutine
     def _dynamic_states():
         # Merge received actuation states from requests with
         # explicit states stored by this plugin.
-        requests = []
-
         responses = signals.signal('get-electrode-states-request').send()
+        if not responses:
+            raise asyncio.Return(pd.Series())
 
-        for receiver_i, co_callback_i in responses:
-            request_i = yield asyncio.From(co_callback_i)
-            if request_i is not None:
+        receivers, co_callbacks = zip(*responses)
+        results = yield asyncio.From(asyncio.gather(*(
+            STEP_TIMING.timed('get-electrode-states-request',
+                              asyncio.wait_for(co_i, mutator_timeout_s),
+                              plugin=receiver_name(receiver_i))
+            for receiver_i, co_i in responses), return_exceptions=True))
+
+        requests = []
+        logger = _L()
+        for receiver_i, request_i in zip(receivers, results):
+            if isinstance(request_i, asyncio.TimeoutError):
+                logger.warning('Timed out waiting for dynamic electrode '
+                               'states from `%s`.', receiver_name(receiver_i))
+            elif isinstance(request_i, Exception):
+                raise request_i
+            elif request_i is not None:
                 requests.append(request_i)
-                logger = _L()
                 if logger.getEffectiveLevel() >= logging.DEBUG:
                         message = ('receiver: %s, actuation_request=%s' %
                                    (receiver_i, request_i))
                         map(logger.debug, message.splitlines())
 
-        if requests:
-            combined_states = pd.concat([r[r > 0] for r in requests])
-        else:
-            combined_states = pd.Series()
+        STEP_TIMING.record('merge-dynamic-states', phase='start')
+        combined_states = merger.merge(requests)
+        STEP_TIMING.record('merge-dynamic-states', phase='end')
+        logger.debug('merged %d dynamic electrode states requests in %.3f '
+                     'ms', len(requests), 1e3 * merger.merge_s)
         raise asyncio.Return(combined_states)
 
     actuations = []
@@ -336,7 +564,8 @@ def execute_actuations(signals, static_states, voltage, frequency,
         # Execute **static** and **dynamic** electrode states actuation.
         actuation_task = execute_actuation(signals, static_states,
                                            dynamic_electrode_states, voltage,
-                                           frequency, duration_s)
+                                           frequency, duration_s,
+                                           committed=committed)
         actuated_electrodes = yield asyncio.From(actuation_task)
         actuations.append(actuated_electrodes)
 
@@ -348,6 +577,56 @@ def execute_actuations(signals, static_states, voltage, frequency,
     raise asyncio.Return(actuations)
 
 
+@asyncio.coroutine
+def apply_electrode_state_updates(signals, updates, static_states, voltage,
+                                  frequency, committed=None):
+    '''
+    .. versionadded:: 2.36.0
+
+    XXX Coroutine XXX
+
+    Apply updated static electrode states (e.g., from real-time mode) until
+    cancelled.
+
+    For each update, only the electrodes whose state changed are computed;
+    if any changed, an actuation is requested without setting the waveform
+    again.  An ``electrode-states-applied`` signal is sent after each update
+    is applied.
+
+    Parameters
+    ----------
+    signals : blinker.Namespace
+        Signals namespace.
+    updates : asyncio.Queue
+        Queue of updated static electrode states.
+    static_states : pandas.Series
+        Currently applied static electrode states, indexed by electrode ID.
+    voltage : float
+        Actuation amplitude as RMS AC voltage (in volts).
+    frequency : float
+        Actuation frequency (in Hz).
+    committed : CommittedElectrodeStates, optional
+        Committed electrode states (see :func:`execute_actuation`).
+    '''
+    actuated = set(static_states[static_states > 0].index)
+    while True:
+        electrode_states = yield asyncio.From(updates.get())
+        updated = set(electrode_states[electrode_states > 0].index)
+        added = updated - actuated
+        removed = actuated - updated
+        if added or removed:
+            _L().debug('electrode states changed: +%s, -%s', sorted(added),
+                       sorted(removed))
+            yield asyncio.From(execute_actuation(signals, electrode_states,
+                                                 pd.Series(), voltage,
+                                                 frequency, 0,
+                                                 waveform=False,
+                                                 committed=committed))
+            actuated = updated
+        signals.signal('electrode-states-applied')\
+            .send(NAME, added=sorted(added), removed=sorted(removed))
+
+
 @asyncio.coroutine
 def execute(plugin_kwargs, signals):
     '''
@@ -359,6 +638,19 @@ def execute(plugin_kwargs, signals):
         Plugin settings as JSON serializable dictionary.
     signals : blinker.Namespace
         Signals namespace.
+
+
+    .. versionchanged:: 2.36.0
+        If the ``realtime`` option is set, apply updated electrode states
+        sent through the ``electrode-states-updated`` signal until cancelled
+        (see :func:`apply_electrode_state_updates`).  Only the most recent
+        pending update is kept; receivers return ``True`` if a pending
+        update was replaced.
+
+    .. versionchanged:: 2.36.0
+        Track committed electrode states for the duration of the step, such
+        that delta actuators are sent a full resync at the start of each
+        step (see :class:`CommittedElectrodeStates`).
     '''
     if NAME not in plugin_kwargs:
         raise asyncio.Return([])
@@ -369,6 +661,20 @@ def execute(plugin_kwargs, signals):
     event = asyncio.Event()
     signals.signal('signals-connected').connect(lambda *args: event.set(),
                                                 weak=False)
+
+    updates = asyncio.Queue(maxsize=1)
+
+    def on_electrode_states_updated(sender, electrode_states=None, **kwargs):
+        replaced = False
+        if updates.full():
+            updates.get_nowait()
+            replaced = True
+        updates.put_nowait(electrode_states)
+        return replaced
+
+    if kwargs.get('realtime'):
+        signals.signal('electrode-states-updated')\
+            .connect(on_electrode_states_updated, weak=False)
     yield asyncio.From(event.wait())
 
     voltage = kwargs['Voltage (V)']
@@ -376,12 +682,25 @@ def execute(plugin_kwargs, signals):
     duration_s = kwargs['Duration (s)']
     static_states = kwargs.get('electrode_states', pd.Series())
     dynamic = kwargs.get('dynamic', True)
+    committed = CommittedElectrodeStates()
     result = yield asyncio.From(execute_actuations(signals, static_states,
                                                    voltage, frequency,
                                                    duration_s,
-                                                   dynamic=dynamic))
+                                                   dynamic=dynamic,
+                                                   electrode_ids=kwargs
+                                                   .get('electrode_ids'),
+                                                   mutator_timeout_s=kwargs
+                                                   .get('mutator_timeout_s',
+                                                        MUTATOR_TIMEOUT_S),
+                                                   committed=committed))
 
     logger = _L()  # use logger with function context
     logger.info('%d/%d actuations completed', len(result), len(result))
     logger.debug('completed actuations: `%s`', result)
+
+    if kwargs.get('realtime'):
+        yield asyncio.From(apply_electrode_state_updates(signals, updates,
+                                                         static_states,
+                                                         voltage, frequency,
+                                                         committed=committed))
     raise asyncio.Return(result)
@@ -15,13 +15,13 @@ from flatland.validation import ValueAtLeast
 from logging_helpers import _L, caller_name
 from pygtkhelpers.gthreads import gtk_threadsafe
 from zmq_plugin.plugin import Plugin as ZmqPlugin
-from zmq_plugin.schema import decode_content_data
 import pandas as pd
 import trollius as asyncio
 import zmq
 
 from ...app_context import (get_app, get_hub_uri, MODE_RUNNING_MASK,
                             MODE_REAL_TIME_MASK)
+from ...hub_codec import decode_content_data, msgpack_reply
 from ...interfaces import (IApplicationMode, IElectrodeController)
 from ...plugin_helpers import (StepOptionsController, AppDataController,
                                hub_execute, hub_execute_async)
@@ -78,12 +78,17 @@ class ElectrodeControllerZmqPlugin(ZmqPlugin, StepOptionsController):
         .. versionchanged:: 2.28.3
             Ensure each electrode has _at most_ one state represented in
             :data:`electrode_states` (remove any duplicates).
+
+        .. versionchanged:: 2.36.0
+            Call :meth:`parent.set_step_value()` to only update the
+            ``electrode_states`` step option (without validating all step
+            options) and coalesce rapid successive ``on_step_options_changed``
+            signals.
         '''
         # Set the state of DMF device channels.
-        step_options = self.parent.get_step_options()
-        step_options['electrode_states'] = \
-            drop_duplicates_by_index(electrode_states[electrode_states > 0])
-        gtk_threadsafe(self.parent.set_step_values)(step_options)
+        electrode_states = electrode_states[electrode_states > 0]
+        self.parent.set_step_value('electrode_states',
+                                   drop_duplicates_by_index(electrode_states))
 
     def get_actuated_area(self, electrode_states):
         '''
@@ -221,6 +226,9 @@ class ElectrodeControllerZmqPlugin(ZmqPlugin, StepOptionsController):
         '''
         .. versionchanged:: 2.28.3
             Log error traceback to debug level.
+
+        .. versionchanged:: 2.36.0
+            Accept packed request data (see :mod:`microdrop.hub_codec`).
         '''
         data = decode_content_data(request)
         try:
@@ -265,7 +273,13 @@ class ElectrodeControllerZmqPlugin(ZmqPlugin, StepOptionsController):
             logger.debug(str(data), exc_info=True)
             gtk_threadsafe(ft.partial(logger.error, str(data)))()
 
+    @msgpack_reply
     def on_execute__get_channel_states(self, request):
+        '''
+        .. versionchanged:: 2.36.0
+            Pack reply if request data is packed (see
+            :func:`microdrop.hub_codec.msgpack_reply`).
+        '''
         return self.get_channel_states()
 
     def on_execute__clear_electrode_states(self, request):
@@ -285,6 +299,11 @@ class ElectrodeControllerPlugin(SingletonPlugin, StepOptionsController,
     implements(IElectrodeController)
     implements(IApplicationMode)
     plugin_name = 'microdrop.electrode_controller_plugin'
+    #: ``on_plugin_enable`` may be called from a background thread (see
+    #: :func:`microdrop.plugin_manager.emit_signal_concurrent`).
+    #:
+    #: .. versionadded:: 2.36.0
+    threadsafe_callbacks = ('on_plugin_enable', )
 
     def __init__(self):
         self.name = self.plugin_name
@@ -292,6 +311,10 @@ class ElectrodeControllerPlugin(SingletonPlugin, StepOptionsController,
         self.stopped = threading.Event()
         self._active_actuation = None
         self.executor = ThreadPoolExecutor(max_workers=1)
+        # Step options resolved by `prepare_step()`, as
+        # `(plugin_kwargs, step_options)` tuples indexed by
+        # `id(plugin_kwargs)`.
+        self._prepared_steps = {}
 
     @property
     def AppFields(self):
@@ -435,6 +458,46 @@ class ElectrodeControllerPlugin(SingletonPlugin, StepOptionsController,
         else:
             _L().debug('ZeroMQ plugin not ready.')
 
+    def _step_options(self, plugin_kwargs, app):
+        '''
+        .. versionadded:: 2.36.0
+
+        Returns
+        -------
+        dict or None
+            Electrode controller options for step (default step options if
+            not set in :data:`plugin_kwargs`), or ``None`` if no options are
+            available.
+        '''
+        if self.name in plugin_kwargs:
+            return dict(plugin_kwargs[self.name])
+        elif app is not None:
+            return self.get_default_step_options()
+        # Default step options are read from application configuration.
+        return None
+
+    def prepare_step(self, plugin_kwargs):
+        '''
+        .. versionadded:: 2.36.0
+
+        Resolve step options for upcoming step while the current step is
+        executing (pipelined mode).
+
+        Parameters
+        ----------
+        plugin_kwargs : dict
+            Plugin settings as JSON serializable dictionary.
+        '''
+        try:
+            app = get_app()
+        except KeyError:
+            app = None
+        if len(self._prepared_steps) > 1:
+            # Discard stale preparations (e.g., if protocol was paused).
+            self._prepared_steps.clear()
+        self._prepared_steps[id(plugin_kwargs)] = \
+            (plugin_kwargs, self._step_options(plugin_kwargs, app))
+
     @asyncio.coroutine
     def on_step_run(self, plugin_kwargs, signals):
         '''
@@ -453,6 +516,26 @@ class ElectrodeControllerPlugin(SingletonPlugin, StepOptionsController,
             Use default options if plugin parameters not found in
             :data:`plugin_kwargs`.
 
+        .. versionchanged:: 2.36.0
+            Do not modify :data:`plugin_kwargs` (a read-only snapshot).
+
+        .. versionchanged:: 2.36.0
+            Support execution without a MicroDrop application (e.g., using
+            :mod:`microdrop.bin.headless`).  In this case, steps are executed
+            as if a protocol is running and steps without electrode controller
+            options are skipped.
+
+        .. versionchanged:: 2.36.0
+            Use step options resolved by :meth:`prepare_step`, if available.
+
+        .. versionchanged:: 2.36.0
+            In real-time mode, apply electrode state updates sent to the
+            running step (see :func:`execute.apply_electrode_state_updates`).
+
+        .. versionchanged:: 2.36.0
+            Pass device electrode IDs to :func:`execute.execute_actuations` to
+            preallocate merged dynamic electrode states.
+
         Parameters
         ----------
         plugin_kwargs : dict
@@ -460,12 +543,34 @@ class ElectrodeControllerPlugin(SingletonPlugin, StepOptionsController,
         signals : blinker.Namespace
             Signals namespace.
         '''
-        kwargs = plugin_kwargs.setdefault(self.name,
-                                          self.get_default_step_options())
-        app = get_app()
-        kwargs['dynamic'] = app.running
-        if app.mode & MODE_REAL_TIME_MASK & ~MODE_RUNNING_MASK:
-            kwargs['Duration (s)'] = 0
+        try:
+            app = get_app()
+        except KeyError:
+            # No MicroDrop application is registered (e.g., headless).
+            app = None
+
+        prepared = self._prepared_steps.pop(id(plugin_kwargs), None)
+        if prepared is not None and prepared[0] is plugin_kwargs:
+            kwargs = prepared[1]
+        else:
+            kwargs = self._step_options(plugin_kwargs, app)
+        if kwargs is None:
+            raise asyncio.Return()
+
+        if app is None:
+            kwargs['dynamic'] = True
+        else:
+            kwargs['dynamic'] = app.running
+            if app.dmf_device is not None:
+                # Preallocate merged dynamic electrode states.
+                kwargs['electrode_ids'] = app.dmf_device.electrode_areas.index
+            if app.mode & MODE_REAL_TIME_MASK & ~MODE_RUNNING_MASK:
+                kwargs['Duration (s)'] = 0
+                # Apply electrode state updates to running step (see
+                # `execute()`).
+                kwargs['realtime'] = True
+        plugin_kwargs = dict(plugin_kwargs)
+        plugin_kwargs[self.name] = kwargs
 
         result = yield asyncio.From(execute(plugin_kwargs, signals))
 
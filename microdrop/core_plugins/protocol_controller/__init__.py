@@ -1,19 +1,15 @@
 from collections import Counter
-from concurrent.futures import ThreadPoolExecutor
-import copy
 import os
 import logging
 import shutil
 import Queue
 
-from asyncio_helpers import cancellable
 from logging_helpers import _L, caller_name
 from microdrop_utility import FutureVersionError
 from microdrop_utility.gui import (yesno, contains_pointer, register_shortcuts,
                                    textentry_validate, text_entry_dialog)
 from pygtkhelpers.gthreads import gtk_threadsafe
 from zmq_plugin.plugin import Plugin as ZmqPlugin
-from zmq_plugin.schema import decode_content_data
 import blinker
 import gobject
 import gtk
@@ -21,12 +17,18 @@ import path_helpers as ph
 import trollius as asyncio
 import zmq
 
-from ...app_context import get_app, get_hub_uri
+from ...app_context import get_app, get_hub_uri, MODE_REAL_TIME_PROGRAMMING
+from ...gtk_dispatch import GTK_DISPATCHER, gtk_coalesce, gtk_dispatch
+from ...hub_codec import decode_content_data, msgpack_reply
 from ...plugin_manager import (IPlugin, SingletonPlugin, implements,
                               PluginGlobals, ScheduleRequest, emit_signal,
-                              get_service_instance_by_name, get_service_names)
+                              get_service_instance_by_name, get_service_names,
+                              get_deferred_plugin_names)
 from ...protocol import Protocol, SerializationError
+from ...step_timing import STEP_TIMING
 from .execute import execute_step, execute_steps
+from .execution_loop import ExecutionLoop
+from .realtime import RealtimeStepScheduler
 
 logger = logging.getLogger(__name__)
 
@@ -120,6 +122,89 @@ class ProtocolControllerZmqPlugin(ZmqPlugin):
         except Exception:
             _L().error(str(data), exc_info=True)
 
+    @msgpack_reply
+    def on_execute__get_step_timing_histograms(self, request):
+        '''
+        .. versionadded:: 2.36.0
+
+        Optional request fields:
+
+         - ``bin_edges``: histogram bin edges (in seconds).
+
+        Returns
+        -------
+        dict
+            Latency histograms of recorded step execution events, grouped by
+            event and plugin (see
+            :meth:`microdrop.step_timing.StepTimingRecorder.histograms`).
+        '''
+        data = decode_content_data(request)
+        try:
+            return STEP_TIMING.histograms(bin_edges=(data or
+                                                     {}).get('bin_edges'))
+        except Exception:
+            _L().error(str(data), exc_info=True)
+
+    @msgpack_reply
+    def on_execute__get_step_timing_events(self, request):
+        '''
+        .. versionadded:: 2.36.0
+
+        Optional request fields:
+
+         - ``since_step_id``: only return events recorded since the step with
+           the specified sequence number.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Recorded step execution events (see
+            :meth:`microdrop.step_timing.StepTimingRecorder.frame`).
+        '''
+        data = decode_content_data(request)
+        try:
+            df_events = STEP_TIMING.frame()
+            since_step_id = (data or {}).get('since_step_id')
+            if since_step_id is not None:
+                df_events = df_events.loc[df_events.step_id >= since_step_id]
+            return df_events
+        except Exception:
+            _L().error(str(data), exc_info=True)
+
+    def on_execute__get_realtime_stats(self, request):
+        '''
+        .. versionadded:: 2.36.0
+
+        Returns
+        -------
+        dict
+            Real-time mode step execution counts (e.g., number of dropped
+            updates) and electrode state update rate (see
+            :meth:`RealtimeStepScheduler.stats`).
+        '''
+        data = decode_content_data(request)
+        try:
+            return self.parent.realtime_scheduler.stats()
+        except Exception:
+            _L().error(str(data), exc_info=True)
+
+    def on_execute__get_gui_dispatch_stats(self, request):
+        '''
+        .. versionadded:: 2.36.0
+
+        Returns
+        -------
+        dict
+            GUI update dispatcher counts, e.g., number of updates coalesced
+            or dropped (see
+            :meth:`microdrop.gtk_dispatch.GtkUpdateDispatcher.stats`).
+        '''
+        data = decode_content_data(request)
+        try:
+            return GTK_DISPATCHER.stats()
+        except Exception:
+            _L().error(str(data), exc_info=True)
+
 
 PluginGlobals.push_env('microdrop')
 
@@ -127,9 +212,25 @@ PluginGlobals.push_env('microdrop')
 class ProtocolController(SingletonPlugin):
     implements(IPlugin)
 
+    #: If ``True``, prepare each step while the previous step is executing
+    #: when running a protocol (see :func:`execute_steps`).
+    #:
+    #: .. versionadded:: 2.36.0
+    pipeline_steps = False
+
+    #: If ``True``, add step execution latencies (see
+    #: :data:`microdrop.step_timing.STEP_TIMING`) to the experiment log each
+    #: time a protocol run finishes or is paused.
+    #:
+    #: .. versionadded:: 2.36.0
+    log_step_timing = False
+
     def __init__(self):
         self.name = "microdrop.gui.protocol_controller"
-        self.executor = ThreadPoolExecutor()
+        #: .. versionadded:: 2.36.0
+        #:
+        #: Persistent event loop thread to execute steps in.
+        self.execution_loop = ExecutionLoop()
         self.builder = None
         self.label_step_number = None
         self.label_step_number = None
@@ -143,6 +244,10 @@ class ProtocolController(SingletonPlugin):
         self.plugin = None
         self.plugin_timeout_id = None
         self.step_execution_queue = Queue.Queue()
+        #: .. versionadded:: 2.36.0
+        self.realtime_scheduler = \
+            RealtimeStepScheduler(self.execution_loop,
+                                  self.step_execution_queue)
 
         # Protocol execution state
         self.protocol_state = {'loop': 0, 'step_number': 0}
@@ -215,11 +320,18 @@ version of the software.'''.strip(), filename, why.future_version,
         ----------
         plugin : microdrop.protocol.Protocol
             MicroDrop protocol.
+
+
+        .. versionchanged:: 2.36.0
+            Do not treat data from installed plugins that have not been
+            imported (see :func:`get_deferred_plugin_names`) as missing.
         '''
         # Check if the protocol contains data from plugins that are not
-        # enabled.
+        # installed (installed plugins may not be imported yet; see
+        # `load_plugins()`).
         enabled_plugins = (get_service_names(env='microdrop.managed') +
-                           get_service_names('microdrop'))
+                           get_service_names('microdrop') +
+                           get_deferred_plugin_names())
         missing_plugins = []
         for k, v in protocol.plugin_data.items():
             if k not in enabled_plugins and k not in missing_plugins:
@@ -585,6 +697,19 @@ version of the software.'''.strip(), filename, why.future_version,
             .. note:: As of version 2.32, step execution while running a
             protocol is no longer triggered by `on_step_swapped()`.
 
+        .. versionchanged:: 2.36.0
+            Execute read-only snapshot of protocol steps (see
+            :meth:`microdrop.protocol.Protocol.snapshot`), taken once when the
+            protocol starts running, instead of converting protocol using
+            :meth:`to_dict`.
+
+        .. versionchanged:: 2.36.0
+            Execute steps in pipelined mode if :attr:`pipeline_steps` is set.
+
+        .. versionchanged:: 2.36.0
+            Add step execution latencies to experiment log if
+            :attr:`log_step_timing` is set.
+
         See also
         --------
         `run_step()`
@@ -599,6 +724,7 @@ version of the software.'''.strip(), filename, why.future_version,
         signals = blinker.Namespace()
         start_i = self.protocol_state['step_number']
         first_pass_complete = []
+        first_step_id = STEP_TIMING.step_id + 1
 
         @asyncio.coroutine
         def on_step_started(sender, **kwargs):
@@ -609,7 +735,9 @@ version of the software.'''.strip(), filename, why.future_version,
                 # selected step.
                 step_number += start_i
             # Trigger `goto_step()` to update protocol grid selection, etc.
-            gtk_threadsafe(self.goto_step)(step_number)
+            # Only the most recently started step is selected if steps start
+            # faster than the GUI is updated.
+            gtk_coalesce(self.goto_step)(step_number)
 
         @asyncio.coroutine
         def on_step_completed(sender, **kwargs):
@@ -618,20 +746,23 @@ version of the software.'''.strip(), filename, why.future_version,
         signals.signal('step-started').connect(on_step_started, weak=False)
         signals.signal('step-completed').connect(on_step_completed, weak=False)
 
+        # Take read-only snapshot of protocol steps for this run.
+        all_steps = app.protocol.snapshot()
+
         @asyncio.coroutine
         def repeat_steps():
-            all_steps = app.protocol.to_dict()['steps']
 
             for i in xrange(app.protocol.n_repeats):
                 steps = all_steps[start_i:] if i == 0 else all_steps
                 self.protocol_state['loop'] = i
-                yield asyncio.From(execute_steps(steps, signals=signals))
+                yield asyncio.From(execute_steps(steps, signals=signals,
+                                                 pipeline=self
+                                                 .pipeline_steps))
                 first_pass_complete.append(True)
-            gtk_threadsafe(emit_signal)('on_protocol_finished')
+            gtk_dispatch(emit_signal)('on_protocol_finished')
 
-        task = cancellable(repeat_steps)
-        future = self.executor.submit(task)
-        self.step_execution_queue.put((task, future))
+        future = self.execution_loop.submit(repeat_steps)
+        self.step_execution_queue.put(future)
 
         def on_done(future):
             try:
@@ -641,12 +772,42 @@ version of the software.'''.strip(), filename, why.future_version,
                 pass
             except Exception as exception:
                 _L().info('`%s`', exception, exc_info=True)
-                gtk_threadsafe(_L().error)('`%s`', exception)
+                gtk_dispatch(_L().error)('`%s`', exception)
             finally:
-                gtk_threadsafe(self.pause_protocol)()
+                # Note: use GUI update dispatcher to run _after_ any pending
+                # (coalesced) step updates.
+                gtk_dispatch(self.pause_protocol)()
+                if self.log_step_timing:
+                    gtk_dispatch(self.log_step_timing_data)(first_step_id)
+                _L().debug('GUI update dispatcher: %s',
+                           GTK_DISPATCHER.stats())
 
         future.add_done_callback(on_done)
 
+    def log_step_timing_data(self, since_step_id=0):
+        '''
+        .. versionadded:: 2.36.0
+
+        Add step execution latencies (see
+        :meth:`microdrop.step_timing.StepTimingRecorder.latencies`) recorded
+        since the specified step to the experiment log.
+
+        Parameters
+        ----------
+        since_step_id : int, optional
+            Sequence number of first step to log.
+        '''
+        app = get_app()
+        if not getattr(app, 'experiment_log', None):
+            return
+        df_latencies = STEP_TIMING.latencies()
+        df_latencies = df_latencies.loc[df_latencies.step_id >=
+                                        since_step_id]
+        if df_latencies.shape[0]:
+            app.experiment_log.add_data({'step_timing':
+                                         df_latencies.to_dict('records')},
+                                        plugin_name=self.name)
+
     def pause_protocol(self):
         '''
         .. versionchanged:: 2.30
@@ -671,16 +832,15 @@ version of the software.'''.strip(), filename, why.future_version,
         .. versionadded:: 2.30
 
         Cancel any current step executions.
+
+        .. versionchanged:: 2.36.0
+            Cancel step coroutines running on :attr:`execution_loop`.
         '''
         while True:
             try:
-                step_task, future = self.step_execution_queue.get_nowait()
-                if not future.done():
+                future = self.step_execution_queue.get_nowait()
+                if self.execution_loop.cancel(future):
                     _L().info('Cancel running step.')
-                    try:
-                        step_task.cancel()
-                    except RuntimeError:
-                        pass
             except Queue.Empty:
                 break
 
@@ -725,6 +885,21 @@ version of the software.'''.strip(), filename, why.future_version,
             .. note:: As of version 2.32, this method is _only _ used for
             execute of a _single step_ (without executing the whole protocol).
 
+        .. versionchanged:: 2.36.0
+            Execute read-only snapshot of step (see
+            :meth:`microdrop.protocol.Step.snapshot`) instead of deep copy.
+
+        .. versionchanged:: 2.36.0
+            Run :func:`execute_step()` coroutine on persistent
+            :attr:`execution_loop` instead of a new thread and event loop.
+            Return future for step result.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Future for step result (``None`` if no protocol or device is
+            loaded).
+
         See also
         --------
         `run_protocol()`
@@ -732,12 +907,12 @@ version of the software.'''.strip(), filename, why.future_version,
         app = get_app()
         if app.protocol and app.dmf_device:
             self.cancel_steps()
-            task = cancellable(execute_step)
-            # Take snapshot of arguments for current step.
+            # Take read-only snapshot of arguments for current step.
             step = app.protocol[self.protocol_state['step_number']]
-            plugin_kwargs = copy.deepcopy(step.plugin_data)
-            future = self.executor.submit(task, plugin_kwargs)
-            self.step_execution_queue.put((task, future))
+            plugin_kwargs = step.snapshot()
+            future = self.execution_loop.submit(execute_step, plugin_kwargs)
+            self.step_execution_queue.put(future)
+            return future
 
     def on_step_options_changed(self, plugin, step_number):
         '''
@@ -755,9 +930,22 @@ version of the software.'''.strip(), filename, why.future_version,
             step_number = self.protocol_state['step_number']
             emit_signal('on_step_swapped', [step_number, step_number])
 
-    def on_step_created(self, step_number):
+    def on_steps_inserted(self, step_numbers):
         '''
-        Mark protocol as modified when a new step is created.
+        Mark protocol as modified when new steps are inserted.
+
+        .. versionchanged:: 2.36.0
+            Replace ``on_step_created`` handler to handle batch insertions
+            with a single ``on_protocol_changed`` signal.
+        '''
+        self.modified = True
+        emit_signal('on_protocol_changed')
+
+    def on_steps_removed(self, step_numbers, steps):
+        '''
+        Mark protocol as modified when steps are removed.
+
+        .. versionadded:: 2.36.0
         '''
         self.modified = True
         emit_signal('on_protocol_changed')
@@ -768,12 +956,29 @@ version of the software.'''.strip(), filename, why.future_version,
             Only call :meth:`run_step()` if in real-time mode while protocol is
             not running.  Otherwise, step execution is handled completely by
             :meth:`run_protocol()`.
+
+        .. versionchanged:: 2.36.0
+            Request step execution through :attr:`realtime_scheduler` instead
+            of calling :meth:`run_step()`, to coalesce bursts of step changes
+            and apply electrode state changes to the running step.
         '''
         _L().debug('%s -> %s', original_step_number, step_number)
         self._update_labels()
         app = get_app()
-        if app.realtime_mode and not app.running:
-            self.run_step()
+        if app.realtime_mode and not app.running and app.protocol and \
+                app.dmf_device:
+            step = app.protocol[self.protocol_state['step_number']]
+            self.realtime_scheduler.request(step.snapshot())
+
+    def on_mode_changed(self, old_mode, new_mode):
+        '''
+        Cancel real-time step execution when leaving real-time mode.
+
+        .. versionadded:: 2.36.0
+        '''
+        if (old_mode & MODE_REAL_TIME_PROGRAMMING) and \
+                not (new_mode & MODE_REAL_TIME_PROGRAMMING):
+            self.cancel_steps()
 
     def _update_labels(self):
         app = get_app()
@@ -797,7 +1002,12 @@ version of the software.'''.strip(), filename, why.future_version,
             self.create_protocol()
 
     def on_app_exit(self):
+        '''
+        .. versionchanged:: 2.36.0
+            Stop step execution event loop thread.
+        '''
         self.cleanup_plugin()
+        self.execution_loop.stop(timeout=5)
         app = get_app()
         if self.modified:
             result = yesno('Protocol %s has unsaved changes.  Save now?' %
@@ -813,10 +1023,15 @@ version of the software.'''.strip(), filename, why.future_version,
         """
         Returns a list of scheduling requests (i.e., ScheduleRequest
         instances) for the function specified by function_name.
+
+        .. versionchanged:: 2.36.0
+            Enable after ZeroMQ hub plugin, since ``on_plugin_enable``
+            connects to the hub.
         """
         if function_name == 'on_plugin_enable':
             return [ScheduleRequest('microdrop.gui.main_window_controller',
-                                    self.name)]
+                                    self.name),
+                    ScheduleRequest('microdrop.zmq_hub_plugin', self.name)]
         elif function_name == 'on_dmf_device_swapped':
             # make sure that the app gets a reference to the device before we
             # create a new protocol
@@ -1,17 +1,67 @@
 '''
 .. versionadded:: 2.35.0
 '''
-import copy
+import timeit
 
 from logging_helpers import _L
 import blinker
 import trollius as asyncio
 
 from ...plugin_manager import emit_signal
+from ...protocol import freeze
+from ...step_timing import STEP_TIMING
 
 
 @asyncio.coroutine
-def execute_step(plugin_kwargs):
+def _result(value):
+    '''
+    XXX Coroutine XXX
+
+    Wait for value if it is a coroutine or future.
+    '''
+    if asyncio.iscoroutine(value) or isinstance(value, asyncio.Future):
+        value = yield asyncio.From(value)
+    raise asyncio.Return(value)
+
+
+@asyncio.coroutine
+def prepare_step(plugin_kwargs):
+    '''
+    .. versionadded:: 2.36.0
+
+    XXX Coroutine XXX
+
+    Call ``prepare_step()`` on each enabled plugin implementing it.
+
+    Preparation is an optimization, so any plugin errors are logged and
+    otherwise ignored.
+
+    Parameters
+    ----------
+    plugin_kwargs : dict
+        Plugin keyword arguments, indexed by plugin name.
+
+    Returns
+    -------
+    dict
+        Mapping from each plugin name to the respective ``prepare_step()``
+        return value (or exception).
+    '''
+    plugin_kwargs = freeze(plugin_kwargs)
+    responses = emit_signal('prepare_step', args=[plugin_kwargs])
+    names = responses.keys()
+    results = yield asyncio.From(asyncio.gather(*(_result(responses[name])
+                                                  for name in names),
+                                                return_exceptions=True))
+    for name_i, result_i in zip(names, results):
+        if isinstance(result_i, Exception):
+            _L().warning('Error preparing step in `%s`: `%s`', name_i,
+                         result_i)
+    raise asyncio.Return(dict(zip(names, results)))
+
+
+@asyncio.coroutine
+def execute_step(plugin_kwargs, timing=None, signals=None):
     '''
     .. versionadded:: 2.32
 
@@ -23,16 +73,42 @@ def execute_step(plugin_kwargs):
     ----------
     plugin_kwargs : dict
         Plugin keyword arguments, indexed by plugin name.
+    timing : dict, optional
+        If specified, set ``dispatched`` to the time (see
+        :func:`timeit.default_timer`) all ``on_step_run()`` coroutines were
+        dispatched.
+    signals : blinker.Namespace, optional
+        Signals namespace passed to ``on_step_run()`` coroutines (default:
+        new namespace).
 
     Returns
     -------
     list
         Return values from plugin ``on_step_run()`` coroutines.
+
+
+    .. versionchanged:: 2.36.0
+        Pass read-only view of :data:`plugin_kwargs` (see
+        :func:`microdrop.protocol.freeze`) to ``on_step_run()`` coroutines
+        instead of a deep copy.
+
+    .. versionchanged:: 2.36.0
+        Add :data:`timing` parameter.  Record start and finish of each plugin
+        ``on_step_run()`` coroutine (see :data:`STEP_TIMING`).
+
+    .. versionchanged:: 2.36.0
+        Add :data:`signals` parameter, e.g., to send signals to plugins while
+        the step is executing.
+
+    .. versionchanged:: 2.36.0
+        Cancel plugin ``on_step_run()`` coroutines if step is cancelled.
     '''
-    # Take snapshot of arguments for current step.
-    plugin_kwargs = copy.deepcopy(plugin_kwargs)
+    # Take read-only snapshot of arguments for current step (no-op if
+    # arguments are already a snapshot, e.g., from `Step.snapshot()`).
+    plugin_kwargs = freeze(plugin_kwargs)
 
-    signals = blinker.Namespace()
+    if signals is None:
+        signals = blinker.Namespace()
 
     @asyncio.coroutine
     def notify_signals_connected():
@@ -43,15 +119,26 @@ def execute_step(plugin_kwargs):
     # Get list of coroutine futures by emitting `on_step_run()`.
     plugin_step_tasks = emit_signal("on_step_run", args=[plugin_kwargs,
                                                          signals])
-    future = asyncio.wait(plugin_step_tasks.values())
+    tasks = [loop.create_task(STEP_TIMING.timed('on_step_run', task_i,
+                                                plugin=name_i))
+             for name_i, task_i in plugin_step_tasks.iteritems()]
+    if timing is not None:
+        timing['dispatched'] = timeit.default_timer()
 
     loop.create_task(notify_signals_connected())
-    result = yield asyncio.From(future)
+    try:
+        result = yield asyncio.From(asyncio.wait(tasks))
+    except asyncio.CancelledError:
+        # Note: `asyncio.wait()` does not cancel the tasks it waits for, and
+        # the event loop may outlive the step (see `ExecutionLoop`).
+        for task_i in tasks:
+            task_i.cancel()
+        raise
     raise asyncio.Return(result)
 
 
 @asyncio.coroutine
-def execute_steps(steps, signals=None):
+def execute_steps(steps, signals=None, pipeline=False):
     '''
     .. versionadded:: 2.32
 
@@ -61,6 +148,24 @@ def execute_steps(steps, signals=None):
         List of plugin keyword argument dictionaries.
     signals : blinker.Namespace, optional
         Signals namespace where signals are sent through.
+    pipeline : bool, optional
+        If ``True``, prepare each step (see :func:`prepare_step`) while the
+        previous step is executing.
+
+    Returns
+    -------
+    list[dict]
+        Timing of each executed step, with the following keys (durations in
+        seconds):
+
+        - ``i``: step index
+        - ``dead_time_s``: time between completion of previous step and
+          dispatch of current step (``None`` for first step)
+        - ``prepare_wait_s``: time spent waiting for preparation of current
+          step to complete (only non-zero in pipelined mode)
+        - ``dispatch_s``: time to dispatch ``on_step_run()`` coroutines
+        - ``duration_s``: time from dispatch until all ``on_step_run()``
+          coroutines completed
 
     Signals
     -------
@@ -75,51 +180,111 @@ def execute_steps(steps, signals=None):
         - ``plugin_kwargs``: plugin keyword arguments
         - ``steps_count``: total number of steps
         - ``result``: list of plugin step return values
+        - ``timing``: step timing (see return value)
+
+
+    .. versionchanged:: 2.36.0
+        Add :data:`pipeline` parameter.  Measure dead time between steps;
+        return step timings and pass ``timing`` to ``step-completed``
+        receivers.
+
+    .. versionchanged:: 2.36.0
+        Record ``step-started`` and ``step-completed`` events (see
+        :data:`STEP_TIMING`).
     '''
     if signals is None:
         signals = blinker.Namespace()
 
-    for i, step_i in enumerate(steps):
-        # Send notification that step has completed.
-        responses = signals.signal('step-started')\
-            .send('execute_steps', i=i, plugin_kwargs=step_i,
-                  steps_count=len(steps))
-        yield asyncio.From(asyncio.gather(*(r[1] for r in responses)))
-        # XXX Execute `on_step_run` coroutines in background thread
-        # event-loop.
-        try:
-            done, pending = yield asyncio.From(execute_step(step_i))
-
-            exceptions = []
-
-            for d in done:
-                try:
-                    d.result()
-                except Exception as exception:
-                    exceptions.append(exception)
-                    _L().debug('Error: %s', exception, exc_info=True)
-
-            if exceptions:
-                use_markup = False
-                monospace_format = '<tt>%s</tt>' if use_markup else '%s'
-
-                if len(exceptions) == 1:
-                    message = (' ' + monospace_format % exceptions[0])
-                elif exceptions:
-                    message = ('\n%s' % '\n'.join(' - ' + monospace_format
-                                                    % e for e in exceptions))
-                raise RuntimeError('Error executing step:%s' % message)
-        except asyncio.CancelledError:
-            _L().debug('Cancelling protocol.', exc_info=True)
-            raise
-        except Exception as exception:
-            _L().debug('Error executing step: `%s`', exception, exc_info=True)
-            raise
-        else:
-            # All plugins have completed the step.
-            # Send notification that step has completed.
-            responses = signals.signal('step-completed')\
+    loop = asyncio.get_event_loop()
+    timings = []
+    previous_end = None
+    preparation = None
+
+    if pipeline and steps:
+        preparation = loop.create_task(prepare_step(steps[0]))
+
+    try:
+        for i, step_i in enumerate(steps):
+            timing = {'i': i, 'dead_time_s': None, 'prepare_wait_s': 0}
+            STEP_TIMING.start_step(i)
+            # Send notification that step has started.
+            responses = signals.signal('step-started')\
                 .send('execute_steps', i=i, plugin_kwargs=step_i,
-                      result=[r.result() for r in done],
                       steps_count=len(steps))
             yield asyncio.From(asyncio.gather(*(r[1] for r in responses)))
+
+            if preparation is not None:
+                # Wait for preparation of current step to complete.
+                start = timeit.default_timer()
+                yield asyncio.From(preparation)
+                timing['prepare_wait_s'] = timeit.default_timer() - start
+                preparation = None
+
+            # XXX Execute `on_step_run` coroutines in background thread
+            # event-loop.
+            try:
+                start = timeit.default_timer()
+                step_task = loop.create_task(execute_step(step_i,
+                                                          timing=timing))
+                if pipeline and i + 1 < len(steps):
+                    # Prepare next step while current step is executing.
+                    preparation = loop.create_task(prepare_step(steps[i +
+                                                                      1]))
+                done, pending = yield asyncio.From(step_task)
+                end = timeit.default_timer()
+                dispatched = timing.pop('dispatched')
+                timing['dispatch_s'] = dispatched - start
+                timing['duration_s'] = end - dispatched
+                if previous_end is not None:
+                    timing['dead_time_s'] = dispatched - previous_end
+                previous_end = end
+
+                exceptions = []
+
+                for d in done:
+                    try:
+                        d.result()
+                    except Exception as exception:
+                        exceptions.append(exception)
+                        _L().debug('Error: %s', exception, exc_info=True)
+
+                if exceptions:
+                    use_markup = False
+                    monospace_format = '<tt>%s</tt>' if use_markup else '%s'
+
+                    if len(exceptions) == 1:
+                        message = (' ' + monospace_format % exceptions[0])
+                    elif exceptions:
+                        message = ('\n%s' %
+                                   '\n'.join(' - ' + monospace_format % e
+                                             for e in exceptions))
+                    raise RuntimeError('Error executing step:%s' % message)
+            except asyncio.CancelledError:
+                _L().debug('Cancelling protocol.', exc_info=True)
+                raise
+            except Exception as exception:
+                _L().debug('Error executing step: `%s`', exception,
+                           exc_info=True)
+                raise
+            else:
+                timings.append(timing)
+                STEP_TIMING.record('step-completed')
+                # All plugins have completed the step.
+                # Send notification that step has completed.
+                responses = signals.signal('step-completed')\
+                    .send('execute_steps', i=i, plugin_kwargs=step_i,
+                          result=[r.result() for r in done],
+                          steps_count=len(steps), timing=timing)
+                yield asyncio.From(asyncio.gather(*(r[1] for r in responses)))
+    finally:
+        if preparation is not None:
+            preparation.cancel()
+
+    dead_times = [t['dead_time_s'] for t in timings
+                  if t['dead_time_s'] is not None]
+    if dead_times:
+        _L().info('%d steps executed (pipeline=%s), dead time between steps: '
+                  'mean=%.2f ms, max=%.2f ms', len(timings), pipeline,
+                  1e3 * sum(dead_times) / len(dead_times),
+                  1e3 * max(dead_times))
+    raise asyncio.Return(timings)
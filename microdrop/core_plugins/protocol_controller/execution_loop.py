@@ -0,0 +1,185 @@
+'''
+Persistent event loop thread for step execution.
+
+Rather than creating a new thread and trollius event loop for each step
+execution, coroutines are submitted to a single long-lived event loop
+running in a dedicated thread, such that the cost of starting an execution
+is a thread-safe loop call.
+
+Example
+-------
+
+Execute a step and wait for the result::
+
+    execution_loop = ExecutionLoop()
+    future = execution_loop.submit(execute_step, plugin_kwargs)
+    result = future.result()
+
+Cancel a step execution::
+
+    execution_loop.cancel(future)
+
+.. versionadded:: 2.36.0
+'''
+import threading
+
+from logging_helpers import _L
+import concurrent.futures
+import trollius as asyncio
+
+
+class ExecutionLoop(object):
+    '''
+    Event loop running in a dedicated (daemon) thread.
+
+    The thread is started on the first call to :meth:`submit` (or explicitly
+    with :meth:`start`).
+
+    Parameters
+    ----------
+    name : str, optional
+        Thread name.
+
+    Attributes
+    ----------
+    loop : asyncio.AbstractEventLoop
+        Event loop (``None`` until started).
+    '''
+    def __init__(self, name='step-execution'):
+        self.name = name
+        self.loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+        # Map each submitted future to the respective `asyncio.Task`.
+        self._tasks = {}
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        '''
+        Start event loop thread (no-op if already running).
+        '''
+        with self._lock:
+            if self.running:
+                return
+            started = threading.Event()
+
+            def _run():
+                self.loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(self.loop)
+                started.set()
+                try:
+                    self.loop.run_forever()
+                finally:
+                    self.loop.close()
+                    _L().debug('closed `%s` event loop', self.name)
+
+            self._thread = threading.Thread(target=_run, name=self.name)
+            self._thread.daemon = True
+            self._thread.start()
+            started.wait()
+
+    def stop(self, timeout=None):
+        '''
+        Cancel all running coroutines and stop event loop thread.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum time (in seconds) to wait for thread to stop.
+        '''
+        with self._lock:
+            if not self.running:
+                return
+            thread = self._thread
+            self._thread = None
+
+        def _stop():
+            tasks = list(self._tasks.values())
+            if not tasks:
+                self.loop.stop()
+                return
+            for task_i in tasks:
+                task_i.cancel()
+            # Let cancelled tasks unwind before stopping loop.
+            asyncio.gather(*tasks, return_exceptions=True)\
+                .add_done_callback(lambda *args: self.loop.stop())
+
+        self.loop.call_soon_threadsafe(_stop)
+        thread.join(timeout)
+
+    def submit(self, func, *args, **kwargs):
+        '''
+        Schedule coroutine to run on event loop (thread-safe).
+
+        Parameters
+        ----------
+        func : function
+            Coroutine function.
+        *args, **kwargs
+            Arguments to pass to :data:`func`.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Future for result of coroutine.  If the coroutine is cancelled
+            (see :meth:`cancel`), the future exception is set to
+            :class:`asyncio.CancelledError`.
+        '''
+        self.start()
+        future = concurrent.futures.Future()
+
+        def _on_done(task):
+            self._tasks.pop(future, None)
+            if task.cancelled():
+                future.set_exception(asyncio.CancelledError())
+            elif task.exception() is not None:
+                future.set_exception(task.exception())
+            else:
+                future.set_result(task.result())
+
+        def _create_task():
+            # Note: `set_running_or_notify_cancel()` returns `False` if the
+            # future was cancelled before the coroutine was started.
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                task = self.loop.create_task(func(*args, **kwargs))
+            except Exception as exception:
+                future.set_exception(exception)
+                return
+            self._tasks[future] = task
+            task.add_done_callback(_on_done)
+
+        self.loop.call_soon_threadsafe(_create_task)
+        return future
+
+    def cancel(self, future):
+        '''
+        Cancel coroutine submitted with :meth:`submit` (thread-safe).
+
+        Parameters
+        ----------
+        future : concurrent.futures.Future
+            Future returned by :meth:`submit`.
+
+        Returns
+        -------
+        bool
+            ``False`` if coroutine has already completed.
+        '''
+        if future.done():
+            return False
+        elif future.cancel():
+            # Coroutine had not started yet.
+            return True
+
+        def _cancel():
+            task = self._tasks.get(future)
+            if task is not None:
+                task.cancel()
+
+        self.loop.call_soon_threadsafe(_cancel)
+        return True
@@ -0,0 +1,264 @@
+'''
+Real-time mode step execution scheduler.
+
+In real-time mode, the selected step is executed each time its options
+change.  Rather than cancelling and restarting the step for every change,
+bursts of changes are coalesced into the latest step state, and changes to
+*only* the electrode states of a running step are sent to the electrode
+controller of the running step (see the ``electrode-states-updated``
+signal), which applies the updated states without re-executing the step.
+
+.. versionadded:: 2.36.0
+'''
+import collections
+import threading
+
+from logging_helpers import _L
+import blinker
+import numpy as np
+import pandas as pd
+import trollius as asyncio
+
+from ...step_timing import monotonic
+from .execute import execute_step
+
+#: Name of electrode controller plugin.
+ELECTRODE_CONTROLLER = 'microdrop.electrode_controller_plugin'
+
+
+def _equal(a, b):
+    '''
+    Returns
+    -------
+    bool
+        ``True`` if step options are equal (including nested dictionaries,
+        arrays, and :mod:`pandas` objects).
+    '''
+    if a is b:
+        return True
+    elif isinstance(a, dict) and isinstance(b, dict):
+        return (a.viewkeys() == b.viewkeys() and
+                all(_equal(a[k], b[k]) for k in a))
+    elif isinstance(a, (pd.Series, pd.DataFrame)):
+        return isinstance(b, a.__class__) and a.equals(b)
+    elif isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return np.array_equal(a, b)
+    try:
+        return bool(a == b)
+    except Exception:
+        return False
+
+
+def electrode_states_only_changed(previous, plugin_kwargs):
+    '''
+    Parameters
+    ----------
+    previous, plugin_kwargs : dict
+        Plugin keyword arguments, indexed by plugin name.
+
+    Returns
+    -------
+    bool
+        ``True`` if *only* the electrode controller ``electrode_states``
+        option differs between :data:`previous` and :data:`plugin_kwargs`.
+    '''
+    if previous.viewkeys() != plugin_kwargs.viewkeys() or \
+            ELECTRODE_CONTROLLER not in plugin_kwargs:
+        return False
+    for name_i in plugin_kwargs:
+        if name_i == ELECTRODE_CONTROLLER:
+            previous_i = dict(previous[name_i])
+            kwargs_i = dict(plugin_kwargs[name_i])
+            previous_i.pop('electrode_states', None)
+            kwargs_i.pop('electrode_states', None)
+        else:
+            previous_i = previous[name_i]
+            kwargs_i = plugin_kwargs[name_i]
+        if not _equal(previous_i, kwargs_i):
+            return False
+    return True
+
+
+class RealtimeStepScheduler(object):
+    '''
+    Coalesce real-time mode step executions.
+
+    Parameters
+    ----------
+    execution_loop : ExecutionLoop
+        Event loop to run steps in.
+    step_execution_queue : Queue.Queue
+        Queue to put each step future in, such that steps may be cancelled
+        (e.g., by :meth:`ProtocolController.cancel_steps`).
+    window_s : float, optional
+        Duration (in seconds) over which the update rate is measured.
+
+    Attributes
+    ----------
+    counts : dict
+        Number of step states ``requested``, number of step executions
+        ``started``, number of electrode state ``updates`` sent to a running
+        step, number of updates ``applied`` by the electrode controller, and
+        number of requested states ``dropped`` (i.e., superseded by a more
+        recent state before being executed or applied).
+    '''
+    def __init__(self, execution_loop, step_execution_queue, window_s=5.):
+        self.execution_loop = execution_loop
+        self.step_execution_queue = step_execution_queue
+        self.window_s = window_s
+        self.counts = dict.fromkeys(['requested', 'started', 'updates',
+                                     'applied', 'dropped'], 0)
+        self._applied_times = collections.deque(maxlen=1000)
+        # Note: re-entrant, since cancelling a step future that has not
+        # started calls `_on_done()` in the cancelling thread.
+        self._lock = threading.RLock()
+        # Most recently requested step state (not yet started).
+        self._pending = None
+        # Running step state.
+        self._running = None
+
+    def request(self, plugin_kwargs):
+        '''
+        Request execution of step state.
+
+        If a step is running and only its electrode states differ from
+        :data:`plugin_kwargs`, send updated electrode states to the running
+        step.  Otherwise, cancel the running step and execute
+        :data:`plugin_kwargs`.
+
+        Parameters
+        ----------
+        plugin_kwargs : dict
+            Read-only step snapshot (see
+            :meth:`microdrop.protocol.Step.snapshot`).
+        '''
+        with self._lock:
+            self.counts['requested'] += 1
+            running = self._running
+            # Note: `loop` and `plugin_kwargs` are only set once the step
+            # has started (see `_execute()`).
+            if (running is not None and running['loop'] is not None and
+                    not running['future'].done() and
+                    electrode_states_only_changed(running['plugin_kwargs'],
+                                                  plugin_kwargs)):
+                running['plugin_kwargs'] = plugin_kwargs
+                if running['update'] is not None:
+                    self.counts['dropped'] += 1
+                running['update'] = plugin_kwargs
+                if not running['update_scheduled']:
+                    running['update_scheduled'] = True
+                    running['loop'].call_soon_threadsafe(self._send_update,
+                                                         running)
+                return
+            if self._pending is not None:
+                # Step has not started yet; replace with latest state.
+                self.counts['dropped'] += 1
+                self._pending = plugin_kwargs
+                return
+            self._pending = plugin_kwargs
+            self._start()
+
+    def _start(self):
+        # Note: must be called with `_lock` held.
+        previous, self._running = self._running, None
+        if previous is not None:
+            # Note: `_pending` is kept, since `_on_done()` ignores steps that
+            # are no longer running.
+            self.execution_loop.cancel(previous['future'])
+        signals = blinker.Namespace()
+        signals.signal('electrode-states-applied')\
+            .connect(self._on_applied, weak=False)
+        running = {'signals': signals, 'loop': None, 'plugin_kwargs': None,
+                   'update': None, 'update_scheduled': False}
+        running['future'] = future = self.execution_loop.submit(self._execute,
+                                                                running)
+        self._running = running
+        future.add_done_callback(lambda future: self._on_done(running))
+        self.step_execution_queue.put(future)
+
+    def _on_done(self, running):
+        '''
+        Clear requested step state if step future was cancelled before the
+        step started (e.g., by :meth:`ProtocolController.cancel_steps`).
+        Otherwise, the requested state would never be executed and all
+        subsequent requests would be dropped.
+        '''
+        with self._lock:
+            if (self._running is running and running['loop'] is None and
+                    running['future'].cancelled()):
+                self._running = None
+                if self._pending is not None:
+                    self._pending = None
+                    self.counts['dropped'] += 1
+
+    @asyncio.coroutine
+    def _execute(self, running):
+        '''
+        XXX Coroutine XXX
+
+        Execute most recently requested step state.
+        '''
+        with self._lock:
+            if self._running is not running:
+                # Superseded by a more recently started step.
+                raise asyncio.Return()
+            running['loop'] = asyncio.get_event_loop()
+            running['plugin_kwargs'] = plugin_kwargs = self._pending
+            self._pending = None
+            self.counts['started'] += 1
+        result = yield asyncio.From(execute_step(plugin_kwargs,
+                                                 signals=running['signals']))
+        raise asyncio.Return(result)
+
+    def _send_update(self, running):
+        '''
+        Send latest electrode states to running step (called in step event
+        loop).
+        '''
+        with self._lock:
+            plugin_kwargs = running['update']
+            running['update'] = None
+            running['update_scheduled'] = False
+        electrode_states = (plugin_kwargs[ELECTRODE_CONTROLLER]
+                            .get('electrode_states', pd.Series()))
+        responses = (running['signals'].signal('electrode-states-updated')
+                     .send('realtime', electrode_states=electrode_states))
+        with self._lock:
+            if self._running is not running:
+                # Superseded by a more recently started step.
+                self.counts['dropped'] += 1
+            elif not responses:
+                # Running step is not accepting updates; execute new step.
+                _L().debug('No receivers for electrode states update.')
+                start = self._pending is None
+                self._pending = plugin_kwargs
+                if start:
+                    self._start()
+            else:
+                self.counts['updates'] += 1
+                # Receivers return `True` if a previous update was replaced
+                # before being applied.
+                self.counts['dropped'] += sum(1 for r in responses if r[1])
+
+    def _on_applied(self, sender, **kwargs):
+        with self._lock:
+            self.counts['applied'] += 1
+            self._applied_times.append(monotonic())
+
+    def stats(self):
+        '''
+        Returns
+        -------
+        dict
+            Copy of :attr:`counts`, with the rate (in Hz) at which electrode
+            state updates were applied (``update_rate_hz``), measured over
+            the last :attr:`window_s` seconds.
+        '''
+        with self._lock:
+            stats = dict(self.counts)
+            now = monotonic()
+            times = [t for t in self._applied_times
+                     if now - t <= self.window_s]
+        stats['update_rate_hz'] = (len(times) / self.window_s
+                                   if times else 0.)
+        return stats
@@ -0,0 +1,336 @@
+'''
+Simulated electrode actuator and waveform generator, e.g., for load testing
+and benchmarking the actuation path without any hardware connected.
+
+.. note::
+    This plugin is **not** enabled by default.  Import this module and enable
+    the plugin explicitly, e.g.::
+
+        from microdrop.core_plugins import simulated_actuator_plugin
+        from microdrop.plugin_manager import get_service_instance_by_name
+
+        plugin = get_service_instance_by_name('microdrop'
+                                              '.simulated_actuator_plugin',
+                                              env='microdrop')
+        plugin.configure(latency_s=.005, time_scale=.01)
+        plugin.enable()
+
+.. versionadded:: 2.36.0
+'''
+import datetime as dt
+import logging
+import random
+
+import pandas as pd
+import trollius as asyncio
+
+from ...interfaces import IElectrodeActuator, IWaveformGenerator
+from ...plugin_manager import (PluginGlobals, SingletonPlugin, IPlugin,
+                               implements)
+
+logger = logging.getLogger(__name__)
+
+
+class SimulatedActuationError(Exception):
+    pass
+
+
+PluginGlobals.push_env('microdrop')
+
+
+class SimulatedActuatorPlugin(SingletonPlugin):
+    '''
+    Simulated electrode actuator and waveform generator.
+
+    Each actuation request waits for the requested duration, plus a latency
+    and a random jitter, all scaled by :attr:`time_scale`.  Each actuation is
+    recorded to :attr:`trace`.
+
+    Attributes
+    ----------
+    latency_s : float
+        Simulated latency of each actuation and waveform request (in
+        seconds).
+    jitter_s : float
+        Maximum random (uniformly distributed) delay added to each latency
+        (in seconds).
+    failure_rate : float
+        Probability (in the range ``[0, 1]``) that an actuation request
+        fails.
+    time_scale : float
+        Scale factor applied to all simulated delays, e.g., ``0.01`` to
+        simulate 100 times faster than real time, or ``0`` to not wait at
+        all.
+    electrode_ids : set, optional
+        Electrodes available for actuation.  If ``None``, all requested
+        electrodes are actuated.
+    delta : bool
+        If ``True``, accept delta actuation requests (see
+        :meth:`on_actuation_delta_request`) instead of full state requests.
+    voltage : float
+        Last voltage set (in volts).
+    frequency : float
+        Last frequency set (in Hz).
+    trace : list[dict]
+        Record of each actuation request (see :meth:`on_actuation_request`).
+    '''
+    implements(IPlugin)
+    implements(IElectrodeActuator)
+    implements(IWaveformGenerator)
+    plugin_name = 'microdrop.simulated_actuator_plugin'
+
+    def __init__(self):
+        self.name = self.plugin_name
+        self.latency_s = 0.
+        self.jitter_s = 0.
+        self.failure_rate = 0.
+        self.time_scale = 1.
+        self.electrode_ids = None
+        self.delta = False
+        self.voltage = None
+        self.frequency = None
+        self.trace = []
+        self._random = random.Random()
+        # Electrodes actuated according to delta requests.
+        self._actuated = set()
+
+    def configure(self, latency_s=None, jitter_s=None, failure_rate=None,
+                  time_scale=None, electrode_ids=None, seed=None,
+                  delta=None):
+        '''
+        Set simulation parameters.  Parameters set to ``None`` are not
+        changed.
+
+        Parameters
+        ----------
+        latency_s : float, optional
+        jitter_s : float, optional
+        failure_rate : float, optional
+        time_scale : float, optional
+        electrode_ids : list, optional
+            Electrodes available for actuation.
+        seed : int, optional
+            Seed for random jitter and failures.
+        delta : bool, optional
+            Accept delta actuation requests.
+        '''
+        if latency_s is not None:
+            self.latency_s = latency_s
+        if jitter_s is not None:
+            self.jitter_s = jitter_s
+        if failure_rate is not None:
+            if not 0 <= failure_rate <= 1:
+                raise ValueError('Failure rate must be in the range [0, 1].')
+            self.failure_rate = failure_rate
+        if time_scale is not None:
+            self.time_scale = time_scale
+        if electrode_ids is not None:
+            self.electrode_ids = set(electrode_ids)
+        if seed is not None:
+            self._random.seed(seed)
+        if delta is not None:
+            self.delta = delta
+
+    def clear_trace(self):
+        del self.trace[:]
+
+    def trace_frame(self):
+        '''
+        Returns
+        -------
+        pandas.DataFrame
+            Table of recorded actuations, one row per actuation request.
+        '''
+        return pd.DataFrame(self.trace, columns=['start', 'end', 'duration_s',
+                                                 'voltage', 'frequency',
+                                                 'requested', 'actuated',
+                                                 'failed'])
+
+    def _delay_s(self, duration_s=0):
+        '''
+        Returns
+        -------
+        float
+            Simulated (scaled) delay for request with specified duration.
+        '''
+        jitter_s = self._random.uniform(0, self.jitter_s)
+        return (duration_s + self.latency_s + jitter_s) * self.time_scale
+
+    ###########################################################################
+    # `IWaveformGenerator` interface
+    def set_voltage(self, voltage):
+        self.voltage = voltage
+
+    def set_frequency(self, frequency):
+        self.frequency = frequency
+
+    ###########################################################################
+    # `IElectrodeActuator` interface
+    @asyncio.coroutine
+    def on_actuation_request(self, electrode_states, duration_s=0,
+                             volume_threshold=None):
+        '''
+        XXX Coroutine XXX
+
+        Simulate actuation of electrodes according to specified states.
+
+        Each request is appended to :attr:`trace` as a dictionary with the
+        keys ``start``, ``end``, ``duration_s``, ``voltage``, ``frequency``,
+        ``requested`` (requested electrode IDs), ``actuated`` (actuated
+        electrode IDs), and ``failed``.
+
+        Parameters
+        ----------
+        electrode_states : pandas.Series
+        duration_s : float, optional
+            Time to actuate before actuation is considered completed.
+        volume_threshold : float, optional
+            Ignored.
+
+        Returns
+        -------
+        actuated_electrodes : list
+            List of actuated electrode IDs.
+
+        Raises
+        ------
+        SimulatedActuationError
+            Randomly, according to :attr:`failure_rate`.
+        '''
+        requested = electrode_states[electrode_states > 0].index.tolist()
+        result = yield asyncio.From(self._actuate(requested, duration_s))
+        raise asyncio.Return(result)
+
+    @asyncio.coroutine
+    def on_actuation_delta_request(self, electrode_states, duration_s=0,
+                                   full=False):
+        '''
+        XXX Coroutine XXX
+
+        Simulate actuation of electrodes according to changes in states.
+
+        Each request is recorded to :attr:`trace` (see
+        :meth:`on_actuation_request`), with all electrodes requested after
+        applying the changes as ``requested``.
+
+        Parameters
+        ----------
+        electrode_states : pandas.Series
+            Electrodes to turn on (``True``) or off (``False``), or, if
+            :data:`full` is ``True``, electrodes to actuate.
+        duration_s : float, optional
+            Time to actuate before actuation is considered completed.
+        full : bool, optional
+            If ``True``, turn off all electrodes not in
+            :data:`electrode_states`.
+
+        Returns
+        -------
+        actuated_electrodes : list
+            List of all actuated electrode IDs.
+
+        Raises
+        ------
+        SimulatedActuationError
+            Randomly, according to :attr:`failure_rate`.
+
+
+        .. versionadded:: 2.36.0
+        '''
+        on = electrode_states.values.astype(bool)
+        if full:
+            self._actuated = set(electrode_states.index[on])
+        else:
+            self._actuated.update(electrode_states.index[on])
+            self._actuated.difference_update(electrode_states.index[~on])
+        result = yield asyncio.From(self._actuate(sorted(self._actuated),
+                                                  duration_s))
+        raise asyncio.Return(result)
+
+    @asyncio.coroutine
+    def _actuate(self, requested, duration_s):
+        '''
+        XXX Coroutine XXX
+
+        Simulate actuation of requested electrodes and record to
+        :attr:`trace`.
+        '''
+        if self.electrode_ids is None:
+            actuated = requested
+        else:
+            actuated = [e for e in requested if e in self.electrode_ids]
+        failed = self._random.random() < self.failure_rate
+        record = {'start': dt.datetime.now(), 'duration_s': duration_s,
+                  'voltage': self.voltage, 'frequency': self.frequency,
+                  'requested': requested, 'actuated': actuated,
+                  'failed': failed}
+        try:
+            yield asyncio.From(asyncio.sleep(self._delay_s(duration_s)))
+        finally:
+            record['end'] = dt.datetime.now()
+            self.trace.append(record)
+        if failed:
+            raise SimulatedActuationError('Simulated actuation failure.')
+        raise asyncio.Return(actuated)
+
+    ###########################################################################
+    # `IPlugin` interface
+    @asyncio.coroutine
+    def on_step_run(self, plugin_kwargs, signals):
+        '''
+        Connect simulated actuator and waveform generator callbacks to step
+        signals namespace.
+
+        If :attr:`delta` is set, connect to ``on-actuation-delta-request``
+        signal instead of ``on-actuation-request``.
+
+        Parameters
+        ----------
+        plugin_kwargs : dict
+            Plugin settings as JSON serializable dictionary.
+        signals : blinker.Namespace
+            Signals namespace.
+        '''
+        @asyncio.coroutine
+        def on_actuation_request(electrode_states, duration_s=0,
+                                 volume_threshold=None):
+            result = yield asyncio.From(self.on_actuation_request
+                                        (electrode_states,
+                                         duration_s=duration_s,
+                                         volume_threshold=volume_threshold))
+            raise asyncio.Return(result)
+
+        @asyncio.coroutine
+        def on_set_voltage(voltage):
+            yield asyncio.From(asyncio.sleep(self._delay_s()))
+            self.set_voltage(voltage)
+            raise asyncio.Return(voltage)
+
+        @asyncio.coroutine
+        def on_set_frequency(frequency):
+            yield asyncio.From(asyncio.sleep(self._delay_s()))
+            self.set_frequency(frequency)
+            raise asyncio.Return(frequency)
+
+        @asyncio.coroutine
+        def on_actuation_delta_request(electrode_states, duration_s=0,
+                                       full=False):
+            result = yield asyncio.From(self.on_actuation_delta_request
+                                        (electrode_states,
+                                         duration_s=duration_s, full=full))
+            raise asyncio.Return(result)
+
+        if self.delta:
+            signals.signal('on-actuation-delta-request')\
+                .connect(on_actuation_delta_request, weak=False)
+        else:
+            signals.signal('on-actuation-request')\
+                .connect(on_actuation_request, weak=False)
+        signals.signal('set-voltage').connect(on_set_voltage, weak=False)
+        signals.signal('set-frequency').connect(on_set_frequency, weak=False)
+
+
+PluginGlobals.pop_env()
+
+# Only simulate actuations if plugin is explicitly enabled.
+SimulatedActuatorPlugin.__instance__.disable()
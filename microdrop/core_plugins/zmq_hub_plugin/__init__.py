@@ -1,24 +1,41 @@
 # coding: utf-8
 from multiprocessing import Process
+import json
 import logging
 import signal
 import threading
 
 from asyncio_helpers import cancellable
-from flatland import Form, String, Enum
+from flatland import Form, String, Enum, Float
 from logging_helpers import _L
 from zmq_plugin.bin.hub import run_hub
 from zmq_plugin.hub import Hub
 from zmq_plugin.plugin import Plugin as ZmqPlugin
+from zmq_plugin.schema import (decode_content_data, get_execute_reply,
+                               get_execute_request)
 import trollius as asyncio
+import zmq
 
 from ...app_context import get_hub_uri
+from ...hub_metrics import HubMetrics
 from ...plugin_helpers import AppDataController
 from ...plugin_manager import (PluginGlobals, SingletonPlugin, IPlugin,
                                implements)
+from ...step_timing import monotonic
 
 logger = logging.getLogger(__name__)
 
+#: In-process hub query URI (see :class:`HubThread`).
+#:
+#: .. versionadded:: 2.36.0
+INPROC_HUB_URI = 'inproc://microdrop.zmq_hub_plugin:0'
+
+#: Target of hub metrics messages published on the hub publish socket (see
+#: :meth:`MicroDropHub.publish_metrics`).
+#:
+#: .. versionadded:: 2.36.0
+METRICS_TOPIC = 'metrics'
+
 
 PluginGlobals.push_env('microdrop')
 
@@ -35,11 +52,356 @@ def _safe_run_hub(*args, **kwargs):
 
 
 class MicroDropHub(Hub):
+    '''
+    .. versionchanged:: 2.36.0
+        Add :data:`inproc_uri` parameter.
+
+    .. versionchanged:: 2.36.0
+        Record message throughput and latency :attr:`metrics`, available
+        through the ``get_metrics`` command, and periodically published if
+        :data:`metrics_interval_s` is set (see :meth:`publish_metrics`).
+
+    Parameters
+    ----------
+    query_uri : str
+        The URI address of the **hub** query socket.
+    name : str
+        Unique name across all plugins.
+    inproc_uri : str, optional
+        In-process (i.e., ``inproc://<host>:<port>``) URI address to *also*
+        bind the query socket to.
+
+        If set, the command and publish sockets are also bound to the
+        in-process host, using the same port numbers as the respective
+        :data:`query_uri` endpoints.  Since plugins derive the command and
+        publish socket URIs from the transport and host of their own query
+        URI, plugins in the same process may connect to :data:`inproc_uri`,
+        while other plugins connect to :data:`query_uri`.
+    metrics_interval_s : float, optional
+        Minimum interval (in seconds) between publishing metrics.  If
+        ``None``, metrics are not published.
+
+    Attributes
+    ----------
+    metrics : microdrop.hub_metrics.HubMetrics
+        Throughput and latency metrics of execution requests and replies
+        routed through the hub.
+    '''
+    def __init__(self, query_uri, name='hub', inproc_uri=None,
+                 metrics_interval_s=None):
+        super(MicroDropHub, self).__init__(query_uri, name)
+        self.inproc_uri = inproc_uri
+        # In-process endpoints bound by each socket.
+        self._inproc_endpoints = {}
+        self.metrics = HubMetrics()
+        self.metrics_interval_s = metrics_interval_s
+        self._metrics_published = None
+        # Prefixes subscribed to on the publish socket.
+        self._subscriptions = set()
+        # Size of message currently being processed.
+        self._message_size = 0
+
+    def _bind_inproc(self, socket, port=None):
+        if self.inproc_uri is None:
+            return
+        if port is None:
+            endpoint = self.inproc_uri
+        else:
+            endpoint = '%s:%s' % (self.inproc_uri.rsplit(':', 1)[0], port)
+        socket.bind(endpoint)
+        self._inproc_endpoints[socket] = endpoint
+
+    def _unbind_inproc(self, socket):
+        # Unbind explicitly, since in-process endpoints are otherwise only
+        # released asynchronously after the socket is closed (i.e., binding
+        # again right away fails).
+        endpoint = self._inproc_endpoints.pop(socket, None)
+        if endpoint is not None:
+            socket.unbind(endpoint)
+
+    def reset_query_socket(self):
+        if self.query_socket is not None:
+            self._unbind_inproc(self.query_socket)
+        super(MicroDropHub, self).reset_query_socket()
+        self._bind_inproc(self.query_socket)
+
+    def reset_command_socket(self):
+        if self.command_socket is not None:
+            self._unbind_inproc(self.command_socket)
+        super(MicroDropHub, self).reset_command_socket()
+        self._bind_inproc(self.command_socket, self.command_port)
+
+    def reset_publish_socket(self):
+        '''
+        .. versionchanged:: 2.36.0
+            Use ``XPUB`` socket to keep track of subscriptions, such that
+            metrics are only published if there are subscribers.
+        '''
+        context = zmq.Context.instance()
+
+        if self.publish_socket is not None:
+            self._unbind_inproc(self.publish_socket)
+            self.publish_socket.close()
+            self.publish_socket = None
+        self._subscriptions = set()
+
+        self.publish_socket = zmq.Socket(context, zmq.XPUB)
+        base_uri = "%s://%s" % (self.transport, self.host)
+        self.publish_port = self.publish_socket.bind_to_random_port(base_uri)
+        self.publish_uri = base_uri + (':%s' % self.publish_port)
+        self._bind_inproc(self.publish_socket, self.publish_port)
+
+    def close(self):
+        '''
+        Close all sockets.
+
+        .. versionadded:: 2.36.0
+        '''
+        for socket in (self.query_socket, self.command_socket,
+                       self.publish_socket):
+            if socket is not None:
+                self._unbind_inproc(socket)
+                socket.close(linger=0)
+        self.query_socket = self.command_socket = self.publish_socket = None
+
     def on_command_recv(self, msg_frames):
+        '''
+        .. versionchanged:: 2.36.0
+            Record message metrics, and publish metrics if due.
+        '''
+        self._message_size = len(msg_frames[-1])
         try:
             super(MicroDropHub, self).on_command_recv(msg_frames)
         except Exception:
             _L().error('Command socket message error.', exc_info=True)
+        try:
+            self.publish_metrics()
+        except Exception:
+            _L().error('Error publishing metrics.', exc_info=True)
+
+    def _record_message(self, message, size):
+        header = message['header']
+        content = message.get('content', {})
+        if header['msg_type'] == 'execute_request':
+            self.metrics.record_request(header['source'], header['target'],
+                                        content.get('command'),
+                                        header['session'], size=size)
+        elif header['msg_type'] == 'execute_reply':
+            self.metrics.record_reply(header['source'], header['target'],
+                                      content.get('command'),
+                                      header['session'], size=size,
+                                      # Note: plugins reply with `ok`
+                                      # status on handler exceptions.
+                                      error=('error' in content or
+                                             content.get('status') != 'ok'))
+
+    def _process__forwarding_command_message(self, message):
+        self._record_message(message, self._message_size)
+        super(MicroDropHub, self)._process__forwarding_command_message(message)
+
+    def _process__local_command_message(self, message):
+        self._record_message(message, self._message_size)
+        super(MicroDropHub, self)._process__local_command_message(message)
+
+    def _send_command_message(self, message):
+        message_json = super(MicroDropHub, self)\
+            ._send_command_message(message)
+        if message['header']['source'] == self.name:
+            # Reply to request executed by hub.
+            self._record_message(message, len(message_json))
+        return message_json
+
+    def on_execute__get_metrics(self, request):
+        '''
+        .. versionadded:: 2.36.0
+
+        Optional request fields:
+
+         - ``reset``: if ``True``, clear metrics after returning them.
+
+        Returns
+        -------
+        dict
+            Message throughput and latency metrics (see
+            :meth:`microdrop.hub_metrics.HubMetrics.metrics`).
+        '''
+        data = decode_content_data(request) or {}
+        metrics = self.metrics.metrics()
+        if data.get('reset'):
+            self.metrics.reset()
+        return metrics
+
+    def _update_subscriptions(self):
+        # Subscription messages are prefixed by `1` (subscribe) or `0`
+        # (unsubscribe).
+        while True:
+            try:
+                frame = self.publish_socket.recv(zmq.NOBLOCK)
+            except zmq.Again:
+                break
+            if frame[:1] == b'\x01':
+                self._subscriptions.add(frame[1:])
+            elif frame[:1] == b'\x00':
+                self._subscriptions.discard(frame[1:])
+
+    def publish_metrics(self, now=None):
+        '''
+        Publish metrics as an ``execute_reply`` message from the hub to the
+        :data:`METRICS_TOPIC` target (i.e., as a reply to ``get_metrics``),
+        if at least :attr:`metrics_interval_s` seconds have passed since
+        metrics were last published.
+
+        Metrics are only computed and published if a plugin subscribed to
+        messages from the hub (e.g., using the ``zmq.SUBSCRIBE`` prefix
+        ``""``, or the hub name).
+
+        .. versionadded:: 2.36.0
+
+        Parameters
+        ----------
+        now : float, optional
+            Current :func:`microdrop.step_timing.monotonic` time.
+
+        Returns
+        -------
+        bool
+            ``True`` if metrics were published.
+        '''
+        if not self.metrics_interval_s or self.publish_socket is None:
+            return False
+        if now is None:
+            now = monotonic()
+        if (self._metrics_published is not None and now -
+                self._metrics_published < self.metrics_interval_s):
+            return False
+        self._metrics_published = now
+        self._update_subscriptions()
+        if not any(self.name.startswith(prefix_i)
+                   for prefix_i in self._subscriptions):
+            return False
+        request = get_execute_request(METRICS_TOPIC, self.name,
+                                      'get_metrics')
+        reply = get_execute_reply(request, self.execute_reply_id.next(),
+                                  data=self.metrics.metrics(now))
+        self.publish_socket.send_multipart(map(str,
+                                               [self.name, METRICS_TOPIC,
+                                                reply['header']['msg_type'],
+                                                json.dumps(reply)]))
+        return True
+
+    def on_query_recv(self, msg_frames):
+        '''
+        .. versionadded:: 2.36.0
+        '''
+        try:
+            super(MicroDropHub, self).on_query_recv(msg_frames)
+        except Exception:
+            _L().error('Query socket message error.', exc_info=True)
+            # Reset query socket, since a reply is pending.
+            self.reset_query_socket()
+
+
+class HubThread(object):
+    '''
+    Run hub in a background (daemon) thread of the current process.
+
+    Compared to :func:`run_hub` in a separate process, plugins in the
+    current process may connect through ``inproc://`` sockets (see
+    :data:`MicroDropHub.inproc_uri`), skipping the TCP loopback, and no
+    process is started.
+
+    .. versionadded:: 2.36.0
+
+    Parameters
+    ----------
+    hub : MicroDropHub
+        Hub, with sockets created (i.e., reset) in the background thread.
+    poll_timeout_ms : int, optional
+        Maximum time to wait for messages before checking whether the thread
+        has been stopped.
+    '''
+    def __init__(self, hub, poll_timeout_ms=100):
+        self.hub = hub
+        self.poll_timeout_ms = poll_timeout_ms
+        self._thread = None
+        self._stopped = threading.Event()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        '''
+        Start hub thread and wait until hub sockets are bound.
+
+        Raises
+        ------
+        RuntimeError
+            If hub sockets could not be bound.
+        '''
+        if self.running:
+            return
+        started = threading.Event()
+        errors = []
+
+        def _run():
+            try:
+                self.hub.reset()
+            except Exception as exception:
+                errors.append(exception)
+                self.hub.close()
+                return
+            finally:
+                started.set()
+            try:
+                self._poll()
+            finally:
+                self.hub.close()
+                _L().info('closed ZeroMQ hub thread')
+
+        self._stopped.clear()
+        self._thread = threading.Thread(target=_run, name=self.hub.name)
+        self._thread.daemon = True
+        self._thread.start()
+        started.wait()
+        if errors:
+            self._thread = None
+            raise RuntimeError('Error starting ZeroMQ hub: %s' % errors[0])
+
+    def _poll(self):
+        sockets = None
+        while not self._stopped.is_set():
+            # Note: query socket is replaced if a query message is invalid.
+            if sockets != (self.hub.query_socket, self.hub.command_socket):
+                sockets = (self.hub.query_socket, self.hub.command_socket)
+                poller = zmq.Poller()
+                for socket_i in sockets:
+                    poller.register(socket_i, zmq.POLLIN)
+            for socket_i, event_i in poller.poll(self.poll_timeout_ms):
+                msg_frames = socket_i.recv_multipart(zmq.NOBLOCK)
+                if socket_i is self.hub.command_socket:
+                    self.hub.on_command_recv(msg_frames)
+                else:
+                    self.hub.on_query_recv(msg_frames)
+            try:
+                # Publish metrics if due, even if no messages are received.
+                self.hub.publish_metrics()
+            except Exception:
+                _L().error('Error publishing metrics.', exc_info=True)
+
+    def stop(self, timeout=None):
+        '''
+        Stop hub thread and close hub sockets.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum time (in seconds) to wait for thread to stop.
+        '''
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
 
 
 class ZmqHubPlugin(SingletonPlugin, AppDataController):
@@ -48,6 +410,11 @@ class ZmqHubPlugin(SingletonPlugin, AppDataController):
     """
     implements(IPlugin)
     plugin_name = 'microdrop.zmq_hub_plugin'
+    #: ``on_plugin_enable`` may be called from a background thread (see
+    #: :func:`microdrop.plugin_manager.emit_signal_concurrent`).
+    #:
+    #: .. versionadded:: 2.36.0
+    threadsafe_callbacks = ('on_plugin_enable', )
 
     '''
     AppFields
@@ -66,36 +433,76 @@ class ZmqHubPlugin(SingletonPlugin, AppDataController):
     '''
     AppFields = Form.of(
         String.named('hub_uri').using(optional=True, default='tcp://*:31000'),
+        #: .. versionadded:: 2.36.0
+        #:     Run hub in a separate ``process`` (default), or in a background
+        #:     ``thread``, where plugins in the MicroDrop process connect
+        #:     through ``inproc://`` sockets (see :class:`HubThread`).  In
+        #:     either case, other plugins connect to ``hub_uri``.
+        Enum.named('hub_mode').using(default='process', optional=True)
+        .valued('process', 'thread'),
+        #: .. versionadded:: 2.36.0
+        #:     Interval (in seconds) to publish hub metrics to subscribed
+        #:     plugins (see :meth:`MicroDropHub.publish_metrics`).  Metrics
+        #:     are not published if ``0``.
+        Float.named('metrics_interval_s').using(default=0, optional=True),
         Enum.named('log_level').using(default='info', optional=True)
         .valued('debug', 'info', 'warning', 'error', 'critical'))
 
     def __init__(self):
         self.name = self.plugin_name
         self.hub_process = None
+        #: .. versionadded:: 2.36.0
+        self.hub_thread = None
         #: ..versionadded:: 2.25
         self.exec_thread = None
 
+    @property
+    def inproc_uri(self):
+        '''
+        str: In-process hub query URI if hub is running in a background
+        thread of the current process, otherwise ``None``.
+
+        .. versionadded:: 2.36.0
+        '''
+        if self.hub_thread is not None and self.hub_thread.running:
+            return self.hub_thread.hub.inproc_uri
+
     def on_plugin_enable(self):
         '''
         .. versionchanged:: 2.25
             Start asyncio event loop in background thread to process ZeroMQ hub
             execution requests.
+
+        .. versionchanged:: 2.36.0
+            Run hub in a background thread if ``hub_mode`` is ``thread``.
         '''
         super(ZmqHubPlugin, self).on_plugin_enable()
         app_values = self.get_app_values()
 
         self.cleanup()
-        self.hub_process = Process(target=_safe_run_hub,
-                                   args=(MicroDropHub(app_values['hub_uri'],
-                                                      self.name),
-                                         getattr(logging,
-                                                 app_values['log_level']
-                                                 .upper())))
-        # Set process as daemonic so it terminate when main process terminates.
-        self.hub_process.daemon = True
-        self.hub_process.start()
-        _L().info('ZeroMQ hub process (pid=%s, daemon=%s)',
-                  self.hub_process.pid, self.hub_process.daemon)
+        metrics_interval_s = app_values.get('metrics_interval_s') or None
+        if app_values.get('hub_mode') == 'thread':
+            hub = MicroDropHub(app_values['hub_uri'], self.name,
+                               inproc_uri=INPROC_HUB_URI,
+                               metrics_interval_s=metrics_interval_s)
+            self.hub_thread = HubThread(hub)
+            self.hub_thread.start()
+            _L().info('ZeroMQ hub thread (uri=%s, inproc_uri=%s)',
+                      app_values['hub_uri'], INPROC_HUB_URI)
+        else:
+            hub = MicroDropHub(app_values['hub_uri'], self.name,
+                               metrics_interval_s=metrics_interval_s)
+            self.hub_process = Process(target=_safe_run_hub,
+                                       args=(hub, getattr(logging,
+                                                          app_values
+                                                          ['log_level']
+                                                          .upper())))
+            # Set process as daemonic so it terminate when main process
+            # terminates.
+            self.hub_process.daemon = True
+            self.hub_process.start()
+            _L().info('ZeroMQ hub process (pid=%s, daemon=%s)',
+                      self.hub_process.pid, self.hub_process.daemon)
 
         zmq_ready = threading.Event()
 
@@ -121,10 +528,16 @@ class ZmqHubPlugin(SingletonPlugin, AppDataController):
         '''
         .. versionchanged:: 2.25
             Stop asyncio event loop.
+
+        .. versionchanged:: 2.36.0
+            Stop hub thread.
         '''
         if self.hub_process is not None:
             self.hub_process.terminate()
             self.hub_process = None
+        if self.hub_thread is not None:
+            self.hub_thread.stop()
+            self.hub_thread = None
         if self.exec_thread is not None:
             self.zmq_exec_task.cancel()
             self.exec_thread = None
@@ -1,4 +1,6 @@
+import collections
 import logging
+import uuid
 
 from droplet_planning.connections import get_adjacency_matrix
 from lxml import etree
@@ -25,6 +27,11 @@ class DeviceScaleNotSet(Exception):
 
 
 class DmfDevice(object):
+    #: .. versionadded:: 2.36.0
+    #:
+    #: Maximum number of channel edits recorded (see :meth:`channel_edits`).
+    CHANNEL_EDITS_MAXLEN = 1000
+
     @classmethod
     def load(cls, svg_filepath, **kwargs):
         """
@@ -49,6 +56,15 @@ class DmfDevice(object):
     def __init__(self, svg_filepath, name=None, **kwargs):
         self.name = name or path(svg_filepath).namebase
 
+        #: .. versionadded:: 2.36.0
+        #:     Modification counter, incremented on each channel edit.
+        self.version = 0
+        # Unique identifier of this device instance (see `etag`).
+        self._instance_id = uuid.uuid4().hex
+        # Version and electrode ID of most recent channel edits.
+        self._channel_edits = \
+            collections.deque(maxlen=self.CHANNEL_EDITS_MAXLEN)
+
         # Read SVG paths and polygons from `Device` layer into data frame, one
         # row per polygon vertex.
         self.df_shapes = svg_shapes_to_df(svg_filepath, xpath=ELECTRODES_XPATH)
@@ -158,12 +174,24 @@ class DmfDevice(object):
         -------
         bool
             ``True`` if channel mappings have changed.
+
+
+        .. versionchanged:: 2.36.0
+            Increment :attr:`version` if the channels of the electrode
+            changed.
+
+        .. versionchanged:: 2.36.0
+            Fix detecting modified channels after removing all channels of
+            an electrode.
         '''
         # Get electrode channels frame for all electrodes except
         # `electrode_id`.
-        df_electrode_channels = (self.df_electrode_channels
-                                 .loc[self.df_electrode_channels.electrode_id
-                                      != electrode_id])
+        selected = self.df_electrode_channels.electrode_id == electrode_id
+        df_electrode_channels = self.df_electrode_channels.loc[~selected]
+        if (sorted(self.df_electrode_channels.channel[selected]) !=
+                sorted(channels)):
+            self.version += 1
+            self._channel_edits.append((self.version, electrode_id))
         if len(channels) > 0:
             # Add new list of channels for electrode.
             df_electrode_channels_i = pd.DataFrame([[electrode_id, channel]
@@ -176,7 +204,8 @@ class DmfDevice(object):
                                           .reset_index(drop=True))
         else:
             # No channels assigned to electrode.
-            self.df_electrode_channels = df_electrode_channels
+            self.df_electrode_channels = (df_electrode_channels
+                                          .reset_index(drop=True))
 
         # If the channels mappings have changed, update modified state.
         df_diff_channels = self.diff_electrode_channels()
@@ -184,6 +213,54 @@ class DmfDevice(object):
             self._dirty = True
         return self.dirty
 
+    @property
+    def etag(self):
+        '''
+        Opaque version tag, unique to this device instance and
+        :attr:`version` (e.g., to check if a device snapshot is stale).
+
+        .. versionadded:: 2.36.0
+        '''
+        return '%s:%d' % (self._instance_id, self.version)
+
+    def channel_edits(self, etag):
+        '''
+        Parameters
+        ----------
+        etag : str
+            Version tag of a device snapshot (see :attr:`etag`).
+
+        Returns
+        -------
+        dict or None
+            Current channels of each electrode edited since :data:`etag`,
+            indexed by electrode ID (empty if not modified), or ``None`` if
+            edits are not available since :data:`etag` (e.g., if
+            :data:`etag` refers to a different device instance).
+
+
+        .. versionadded:: 2.36.0
+        '''
+        try:
+            instance_id, version = etag.rsplit(':', 1)
+            version = int(version)
+        except (AttributeError, ValueError):
+            return None
+        if instance_id != self._instance_id or version > self.version:
+            return None
+        elif version == self.version:
+            return {}
+        edits = [electrode_id_i for version_i, electrode_id_i in
+                 self._channel_edits if version_i > version]
+        if len(edits) < self.version - version:
+            # Older edits are no longer recorded.
+            return None
+        channels = self.df_electrode_channels
+        return {electrode_id_i: sorted(channels.channel[channels.electrode_id
+                                                        == electrode_id_i]
+                                       .tolist())
+                for electrode_id_i in set(edits)}
+
     @property
     def electrodes(self):
         return self.electrode_areas.index.copy()
@@ -347,6 +424,39 @@ class DmfDevice(object):
                                              'cost')
         return shortest_path
 
+    def find_routes(self, droplets, **kwargs):
+        '''
+        Plan non-colliding routes for multiple droplets.
+
+        Parameters
+        ----------
+        droplets : list[tuple]
+            Source and target electrode ID of each droplet.
+        **kwargs
+            Keyword arguments passed to
+            :meth:`microdrop.droplet_routing.DropletRouter.route`.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Electrode ID of each droplet (one column per droplet) at each
+            time step.
+
+        Raises
+        ------
+        microdrop.droplet_routing.RoutingError
+            If no non-colliding routes are found.
+
+
+        .. versionadded:: 2.36.0
+        '''
+        from .droplet_routing import DropletRouter
+
+        router = getattr(self, '_router', None)
+        if router is None:
+            self._router = router = DropletRouter.from_device(self)
+        return router.route(droplets, **kwargs)
+
     def to_svg(self):
         '''
         Returns:
@@ -0,0 +1,411 @@
+'''
+Plan non-colliding routes for multiple droplets on a device.
+
+Routes are planned one droplet at a time (i.e., prioritized, cooperative
+planning) on a time-expanded electrode graph, where each droplet avoids the
+electrodes reserved by the routes already planned.  Each droplet route is
+found with a breadth-first search in time, vectorized over all electrodes,
+such that routes arrive at their targets as early as possible given the
+reservations.
+
+Droplets must never be on the same or neighbouring electrodes, both at the
+same time step (*static* constraint) and across consecutive time steps
+(*dynamic* constraint), since droplets on neighbouring electrodes merge.
+
+Example
+-------
+
+Move two droplets simultaneously::
+
+    router = DropletRouter.from_device(device)
+    routes = router.route([('electrode000', 'electrode010'),
+                           ('electrode042', 'electrode007')])
+    # One list of actuated electrodes per time step (e.g., for
+    # `execute_actuations()`).
+    schedule = router.schedule(routes)
+
+.. versionadded:: 2.36.0
+'''
+import numpy as np
+import pandas as pd
+
+
+class RoutingError(Exception):
+    pass
+
+
+def _pad(path, length):
+    '''
+    Returns
+    -------
+    numpy.ndarray
+        Path padded to specified length by waiting at last position.
+    '''
+    return np.append(path, np.repeat(path[-1], length - len(path)))
+
+
+def grid_adjacency(rows, columns):
+    '''
+    Parameters
+    ----------
+    rows, columns : int
+        Grid dimensions.
+
+    Returns
+    -------
+    adjacency_matrix : numpy.ndarray
+        Adjacency matrix of a rectangular grid of electrodes (e.g., a
+        synthetic device for testing or benchmarking), where each electrode
+        is connected to its up, down, left, and right neighbours.
+    electrode_ids : list[str]
+        Electrode IDs (row-major order).
+    '''
+    n = rows * columns
+    indexes = np.arange(n).reshape(rows, columns)
+    adjacency = np.zeros((n, n), dtype=int)
+    for a, b in ((indexes[:, :-1], indexes[:, 1:]),
+                 (indexes[:-1], indexes[1:])):
+        adjacency[a.ravel(), b.ravel()] = 1
+        adjacency[b.ravel(), a.ravel()] = 1
+    return adjacency, ['electrode%03d' % i for i in xrange(n)]
+
+
+class DropletRouter(object):
+    '''
+    Parameters
+    ----------
+    adjacency_matrix : numpy.ndarray
+        Square matrix, where non-zero entry ``(i, j)`` indicates that
+        electrodes ``i`` and ``j`` are connected (e.g.,
+        :attr:`microdrop.dmf_device.DmfDevice.adjacency_matrix`).
+    electrode_ids : list
+        Electrode ID of each row of :data:`adjacency_matrix`.
+
+    Attributes
+    ----------
+    electrode_ids : pandas.Index
+        Electrode IDs.
+    '''
+    def __init__(self, adjacency_matrix, electrode_ids):
+        adjacency = np.asarray(adjacency_matrix) != 0
+        adjacency = adjacency | adjacency.T
+        np.fill_diagonal(adjacency, False)
+        self.electrode_ids = pd.Index(electrode_ids)
+        if adjacency.shape != (len(self.electrode_ids), ) * 2:
+            raise ValueError('Adjacency matrix shape `%s` does not match '
+                             'number of electrodes (%d).' %
+                             (adjacency.shape, len(self.electrode_ids)))
+        # Neighbours of each electrode, in compressed sparse row format.
+        source, target = np.nonzero(adjacency)
+        self._source = source
+        self._target = target
+        self._degree = np.bincount(source, minlength=adjacency.shape[0])
+        self._indptr = np.concatenate([[0], np.cumsum(self._degree)])
+        self._indices = target
+
+    @classmethod
+    def from_device(cls, device):
+        '''
+        Parameters
+        ----------
+        device : microdrop.dmf_device.DmfDevice
+
+        Returns
+        -------
+        DropletRouter
+            Router for electrode connections of :data:`device`.
+        '''
+        return cls(device.adjacency_matrix, device.indexed_shapes.values)
+
+    def _expand(self, mask):
+        '''
+        Parameters
+        ----------
+        mask : numpy.ndarray
+            Boolean mask of electrodes.
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean mask of electrodes in :data:`mask` *and* their
+            neighbours.
+        '''
+        expanded = mask.copy()
+        expanded[self._target[mask[self._source]]] = True
+        return expanded
+
+    def _expand_rows(self, occupied):
+        '''
+        Parameters
+        ----------
+        occupied : numpy.ndarray
+            Boolean matrix of occupied electrodes, one row per time step.
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean matrix of occupied electrodes *and* their neighbours.
+        '''
+        expanded = occupied.copy()
+        rows, cols = np.nonzero(occupied)
+        degree = self._degree[cols]
+        offsets = (np.arange(degree.sum()) -
+                   np.repeat(np.cumsum(degree) - degree, degree))
+        expanded[np.repeat(rows, degree),
+                 self._indices[np.repeat(self._indptr[cols], degree) +
+                               offsets]] = True
+        return expanded
+
+    def distances(self, target):
+        '''
+        Parameters
+        ----------
+        target : str
+            Electrode ID.
+
+        Returns
+        -------
+        pandas.Series
+            Number of steps from each electrode to :data:`target` (``-1``
+            if unreachable), indexed by electrode ID.
+        '''
+        return pd.Series(self._distances(self._indexes([target])[0]),
+                         index=self.electrode_ids)
+
+    def _distances(self, target):
+        distances = np.full(len(self.electrode_ids), -1, dtype=int)
+        reached = np.zeros(len(self.electrode_ids), dtype=bool)
+        reached[target] = True
+        distance = 0
+        frontier = reached
+        while frontier.any():
+            distances[frontier] = distance
+            expanded = self._expand(reached)
+            frontier = expanded & ~reached
+            reached = expanded
+            distance += 1
+        return distances
+
+    def _indexes(self, electrode_ids):
+        indexes = self.electrode_ids.get_indexer(electrode_ids)
+        if (indexes < 0).any():
+            raise ValueError('Unknown electrode(s): %s' %
+                             ', '.join('`%s`' % e for e, i in
+                                       zip(electrode_ids, indexes) if i < 0))
+        return indexes
+
+    def route(self, droplets, max_steps=None, max_attempts=None):
+        '''
+        Plan non-colliding routes.
+
+        Droplets are planned in order of decreasing distance to their
+        targets.  If a droplet cannot be routed, planning is restarted with
+        that droplet first, up to :data:`max_attempts` times.
+
+        Parameters
+        ----------
+        droplets : list[tuple]
+            Source and target electrode ID of each droplet.
+        max_steps : int, optional
+            Maximum number of time steps of each route (default: number of
+            electrodes plus longest route planned so far).
+        max_attempts : int, optional
+            Maximum number of planning attempts (default: number of
+            droplets).
+
+        Returns
+        -------
+        pandas.DataFrame
+            Electrode ID of each droplet (one column per droplet, in order of
+            :data:`droplets`) at each time step.  The first row contains the
+            sources and the last row contains the targets.
+
+        Raises
+        ------
+        RoutingError
+            If sources or targets interfere with each other (i.e., are the
+            same or neighbouring electrodes), if a target is unreachable, or
+            if no non-colliding routes are found.
+        '''
+        if not len(droplets):
+            return pd.DataFrame()
+        sources, targets = (self._indexes(list(ids))
+                            for ids in zip(*droplets))
+        for name, indexes in (('sources', sources), ('targets', targets)):
+            conflicts = self._conflicts(indexes)
+            if conflicts:
+                raise RoutingError('Droplet %s interfere: %s' %
+                                   (name, ', '.join('%d/%d' % c
+                                                    for c in conflicts)))
+
+        distances = np.array([self._distances(target_i)[source_i]
+                              for source_i, target_i in zip(sources,
+                                                            targets)])
+        if (distances < 0).any():
+            raise RoutingError('Target unreachable for droplet(s): %s' %
+                               ', '.join(map(str,
+                                             np.flatnonzero(distances < 0))))
+
+        order = list(np.argsort(-distances, kind='mergesort'))
+        if max_attempts is None:
+            max_attempts = len(droplets)
+        for attempt in xrange(max(1, max_attempts)):
+            paths = {}
+            for i in order:
+                path = self._route_droplet(i, sources, targets, paths,
+                                           max_steps)
+                if path is None:
+                    break
+                paths[i] = path
+            else:
+                return self._routes_frame(paths)
+            # Plan droplet that failed first on next attempt.
+            order.remove(i)
+            order.insert(0, i)
+        raise RoutingError('No non-colliding routes found for droplet %d '
+                           '(from `%s` to `%s`).' %
+                           (i, self.electrode_ids[sources[i]],
+                            self.electrode_ids[targets[i]]))
+
+    def _conflicts(self, indexes):
+        '''
+        Returns
+        -------
+        list[tuple]
+            Pairs of droplets (as positions in :data:`indexes`) on the same
+            or neighbouring electrodes.
+        '''
+        conflicts = []
+        for i, index_i in enumerate(indexes):
+            mask = np.zeros(len(self.electrode_ids), dtype=bool)
+            mask[index_i] = True
+            expanded = self._expand(mask)
+            conflicts.extend((i, j) for j in xrange(i + 1, len(indexes))
+                             if expanded[indexes[j]])
+        return conflicts
+
+    def _route_droplet(self, i, sources, targets, paths, max_steps=None):
+        '''
+        Find earliest arriving route for droplet :data:`i` that avoids the
+        planned :data:`paths` (and the sources of unplanned droplets at the
+        first time step).
+
+        Returns
+        -------
+        numpy.ndarray
+            Electrode index at each time step, or ``None`` if no route was
+            found.
+        '''
+        n = len(self.electrode_ids)
+        horizon = max([len(p) for p in paths.itervalues()] + [1]) + 1
+        occupied = np.zeros((horizon, n), dtype=bool)
+        for j, path_j in paths.iteritems():
+            occupied[np.arange(horizon), _pad(path_j, horizon)] = True
+        occupied[0, [s for j, s in enumerate(sources)
+                     if j != i and j not in paths]] = True
+        expanded = self._expand_rows(occupied)
+        # Electrodes blocked at each time step, i.e., neighbouring another
+        # droplet in the previous, same, or next time step.
+        blocked = expanded.copy()
+        blocked[1:] |= expanded[:-1]
+        blocked[:-1] |= expanded[1:]
+        # After horizon, all planned droplets are parked at their targets.
+        blocked_final = expanded[-1]
+
+        source, target = sources[i], targets[i]
+        if blocked_final[target] or blocked[0, source]:
+            return None
+        blocked_times = np.flatnonzero(blocked[:, target])
+        # Droplet may only stay at target once no longer blocked.
+        arrival_min = blocked_times[-1] + 1 if blocked_times.size else 0
+        if max_steps is None:
+            max_steps = horizon + n
+
+        frontier = np.zeros(n, dtype=bool)
+        frontier[source] = True
+        reached = [frontier]
+        t = 0
+        while not (frontier[target] and t >= arrival_min):
+            if t >= max_steps:
+                return None
+            blocked_t = (blocked[t + 1] if t + 1 < horizon
+                         else blocked_final)
+            next_frontier = self._expand(frontier) & ~blocked_t
+            if not next_frontier.any() or \
+                    (t + 1 >= horizon and
+                     np.array_equal(next_frontier, frontier)):
+                # Dead end, or no further progress possible.
+                return None
+            frontier = next_frontier
+            reached.append(frontier)
+            t += 1
+
+        # Trace route back from target, preferring to wait (i.e., minimize
+        # the number of actuation changes).
+        path = np.empty(len(reached), dtype=int)
+        path[-1] = target
+        for k in xrange(len(reached) - 1, 0, -1):
+            if reached[k - 1][path[k]]:
+                path[k - 1] = path[k]
+            else:
+                mask = np.zeros(n, dtype=bool)
+                mask[path[k]] = True
+                path[k - 1] = np.flatnonzero(self._expand(mask) &
+                                             reached[k - 1])[0]
+        return path
+
+    def _routes_frame(self, paths):
+        length = max(len(p) for p in paths.itervalues())
+        return pd.DataFrame({i: self.electrode_ids[_pad(p, length)]
+                             for i, p in paths.iteritems()},
+                            columns=sorted(paths))
+
+    def conflicts(self, routes):
+        '''
+        Parameters
+        ----------
+        routes : pandas.DataFrame
+            Routes as returned by :meth:`route`.
+
+        Returns
+        -------
+        list[tuple]
+            Time step and pair of droplets for each violation of the static
+            or dynamic droplet constraints (empty if routes are valid).
+        '''
+        indexes = np.column_stack([self._indexes(routes[c].tolist())
+                                   for c in routes.columns])
+        conflicts = []
+        for t in xrange(indexes.shape[0]):
+            conflicts.extend((t, ) + c for c in self._conflicts(indexes[t]))
+            if t < 1:
+                continue
+            # Dynamic constraint: droplet must not neighbour the previous
+            # position of any other droplet.
+            for i in xrange(indexes.shape[1]):
+                mask = np.zeros(len(self.electrode_ids), dtype=bool)
+                mask[indexes[t - 1, i]] = True
+                expanded = self._expand(mask)
+                conflicts.extend((t, ) + tuple(sorted([i, j]))
+                                 for j in xrange(indexes.shape[1])
+                                 if j != i and expanded[indexes[t, j]])
+        return sorted(set(conflicts))
+
+    @staticmethod
+    def schedule(routes):
+        '''
+        Parameters
+        ----------
+        routes : pandas.DataFrame
+            Routes as returned by :meth:`route`.
+
+        Returns
+        -------
+        list[pandas.Series]
+            Static electrode states (i.e., ``1`` for each actuated
+            electrode, indexed by electrode ID) of each time step, e.g., for
+            :func:`microdrop.core_plugins.electrode_controller_plugin.execute
+            .execute_actuations`.
+        '''
+        return [pd.Series(1, index=sorted(set(row)))
+                for row in routes.values]
@@ -0,0 +1,193 @@
+'''
+Rate-limited, coalescing dispatcher for GUI updates from background threads.
+
+Unlike :func:`pygtkhelpers.gthreads.gtk_threadsafe`, which schedules a
+separate GTK idle callback for *every* call, updates are queued and run in
+batches at most :attr:`GtkUpdateDispatcher.max_rate_hz` times per second.
+Updates submitted with the same key (e.g., the same bound method) are
+coalesced, i.e., only the latest pending update for each key is run.
+
+Example
+-------
+
+Only select the most recently started step in the protocol grid::
+
+    from microdrop.gtk_dispatch import gtk_coalesce
+
+    gtk_coalesce(self.goto_step)(step_number)
+
+Run a callback (in order with other pending updates) without coalescing::
+
+    from microdrop.gtk_dispatch import gtk_dispatch
+
+    gtk_dispatch(emit_signal)('on_protocol_finished')
+
+.. versionadded:: 2.36.0
+'''
+from collections import OrderedDict
+import threading
+import timeit
+
+from logging_helpers import _L
+import gobject
+
+
+class GtkUpdateDispatcher(object):
+    '''
+    Parameters
+    ----------
+    max_rate_hz : float, optional
+        Maximum rate at which pending updates are run in the GTK main loop.
+    max_pending : int, optional
+        Maximum number of pending updates.  New updates (i.e., updates that
+        would not be coalesced with a pending update) are dropped while
+        this many updates are pending.
+
+    Attributes
+    ----------
+    counts : dict
+        Number of updates ``submitted``, ``coalesced`` (i.e., superseded by a
+        more recent update with the same key), ``dropped``, ``run``, and
+        ``failed``, and number of ``batches`` run.
+    '''
+    def __init__(self, max_rate_hz=60., max_pending=10000):
+        self.max_rate_hz = max_rate_hz
+        self.max_pending = max_pending
+        self.counts = dict.fromkeys(['submitted', 'coalesced', 'dropped',
+                                     'run', 'failed', 'batches'], 0)
+        self._pending = OrderedDict()
+        self._lock = threading.Lock()
+        self._source_id = None
+        self._last_run = None
+
+    def submit(self, key, func, *args, **kwargs):
+        '''
+        Schedule update to run in GTK main loop.
+
+        Parameters
+        ----------
+        key : hashable
+            Update key.  A pending update with the same key is replaced, and
+            the new update is run in order of submission.  If ``None``, the
+            update is never coalesced.
+        func : callable
+            Update function.
+        *args, **kwargs
+            Arguments to pass to :data:`func`.
+
+        Returns
+        -------
+        bool
+            ``False`` if the update was dropped.
+        '''
+        if key is None:
+            key = object()
+        with self._lock:
+            self.counts['submitted'] += 1
+            if key in self._pending:
+                self.counts['coalesced'] += 1
+                # Move to end, i.e., run in order of most recent submission.
+                del self._pending[key]
+            elif len(self._pending) >= self.max_pending:
+                self.counts['dropped'] += 1
+                return False
+            self._pending[key] = (func, args, kwargs)
+            if self._source_id is None:
+                self._schedule()
+        return True
+
+    def _schedule(self):
+        # Note: must be called with `_lock` held.
+        now = timeit.default_timer()
+        delay_s = (0 if self._last_run is None
+                   else (1. / self.max_rate_hz) - (now - self._last_run))
+        if delay_s <= 0:
+            self._source_id = gobject.idle_add(self._run)
+        else:
+            self._source_id = gobject.timeout_add(int(delay_s * 1000) or 1,
+                                                  self._run)
+
+    def _run(self):
+        '''
+        Run all pending updates (in GTK main loop).
+        '''
+        with self._lock:
+            pending = self._pending
+            self._pending = OrderedDict()
+            self._source_id = None
+            self._last_run = timeit.default_timer()
+            self.counts['batches'] += 1
+        for func, args, kwargs in pending.itervalues():
+            try:
+                func(*args, **kwargs)
+            except Exception:
+                self.counts['failed'] += 1
+                _L().error('Error running GUI update: `%s`', func,
+                           exc_info=True)
+            else:
+                self.counts['run'] += 1
+        # Do not repeat (see `gobject.idle_add`).
+        return False
+
+    def stats(self):
+        '''
+        Returns
+        -------
+        dict
+            Copy of :attr:`counts`, with number of ``pending`` updates.
+        '''
+        with self._lock:
+            stats = dict(self.counts)
+            stats['pending'] = len(self._pending)
+        return stats
+
+    def reset_stats(self):
+        with self._lock:
+            for key in self.counts:
+                self.counts[key] = 0
+
+
+#: Default GUI update dispatcher.
+GTK_DISPATCHER = GtkUpdateDispatcher()
+
+
+def gtk_coalesce(func, key=None):
+    '''
+    Parameters
+    ----------
+    func : callable
+        Update function.
+    key : hashable, optional
+        Update key (default: :data:`func`, i.e., coalesce all calls to the
+        same function or bound method).
+
+    Returns
+    -------
+    function
+        Function to schedule call to :data:`func` with
+        :data:`GTK_DISPATCHER`.
+    '''
+    if key is None:
+        key = func
+
+    def _wrapped(*args, **kwargs):
+        return GTK_DISPATCHER.submit(key, func, *args, **kwargs)
+    return _wrapped
+
+
+def gtk_dispatch(func):
+    '''
+    Parameters
+    ----------
+    func : callable
+        Update function.
+
+    Returns
+    -------
+    function
+        Function to schedule call to :data:`func` with :data:`GTK_DISPATCHER`
+        (never coalesced, but run in order with other dispatched updates).
+    '''
+    def _wrapped(*args, **kwargs):
+        return GTK_DISPATCHER.submit(None, func, *args, **kwargs)
+    return _wrapped
@@ -34,6 +34,11 @@ class ConfigController(SingletonPlugin):
                     self.app.config.data.pop(section_name)
 
     def on_app_exit(self):
+        '''
+        .. versionchanged:: 2.36.0
+            Write config to disk immediately (i.e., including any pending
+            changes; see :meth:`microdrop.config.Config.mark_dirty`).
+        '''
         self.app.config.save()
 
     def on_dmf_device_changed(self, dmf_device):
@@ -41,21 +46,31 @@ class ConfigController(SingletonPlugin):
         if dmf_device:
             device_name = dmf_device.name
         if self.app.config['dmf_device']['name'] != device_name:
-            self.app.config['dmf_device']['name'] = device_name
-            self.app.config.save()
+            self.app.config.update_section('dmf_device', {'name':
+                                                          device_name})
 
     def on_dmf_device_swapped(self, old_dmf_device, dmf_device):
         self.on_dmf_device_changed(dmf_device)
 
     def on_protocol_changed(self):
         if self.app.protocol.name != self.app.config['protocol']['name']:
-            self.app.config['protocol']['name'] = self.app.protocol.name
-            self.app.config.save()
+            self.app.config.update_section('protocol',
+                                           {'name': self.app.protocol.name})
 
     def on_protocol_swapped(self, old_protocol, protocol):
         self.on_protocol_changed()
 
     def on_app_options_changed(self, plugin_name):
+        '''
+        .. versionchanged:: 2.36.0
+            Mark config section as modified to write config to disk in a
+            background thread (debounced), rather than writing immediately
+            (see :meth:`microdrop.config.Config.mark_dirty`).
+
+            Update config section through
+            :meth:`microdrop.config.Config.update_section`, since this method
+            may be called from a background thread.
+        '''
         if self.app is None:
             return
         _L().debug('on_app_options_changed: %s' % plugin_name)
@@ -66,10 +81,7 @@ class ConfigController(SingletonPlugin):
                 return
             app_options = service.get_app_values()
             if app_options:
-                if plugin_name not in self.app.config.data:
-                    self.app.config.data[plugin_name] = {}
-                self.app.config.data[plugin_name].update(app_options)
-                self.app.config.save()
+                self.app.config.update_section(plugin_name, app_options)
 
     def get_schedule_requests(self, function_name):
         """
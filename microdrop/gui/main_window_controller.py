@@ -26,6 +26,7 @@ from ..plugin_manager import (IPlugin, SingletonPlugin, implements,
                               PluginGlobals, ScheduleRequest, ILoggingPlugin,
                               emit_signal, get_service_instance_by_name)
 from ..app_context import get_app, MODE_RUNNING_MASK
+from ..gtk_dispatch import gtk_coalesce
 from logging_helpers import _L  #: .. versionadded:: 2.20
 from .. import __version__
 
@@ -492,11 +493,15 @@ class MainWindowController(SingletonPlugin):
         '''
         .. versionchanged:: 2.11.2
             Schedule label update asynchronously to occur in the main GTK loop.
+
+        .. versionchanged:: 2.36.0
+            Coalesce label updates scheduled before the GUI is updated (see
+            :func:`microdrop.gtk_dispatch.gtk_coalesce`).
         '''
         message = get_string(obj)
         if modified:
             message += ' <b>[modified]</b>'
-        gobject.idle_add(label.set_markup, wrap_string(message, 60, "\n\t"))
+        gtk_coalesce(label.set_markup)(wrap_string(message, 60, "\n\t"))
 
     def update_protocol_name_label(self, obj=None, **kwargs):
         _kwargs = kwargs.copy()
@@ -611,11 +616,15 @@ class MainWindowController(SingletonPlugin):
 
         .. versionchanged:: 2.11.2
             Schedule label update asynchronously to occur in the main GTK loop.
+
+        .. versionchanged:: 2.36.0
+            Coalesce label updates scheduled before the GUI is updated (see
+            :func:`microdrop.gtk_dispatch.gtk_coalesce`).
         '''
         if self.step_timeout_id is not None:
             gobject.source_remove(self.step_timeout_id)
             self.step_timeout_id = None
-        gtk_threadsafe(self.label_step_time.set_text)('-')
+        gtk_coalesce(self.label_step_time.set_text)('-')
 
     @gtk_threadsafe
     def on_mode_changed(self, old_mode, new_mode):
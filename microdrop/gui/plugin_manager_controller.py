@@ -12,6 +12,7 @@ from ..gui.plugin_manager_dialog import PluginManagerDialog
 from ..plugin_helpers import get_plugin_info
 from ..plugin_manager import (IPlugin, implements, SingletonPlugin,
                               PluginGlobals, get_service_instance,
+                              load_deferred_plugins,
                               enable as enable_service,
                               disable as disable_service)
 
@@ -166,7 +167,12 @@ class PluginManagerController(SingletonPlugin):
         ..notes::
             Also update **deletion**, **rename**, and **post-install** queue
             files.
+
+        .. versionchanged:: 2.36.0
+            Import any plugins deferred at startup (i.e., plugins that were
+            not enabled) to list them.
         '''
+        load_deferred_plugins()
         plugin_names = self.get_plugin_names()
         del self.plugins
         self.plugins = []
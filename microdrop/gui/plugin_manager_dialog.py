@@ -65,6 +65,10 @@ class PluginManagerDialog(object):
         .. versionchanged:: 2.10.5
             Save Python module names of enabled plugins (**not** Conda package
             names) to ``microdrop.ini`` configuration file.
+
+        .. versionchanged:: 2.36.0
+            Update enabled plugins while holding the config lock (see
+            :meth:`microdrop.config.Config.locked`).
         '''
         # TODO
         # ----
@@ -76,21 +80,25 @@ class PluginManagerDialog(object):
         self.update()
         response = self.window.run()
         self.window.hide()
-        for p in self.controller.plugins:
-            package_name = p.get_plugin_info().package_name
-            # Extract importable Python module name from Conda package name.
-            #
-            # XXX Plugins are currently Python modules, which means that the
-            # installed plugin directory must be a valid module name. However,
-            # Conda package name conventions may include `.` and `-`
-            # characters.
-            module_name = package_name.split('.')[-1].replace('-', '_')
-            if p.enabled():
-                if module_name not in app.config["plugins"]["enabled"]:
-                    app.config["plugins"]["enabled"].append(module_name)
-            else:
-                if module_name in app.config["plugins"]["enabled"]:
-                    app.config["plugins"]["enabled"].remove(module_name)
+        with app.config.locked() as data:
+            enabled = list(data['plugins']['enabled'])
+            for p in self.controller.plugins:
+                package_name = p.get_plugin_info().package_name
+                # Extract importable Python module name from Conda package
+                # name.
+                #
+                # XXX Plugins are currently Python modules, which means that
+                # the installed plugin directory must be a valid module name.
+                # However, Conda package name conventions may include `.` and
+                # `-` characters.
+                module_name = package_name.split('.')[-1].replace('-', '_')
+                if p.enabled():
+                    if module_name not in enabled:
+                        enabled.append(module_name)
+                elif module_name in enabled:
+                    enabled.remove(module_name)
+            app.config.update_section('plugins', {'enabled': enabled},
+                                      mark_dirty=False)
         app.config.save()
         if self.controller.restart_required:
             _L().warning('\n'.join(['Plugins and/or dependencies were '
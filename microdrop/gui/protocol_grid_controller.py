@@ -33,15 +33,205 @@ def _get_title(column):
     return column.get_data('pygtkhelpers::column').title
 
 
+class LazyRowFields(dict):
+    '''
+    Mapping of form name to :class:`RowFields`, where the row fields for each
+    form are only loaded from the respective plugin on first access.
+
+    .. versionadded:: 2.36.0
+    '''
+    def __init__(self, combined_row, *args, **kwargs):
+        super(LazyRowFields, self).__init__(*args, **kwargs)
+        self.combined_row = combined_row
+
+    def __missing__(self, form_name):
+        row_fields = self.combined_row.load_row_fields(form_name)
+        self[form_name] = row_fields
+        return row_fields
+
+
+class LazyCombinedRow(CombinedRow):
+    '''
+    Protocol grid row which only reads step values from plugins when a field
+    is first accessed (e.g., when the row is drawn).
+
+    The step number is tracked using the ``__DefaultFields.id`` field, which
+    is kept up to date by :meth:`CombinedFields.reset_row_ids`.
+
+    .. versionadded:: 2.36.0
+    '''
+    def __init__(self, combined_fields, step_number):
+        # Assign directly to `__dict__` since `CombinedRow.__setattr__` only
+        # handles mangled field names.
+        self.__dict__['combined_fields'] = combined_fields
+        self.__dict__['attributes'] = LazyRowFields(self)
+        self.attributes['__DefaultFields'] = RowFields(id=step_number + 1)
+
+    @property
+    def step_number(self):
+        return self.attributes['__DefaultFields'].id - 1
+
+    def is_loaded(self, form_name):
+        '''
+        Returns
+        -------
+        bool
+            ``True`` if step values for form have been read from plugin.
+        '''
+        return form_name in self.attributes
+
+    def load_row_fields(self, form_name):
+        '''
+        Read step values for form from the corresponding plugin.
+
+        Falls back to form defaults if plugin does not provide step values.
+
+        Returns
+        -------
+        pygtkhelpers.ui.objectlist.combined_fields.RowFields
+        '''
+        service = ExtensionPoint(IPlugin).service(form_name)
+        values = None
+        if hasattr(service, 'get_step_values'):
+            values = service.get_step_values(step_number=self.step_number)
+        if values is None:
+            form = self.combined_fields._forms[form_name]
+            values = dict([(k, v.value)
+                           for k, v in form.from_defaults().iteritems()])
+        return RowFields(**values)
+
+
 class ProtocolGridView(CombinedFields):
+    '''
+    .. versionchanged:: 2.36.0
+        Create a column for *every* field and toggle column visibility
+        according to :data:`enabled_attrs` (see :meth:`set_enabled_fields`).
+        Use :class:`LazyCombinedRow` rows, which are only populated when
+        drawn, and support incremental row insertion/removal (see
+        :meth:`insert_rows` and :meth:`remove_rows`).
+    '''
     def __init__(self, forms, enabled_attrs, *args, **kwargs):
-        super(ProtocolGridView, self).__init__(forms, enabled_attrs, *args,
-                                               **kwargs)
+        self._defer_row_ids = False
+        super(ProtocolGridView, self).__init__(forms, None, *args, **kwargs)
+        self.set_enabled_fields(enabled_attrs)
         self.connect('row-changed', self.on_row_changed)
         self.connect('rows-changed', self.on_rows_changed)
         self.connect('selection-changed', self.on_selection_changed)
 
+    def _column_field(self, column):
+        '''
+        Returns
+        -------
+        tuple
+            Form name and (non-mangled) field name of column.
+        '''
+        for form_name, uuid_code in self.uuid_mapping.iteritems():
+            field_set_prefix = self.field_set_prefix % uuid_code
+            if column.attr.startswith(field_set_prefix):
+                return form_name, column.attr[len(field_set_prefix):]
+        return None, None
+
+    def set_enabled_fields(self, enabled_fields):
+        '''
+        Show columns for enabled fields and hide all other columns.
+
+        Parameters
+        ----------
+        enabled_fields : dict
+            Mapping from each form name to a set of enabled field names.  If
+            ``None`` or empty, all fields are enabled.
+
+
+        .. versionadded:: 2.36.0
+        '''
+        self.enabled_fields_by_form_name = enabled_fields
+        for view_column in self.get_columns():
+            column = view_column.get_data('pygtkhelpers::column')
+            form_name, field_name = self._column_field(column)
+            # Note: `column.visible` is `False` for fields with the
+            # `show_in_gui=False` property.
+            visible = column.visible
+            if enabled_fields and form_name != '__DefaultFields':
+                visible = visible and (field_name in
+                                       enabled_fields.get(form_name, {}))
+            view_column.set_visible(visible)
+
+    def set_fixed_column_widths(self, sample_size=20):
+        '''
+        Fix the width of each column and enable fixed height mode.
+
+        In fixed height mode, cells are only rendered for visible rows, i.e.,
+        step values are only read for rows that are actually drawn.
+
+        Column widths are sized to fit the column title and the cells of the
+        first :data:`sample_size` rows.  Columns may still be resized.
+
+
+        .. versionadded:: 2.36.0
+        '''
+        model = self.get_model()
+        row_count = min(sample_size, len(model))
+        for view_column in self.get_columns():
+            layout = self.create_pango_layout(view_column.get_title())
+            # Leave room for column header padding.
+            width = layout.get_pixel_size()[0] + 24
+            for i in xrange(row_count):
+                view_column.cell_set_cell_data(model, model.get_iter(i), False,
+                                               False)
+                width = max(width, view_column.cell_get_size()[-2])
+            view_column.set_sizing(gtk.TREE_VIEW_COLUMN_FIXED)
+            view_column.set_fixed_width(width)
+        self.set_fixed_height_mode(True)
+
+    def reset_row_ids(self):
+        if not self._defer_row_ids:
+            super(ProtocolGridView, self).reset_row_ids()
+
+    def insert_rows(self, step_numbers):
+        '''
+        Insert a (lazy) row for each step number.
+
+        Row IDs are reset once, after all rows are inserted.
+
+
+        .. versionadded:: 2.36.0
+        '''
+        self._defer_row_ids = True
+        try:
+            for i in sorted(step_numbers):
+                self.insert(i, LazyCombinedRow(self, i))
+        finally:
+            self._defer_row_ids = False
+        self.reset_row_ids()
+
+    def remove_rows(self, step_numbers):
+        '''
+        Remove row corresponding to each step number.
+
+        Row IDs are reset once, after all rows are removed.
+
+
+        .. versionadded:: 2.36.0
+        '''
+        self._defer_row_ids = True
+        try:
+            for i in sorted(step_numbers, reverse=True):
+                self.remove(self[i])
+        finally:
+            self._defer_row_ids = False
+        self.reset_row_ids()
+
     def _on_step_options_changed(self, form_name, step_number):
+        '''
+        .. versionchanged:: 2.36.0
+            Only read step values if they have already been loaded for the
+            row.  Otherwise, values are read when the row is next drawn.
+        '''
+        if step_number >= len(self):
+            return
+        row = self[step_number]
+        if isinstance(row, LazyCombinedRow) and not row.is_loaded(form_name):
+            return
         observers = ExtensionPoint(IPlugin)
         # Get the instance of the specified plugin
         service = observers.service(form_name)
@@ -171,8 +361,16 @@ class ProtocolGridController(SingletonPlugin, AppDataController):
 
     @enabled_fields.setter
     def enabled_fields(self, data):
+        '''
+        .. versionchanged:: 2.36.0
+            Toggle column visibility of existing grid instead of rebuilding
+            grid.
+        '''
         self._enabled_fields = deepcopy(data)
-        self.update_grid()
+        if self.widget is None:
+            self.update_grid()
+        else:
+            self.widget.set_enabled_fields(self._enabled_fields)
 
     def on_plugin_enable(self):
         app = get_app()
@@ -214,6 +412,12 @@ class ProtocolGridController(SingletonPlugin, AppDataController):
         _L().debug('%s', self.enabled_fields)
 
     def update_grid(self, protocol=None):
+        '''
+        Rebuild the protocol grid.
+
+        .. versionchanged:: 2.36.0
+            Create lazy rows, which only read step values when drawn.
+        '''
         app = get_app()
         if protocol is None:
             protocol = app.protocol
@@ -241,15 +445,8 @@ class ProtocolGridController(SingletonPlugin, AppDataController):
         combined_fields.connect('fields-filter-request',
                                 self.set_fields_filter)
 
-        for i, step in enumerate(steps):
-            values = emit_signal('get_step_values', [i])
-
-            attributes = dict()
-            for form_name, form in combined_fields.forms.iteritems():
-                attr_values = values[form_name]
-                attributes[form_name] = RowFields(**attr_values)
-            combined_row = CombinedRow(combined_fields, attributes=attributes)
-            combined_fields.append(combined_row)
+        # Step values for each row are read when the row is first drawn.
+        combined_fields.insert_rows(range(len(steps)))
 
         if self.widget:
             # Replacing a previously rendered widget.  Maintain original column
@@ -288,6 +485,8 @@ class ProtocolGridController(SingletonPlugin, AppDataController):
             for i, title_i, column_i in ordered_column_info:
                 combined_fields.append_column(column_i)
 
+        # Only render visible rows.
+        combined_fields.set_fixed_column_widths()
         self.widget = combined_fields
 
         app = get_app()
@@ -361,8 +560,17 @@ class ProtocolGridController(SingletonPlugin, AppDataController):
     def on_step_default_created(self, step_number):
         self.update_grid()
 
-    def on_step_created(self, step_number):
-        self.update_grid()
+    def on_steps_inserted(self, step_numbers):
+        '''
+        .. versionchanged:: 2.36.0
+            Replace ``on_step_created`` handler to insert a row for each new
+            step (rather than rebuilding the grid).
+        '''
+        if self.widget is None:
+            self.update_grid()
+            return
+        self.widget.insert_rows(step_numbers)
+        self._check_row_count()
 
     def on_step_swapped(self, original_step_number, step_number):
         _L().debug('%d -> %d', original_step_number, step_number)
@@ -371,9 +579,33 @@ class ProtocolGridController(SingletonPlugin, AppDataController):
             step_number = app.protocol_controller.protocol_state['step_number']
             self.widget.select_row(step_number)
 
-    def on_step_removed(self, step_number, step):
-        _L().debug('%d', step_number)
-        self.update_grid()
+    def on_steps_removed(self, step_numbers, steps):
+        '''
+        .. versionchanged:: 2.36.0
+            Replace ``on_step_removed`` handler to remove the row for each
+            removed step (rather than rebuilding the grid).
+        '''
+        _L().debug('%s', step_numbers)
+        if self.widget is None:
+            self.update_grid()
+            return
+        self.widget.remove_rows(step_numbers)
+        self._check_row_count()
+
+    def _check_row_count(self):
+        '''
+        Rebuild grid if the number of rows does not match the number of steps
+        in the protocol.
+
+        .. versionadded:: 2.36.0
+        '''
+        app = get_app()
+        if app.protocol is not None and (len(self.widget) !=
+                                         len(app.protocol.steps)):
+            _L().warning('Grid row count (%d) does not match protocol step '
+                         'count (%d).  Rebuild grid.', len(self.widget),
+                         len(app.protocol.steps))
+            self.update_grid()
 
     def on_app_exit(self):
         if self.widget:
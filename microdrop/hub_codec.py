@@ -0,0 +1,269 @@
+'''
+Binary, :mod:`pandas`-aware encoding of hub request and reply data.
+
+By default, hub request and reply data are encoded by :mod:`zmq_plugin`
+(e.g., as JSON, where :mod:`pandas` objects are stringified with
+:class:`zmq_plugin.schema.PandasJsonEncoder`).  As an opt-in alternative,
+data may be packed with `msgpack`_, where :class:`numpy.ndarray`,
+:class:`pandas.Series`, :class:`pandas.Index`, and
+:class:`pandas.DataFrame` objects are encoded as extension types carrying
+raw array buffers.
+
+Packed data is sent as a single :data:`MSGPACK_KEY` field (base64 encoded),
+which also flags that the requester accepts a packed reply.  Handlers
+decorated with :func:`msgpack_reply` pack their reply for such requests.
+Otherwise (or if ``msgpack`` is not installed, or the reply cannot be
+packed), the default encoding is used.
+
+Example
+-------
+
+Request electrode channels frame as packed data::
+
+    from microdrop.hub_codec import decode_data, packed_kwargs
+    from microdrop.plugin_helpers import hub_execute
+
+    df_channels = decode_data(hub_execute('microdrop.device_info_plugin',
+                                          'get_electrode_channels',
+                                          **packed_kwargs()))
+
+Handle packed requests (and reply with packed data)::
+
+    from microdrop.hub_codec import decode_content_data, msgpack_reply
+
+    class MyZmqPlugin(ZmqPlugin):
+        @msgpack_reply
+        def on_execute__get_frame(self, request):
+            data = decode_content_data(request)
+            ...
+
+.. _msgpack: https://msgpack.org
+
+.. versionadded:: 2.36.0
+'''
+from collections import OrderedDict
+import base64
+import functools as ft
+
+from logging_helpers import _L
+import numpy as np
+import pandas as pd
+import zmq_plugin.schema
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+#: Data field containing packed (base64 encoded) data.
+MSGPACK_KEY = '__msgpack__'
+
+#: ``msgpack`` extension type codes.
+EXT_NDARRAY = 1
+EXT_INDEX = 2
+EXT_SERIES = 3
+EXT_DATAFRAME = 4
+
+
+def msgpack_available():
+    '''
+    Returns
+    -------
+    bool
+        ``True`` if ``msgpack`` is installed.
+    '''
+    return msgpack is not None
+
+
+def _values(obj):
+    '''
+    Returns
+    -------
+    numpy.ndarray
+        Values of :mod:`pandas` index, series, or data frame column.
+
+    Raises
+    ------
+    TypeError
+        If values are not of a :mod:`numpy` type (e.g., time zone aware or
+        categorical), since the type would not be preserved.
+    '''
+    if not isinstance(obj.dtype, np.dtype):
+        raise TypeError('Unsupported values type: `%s`' % obj.dtype)
+    return np.asarray(obj.values)
+
+
+def _default(obj):
+    '''
+    Encode :mod:`numpy` and :mod:`pandas` objects as ``msgpack`` extension
+    types.
+
+    Raises
+    ------
+    TypeError
+        If object type is not supported.
+    '''
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.kind in 'biufcmMSU':
+            payload = [obj.dtype.str, list(obj.shape),
+                       np.ascontiguousarray(obj).tobytes()]
+        elif obj.dtype.kind == 'O':
+            payload = ['O', list(obj.shape), obj.ravel().tolist()]
+        else:
+            raise TypeError('Unsupported array type: `%s`' % obj.dtype)
+        return msgpack.ExtType(EXT_NDARRAY, pack(payload))
+    elif isinstance(obj, np.generic):
+        return obj.item()
+    elif isinstance(obj, pd.MultiIndex) or getattr(obj, 'tz', None):
+        raise TypeError('Unsupported index type: `%s`' % type(obj))
+    elif isinstance(obj, pd.Index):
+        return msgpack.ExtType(EXT_INDEX, pack([_values(obj), obj.name]))
+    elif isinstance(obj, pd.Series):
+        return msgpack.ExtType(EXT_SERIES, pack([_values(obj), obj.index,
+                                                 obj.name]))
+    elif isinstance(obj, pd.DataFrame):
+        # Pack each column separately to preserve column types.
+        return msgpack.ExtType(EXT_DATAFRAME,
+                               pack([obj.columns, obj.index,
+                                     [_values(obj.iloc[:, i])
+                                      for i in xrange(obj.shape[1])]]))
+    raise TypeError('Cannot pack object of type `%s`' % type(obj))
+
+
+def _ext_hook(code, data):
+    value = unpack(data)
+    if code == EXT_NDARRAY:
+        dtype, shape, payload = value
+        if dtype == 'O':
+            array = np.empty(len(payload), dtype=object)
+            array[:] = payload
+            return array.reshape(shape)
+        # Note: copy, since array is otherwise read-only.
+        return np.frombuffer(payload, dtype=np.dtype(dtype))\
+            .reshape(shape).copy()
+    elif code == EXT_INDEX:
+        values, name = value
+        return pd.Index(values, name=name)
+    elif code == EXT_SERIES:
+        values, index, name = value
+        return pd.Series(values, index=index, name=name)
+    elif code == EXT_DATAFRAME:
+        columns, index, arrays = value
+        df = pd.DataFrame(OrderedDict(enumerate(arrays)), index=index)
+        df.columns = columns
+        return df
+    return msgpack.ExtType(code, data)
+
+
+def pack(obj):
+    '''
+    Parameters
+    ----------
+    obj : object
+        Object to pack, e.g., nested lists and dictionaries containing
+        :mod:`numpy` and :mod:`pandas` objects.
+
+    Returns
+    -------
+    bytes
+        Packed object.
+
+    Raises
+    ------
+    TypeError
+        If object (or any nested object) type is not supported.
+    '''
+    return msgpack.packb(obj, default=_default, use_bin_type=True)
+
+
+def unpack(data):
+    '''
+    Parameters
+    ----------
+    data : bytes
+        Packed object (see :func:`pack`).
+
+    Returns
+    -------
+    object
+        Unpacked object.
+    '''
+    return msgpack.unpackb(data, ext_hook=_ext_hook, raw=False)
+
+
+def encode_data(data):
+    '''
+    Returns
+    -------
+    dict
+        Data packed as a single :data:`MSGPACK_KEY` field.
+    '''
+    return {MSGPACK_KEY: base64.b64encode(pack(data))}
+
+
+def is_packed(data):
+    '''
+    Returns
+    -------
+    bool
+        ``True`` if :data:`data` was encoded by :func:`encode_data`.
+    '''
+    return isinstance(data, dict) and data.keys() == [MSGPACK_KEY]
+
+
+def decode_data(data):
+    '''
+    Returns
+    -------
+    object
+        Unpacked data if :data:`data` was encoded by :func:`encode_data`.
+        Otherwise, :data:`data` is returned as is.
+    '''
+    if is_packed(data):
+        return unpack(base64.b64decode(data[MSGPACK_KEY]))
+    return data
+
+
+def packed_kwargs(**kwargs):
+    '''
+    Returns
+    -------
+    dict
+        Keyword arguments packed as a single keyword argument, e.g., to pass
+        to :func:`microdrop.plugin_helpers.hub_execute` to request a packed
+        reply.  If ``msgpack`` is not installed, :data:`kwargs` are returned
+        as is.
+    '''
+    if not msgpack_available():
+        return kwargs
+    return encode_data(kwargs)
+
+
+def decode_content_data(request):
+    '''
+    Drop-in replacement for :func:`zmq_plugin.schema.decode_content_data`,
+    which also unpacks data encoded by :func:`encode_data`.
+    '''
+    return decode_data(zmq_plugin.schema.decode_content_data(request))
+
+
+def msgpack_reply(func):
+    '''
+    Decorator for ``on_execute__<command>`` handlers to pack the reply if
+    the request data is packed (see :func:`packed_kwargs`).
+
+    If the reply cannot be packed, it is returned as is (i.e., encoded
+    with the default encoding).
+    '''
+    @ft.wraps(func)
+    def _wrapped(self, request):
+        result = func(self, request)
+        if msgpack_available() and \
+                is_packed(zmq_plugin.schema.decode_content_data(request)):
+            try:
+                return encode_data(result)
+            except (TypeError, ValueError, OverflowError):
+                _L().debug('Could not pack `%s` reply; falling back to '
+                           'default encoding.', func.__name__, exc_info=True)
+        return result
+    return _wrapped
@@ -0,0 +1,326 @@
+'''
+ZeroMQ hub message throughput and latency metrics.
+
+Execution requests and replies routed through the hub are counted per
+requesting plugin (``source``), handling plugin (``target``), and command.
+For each, the following are kept:
+
+ - total number of requests, replies, and error replies;
+ - number of requests during a rolling time window (i.e., request rate);
+ - request and reply sizes (in bytes);
+ - number of requests still awaiting a reply (i.e., in flight); and
+ - a histogram of reply latencies, i.e., the time between the hub
+   receiving a request and the corresponding reply.
+
+Recording a message only updates counters (i.e., histograms are binned
+incrementally), such that the overhead per message is negligible.
+
+Example
+-------
+
+Record a request and the corresponding reply, and get metrics::
+
+    from microdrop.hub_metrics import HubMetrics
+
+    metrics = HubMetrics()
+    metrics.record_request('a', 'b', 'ping', session, size=120)
+    ...
+    metrics.record_reply('b', 'a', 'ping', session, size=140)
+    metrics.metrics()
+
+.. versionadded:: 2.36.0
+'''
+import bisect
+import collections
+
+import pandas as pd
+
+from .step_timing import DEFAULT_BIN_EDGES, monotonic
+
+#: Columns of :meth:`HubMetrics.frame`.
+FRAME_COLUMNS = ['source', 'target', 'command', 'requests', 'replies',
+                 'errors', 'in_flight', 'rate_hz', 'request_bytes',
+                 'reply_bytes', 'max_request_bytes', 'max_reply_bytes',
+                 'latency_count', 'mean_latency_s', 'max_latency_s']
+#: Columns summed per source and per target in :meth:`HubMetrics.metrics`.
+TOTALS_COLUMNS = ['requests', 'replies', 'errors', 'in_flight', 'rate_hz',
+                  'request_bytes', 'reply_bytes']
+
+
+class RollingCounter(object):
+    '''
+    Count events during a rolling time window, using one bucket per second.
+
+    Parameters
+    ----------
+    window_s : int, optional
+        Window duration (in seconds).
+    '''
+    def __init__(self, window_s=60):
+        self.window_s = int(window_s)
+        self._counts = [0] * self.window_s
+        self._seconds = [None] * self.window_s
+
+    def add(self, value=1, now=None):
+        second = int(monotonic() if now is None else now)
+        i = second % self.window_s
+        if self._seconds[i] != second:
+            self._seconds[i] = second
+            self._counts[i] = 0
+        self._counts[i] += value
+
+    def total(self, now=None):
+        '''
+        Returns
+        -------
+        int
+            Number of events during the last :attr:`window_s` seconds.
+        '''
+        second = int(monotonic() if now is None else now)
+        return sum(count_i for second_i, count_i in zip(self._seconds,
+                                                          self._counts)
+                   if second_i is not None and
+                   second - self.window_s < second_i <= second)
+
+
+class MessageStats(object):
+    '''
+    Counters for messages with the same source, target, and command.
+
+    Parameters
+    ----------
+    bin_count : int
+        Number of latency histogram bins.
+    window_s : int
+        Request rate window duration (in seconds).
+    '''
+    __slots__ = ('requests', 'replies', 'errors', 'in_flight',
+                 'request_bytes', 'reply_bytes', 'max_request_bytes',
+                 'max_reply_bytes', 'latency_sum_s', 'latency_max_s',
+                 'latency_counts', 'recent_requests')
+
+    def __init__(self, bin_count, window_s):
+        self.requests = 0
+        self.replies = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.request_bytes = 0
+        self.reply_bytes = 0
+        self.max_request_bytes = 0
+        self.max_reply_bytes = 0
+        self.latency_sum_s = 0.
+        self.latency_max_s = 0.
+        self.latency_counts = [0] * bin_count
+        self.recent_requests = RollingCounter(window_s)
+
+
+class HubMetrics(object):
+    '''
+    Message throughput and latency metrics, grouped by source, target, and
+    command.
+
+    Parameters
+    ----------
+    window_s : int, optional
+        Request rate window duration (in seconds).
+    bin_edges : array-like, optional
+        Latency histogram bin edges (in seconds).  Latencies outside of the
+        range are counted in the first or last bin.  By default, use
+        :data:`microdrop.step_timing.DEFAULT_BIN_EDGES`.
+    max_in_flight : int, optional
+        Maximum number of requests awaiting a reply to keep track of.
+        Oldest requests are discarded first (and counted as ``expired``),
+        e.g., if a target never replies.
+
+    Attributes
+    ----------
+    enabled : bool
+        If ``False``, messages are not recorded.
+    '''
+    def __init__(self, window_s=60, bin_edges=None, max_in_flight=10000):
+        if bin_edges is None:
+            bin_edges = DEFAULT_BIN_EDGES
+        self.enabled = True
+        self.window_s = int(window_s)
+        self.bin_edges = [float(edge_i) for edge_i in bin_edges]
+        self.max_in_flight = max_in_flight
+        self.reset()
+
+    def reset(self):
+        '''
+        Clear all counters.
+        '''
+        self.start = monotonic()
+        self.expired = 0
+        self._stats = {}
+        # Map each session (i.e., request) awaiting a reply to the request
+        # receive time and stats.
+        self._in_flight = collections.OrderedDict()
+
+    def _message_stats(self, source, target, command):
+        key = (source, target, command)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = MessageStats(len(self.bin_edges) - 1, self.window_s)
+            self._stats[key] = stats
+        return stats
+
+    def record_request(self, source, target, command, session, size=0,
+                       now=None):
+        '''
+        Record execution request.
+
+        Parameters
+        ----------
+        source : str
+            Name of requesting plugin.
+        target : str
+            Name of plugin handling request.
+        command : str
+            Command name.
+        session : str
+            Request session identifier (i.e., also set in reply).
+        size : int, optional
+            Message size (in bytes).
+        now : float, optional
+            Receive time (:func:`monotonic`, in seconds).
+        '''
+        if not self.enabled:
+            return
+        if now is None:
+            now = monotonic()
+        stats = self._message_stats(source, target, command)
+        stats.requests += 1
+        stats.request_bytes += size
+        stats.max_request_bytes = max(stats.max_request_bytes, size)
+        stats.recent_requests.add(now=now)
+        previous = self._in_flight.pop(session, None)
+        if previous is not None:
+            # Session reused before reply, i.e., only track latest request.
+            previous[1].in_flight -= 1
+        stats.in_flight += 1
+        self._in_flight[session] = now, stats
+        if len(self._in_flight) > self.max_in_flight:
+            session_i, (now_i, stats_i) = \
+                self._in_flight.popitem(last=False)
+            stats_i.in_flight -= 1
+            self.expired += 1
+
+    def record_reply(self, source, target, command, session, size=0,
+                     error=False, now=None):
+        '''
+        Record execution reply.
+
+        Parameters
+        ----------
+        source : str
+            Name of plugin that handled request.
+        target : str
+            Name of requesting plugin.
+        command : str
+            Command name.
+        session : str
+            Request session identifier.
+        size : int, optional
+            Message size (in bytes).
+        error : bool, optional
+            ``True`` if request failed.
+        now : float, optional
+            Receive time (:func:`monotonic`, in seconds).
+        '''
+        if not self.enabled:
+            return
+        if now is None:
+            now = monotonic()
+        # Note: count reply with request, i.e., source is requesting plugin.
+        stats = self._message_stats(target, source, command)
+        stats.replies += 1
+        stats.errors += bool(error)
+        stats.reply_bytes += size
+        stats.max_reply_bytes = max(stats.max_reply_bytes, size)
+        request = self._in_flight.pop(session, None)
+        if request is None:
+            return
+        request_time, request_stats = request
+        request_stats.in_flight -= 1
+        latency_s = now - request_time
+        stats.latency_sum_s += latency_s
+        stats.latency_max_s = max(stats.latency_max_s, latency_s)
+        i = bisect.bisect_right(self.bin_edges, latency_s) - 1
+        stats.latency_counts[min(max(i, 0), len(stats.latency_counts) -
+                                 1)] += 1
+
+    @property
+    def in_flight(self):
+        return len(self._in_flight)
+
+    def _records(self, now):
+        # Request rate over the rate window (or uptime, if shorter).
+        duration_s = float(min(self.window_s, max(now - self.start, 1)))
+        for (source, target, command), stats in sorted(self._stats
+                                                       .iteritems()):
+            latency_count = sum(stats.latency_counts)
+            yield collections.OrderedDict([
+                ('source', source), ('target', target), ('command', command),
+                ('requests', stats.requests), ('replies', stats.replies),
+                ('errors', stats.errors), ('in_flight', stats.in_flight),
+                ('rate_hz', stats.recent_requests.total(now) / duration_s),
+                ('request_bytes', stats.request_bytes),
+                ('reply_bytes', stats.reply_bytes),
+                ('max_request_bytes', stats.max_request_bytes),
+                ('max_reply_bytes', stats.max_reply_bytes),
+                ('latency_count', latency_count),
+                ('mean_latency_s', stats.latency_sum_s / latency_count
+                 if latency_count else None),
+                ('max_latency_s', stats.latency_max_s if latency_count
+                 else None)])
+
+    def frame(self, now=None):
+        '''
+        Returns
+        -------
+        pandas.DataFrame
+            Table with one row per source, target, and command, with the
+            columns :data:`FRAME_COLUMNS`.
+        '''
+        if now is None:
+            now = monotonic()
+        return pd.DataFrame(list(self._records(now)), columns=FRAME_COLUMNS)
+
+    def metrics(self, now=None):
+        '''
+        Returns
+        -------
+        dict
+            Overall metrics (``uptime_s``, ``window_s``, ``in_flight``,
+            ``expired``, and latency histogram ``bin_edges_s``), with
+            :data:`TOTALS_COLUMNS` totals per requesting plugin
+            (``sources``) and per handling plugin (``targets``), and per
+            source, target, and command metrics (``messages``), i.e., a
+            mapping from each source to a mapping from each target to a
+            mapping from each command to a dictionary with the remaining
+            :data:`FRAME_COLUMNS` values and the latency histogram
+            ``counts``.
+        '''
+        if now is None:
+            now = monotonic()
+        metrics = {'uptime_s': now - self.start,
+                   'window_s': self.window_s,
+                   'in_flight': self.in_flight,
+                   'expired': self.expired,
+                   'bin_edges_s': list(self.bin_edges),
+                   'sources': {}, 'targets': {}, 'messages': {}}
+        for record in self._records(now):
+            source = record.pop('source')
+            target = record.pop('target')
+            command = record.pop('command')
+            for name, key in (('sources', source), ('targets', target)):
+                totals = metrics[name].setdefault(key, dict.fromkeys
+                                                  (TOTALS_COLUMNS, 0))
+                for column in TOTALS_COLUMNS:
+                    totals[column] += record[column]
+            record['counts'] = list(self._stats[(source, target, command)]
+                                    .latency_counts)
+            metrics['messages'].setdefault(source, {})\
+                .setdefault(target, {})[command] = dict(record)
+        return metrics
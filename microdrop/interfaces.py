@@ -357,6 +357,42 @@ else:
                 :data:`plugin_kwargs` instead of reading parameters using
                 :meth:`get_step_options()`.  Add :data:`signals` parameter as a
                 signals namespace for plugins during step execution.
+
+            .. versionchanged:: 2.36.0
+                :data:`plugin_kwargs` is a read-only snapshot shared by all
+                plugins (see :func:`microdrop.protocol.freeze`).  Plugins
+                **MUST NOT** modify :data:`plugin_kwargs`; use, e.g.,
+                ``dict(plugin_kwargs[name])`` to get a mutable copy.
+            """
+            pass
+
+        def prepare_step(self, plugin_kwargs):
+            """
+            Handler called to prepare a step _before_ it is executed, e.g., to
+            precompute any state required by :meth:`on_step_run`.
+
+            Only called when steps are executed in **pipelined** mode (see
+            :func:`microdrop.core_plugins.protocol_controller.execute
+            .execute_steps`), where the next step is prepared while the
+            current step is executing.  Plugins **MUST NOT** assume that
+            :meth:`on_step_run` is called for a prepared step (e.g., if the
+            protocol is paused).
+
+            May optionally be implemented as a coroutine.
+
+            Parameters
+            ----------
+            plugin_kwargs : dict
+                Read-only plugin settings of the step to prepare, i.e., the
+                same object later passed to :meth:`on_step_run`.
+
+            Returns
+            -------
+            object
+                Return value is ignored.
+
+
+            .. versionadded:: 2.36.0
             """
             pass
 
@@ -368,6 +404,60 @@ else:
             ----------
             step_number : int
                 New step number.
+
+
+            .. versionchanged:: 2.36.0
+                Only called on plugins that do not implement
+                :meth:`on_steps_inserted`.
+            """
+            pass
+
+        def on_steps_inserted(self, step_numbers):
+            """
+            Handler called once whenever one or more steps are inserted.
+
+            Parameters
+            ----------
+            step_numbers : list[int]
+                Contiguous range of new step numbers.
+
+
+            .. versionadded:: 2.36.0
+            """
+            pass
+
+        def on_step_removed(self, step_number, step):
+            """
+            Handler called whenever a step is removed.
+
+            Parameters
+            ----------
+            step_number : int
+                Removed step number.
+            step : microdrop.protocol.Step
+                Removed step.
+
+
+            .. versionchanged:: 2.36.0
+                Only called on plugins that do not implement
+                :meth:`on_steps_removed`.
+            """
+            pass
+
+        def on_steps_removed(self, step_numbers, steps):
+            """
+            Handler called once whenever one or more steps are removed.
+
+            Parameters
+            ----------
+            step_numbers : list[int]
+                Removed step numbers (ascending, numbered according to the
+                protocol *before* removal).
+            steps : list[microdrop.protocol.Step]
+                Removed steps, in the same order as :data:`step_numbers`.
+
+
+            .. versionadded:: 2.36.0
             """
             pass
 
@@ -444,6 +534,41 @@ else:
             '''
             pass
 
+        @asyncio.coroutine
+        def on_actuation_delta_request(self, electrode_states, duration_s=0,
+                                       full=False):
+            '''
+            XXX Coroutine XXX
+
+            Request actuation of electrodes according to *changes* in states
+            since the previous successful actuation.
+
+            Optional alternative to :meth:`on_actuation_request`; actuators
+            opt in by connecting to the ``on-actuation-delta-request`` step
+            signal *instead of* ``on-actuation-request``.
+
+            Parameters
+            ----------
+            electrode_states : pandas.Series
+                If :data:`full` is ``True``, electrodes to actuate (all other
+                electrodes are off).  Otherwise, ``True`` for each electrode
+                to turn on and ``False`` for each electrode to turn off.
+            duration_s : float, optional
+                Time to actuate before actuation is considered completed.
+            full : bool, optional
+                ``True`` for a full state resync, e.g., at the start of a step
+                or after an actuation error.
+
+            Returns
+            -------
+            actuated_electrodes : list
+                List of *all* currently actuated electrode IDs.
+
+
+            .. versionadded:: 2.36.0
+            '''
+            pass
+
     class IElectrodeMutator(Interface):
         '''
         Generate dynamic actuation state(s) for `IElectrodeController`.
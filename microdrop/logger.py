@@ -1,24 +1,172 @@
+import Queue
 import logging
 import logging.handlers
+import threading
+import timeit
 
 from plugin_manager import ILoggingPlugin
 import plugin_manager
 
+#: .. versionadded:: 2.36.0
+#:
+#: Logging plugin callback name for each log level.
+LEVEL_CALLBACKS = {logging.DEBUG: 'on_debug',
+                   logging.INFO: 'on_info',
+                   logging.WARNING: 'on_warning',
+                   logging.ERROR: 'on_error',
+                   logging.CRITICAL: 'on_critical'}
+
+
 class CustomHandler(logging.Handler):
-    def __init__(self):
+    '''
+    Dispatch log records to :class:`ILoggingPlugin` observers.
+
+    .. versionchanged:: 2.36.0
+        Queue records and dispatch them from a single background consumer
+        thread (in batches), rather than calling each observer
+        synchronously in the logging thread.  Records below :data:`level`
+        are filtered out *before* they are queued.
+
+        If the queue is full, records below ``WARNING`` are dropped
+        immediately, while higher-level records wait at most
+        :data:`block_timeout` seconds for space before being dropped, such
+        that logging never stalls the calling thread (e.g., during step
+        execution) indefinitely.
+
+    Parameters
+    ----------
+    level : int, optional
+        Minimum level of records to dispatch to logging plugins.
+    maxsize : int, optional
+        Maximum number of queued records.
+    batch_size : int, optional
+        Maximum number of records dispatched per batch.
+    block_timeout : float, optional
+        Maximum time (in seconds) to wait for space in a full queue for
+        ``WARNING`` (or higher level) records.
+
+    Attributes
+    ----------
+    dropped : int
+        Number of records dropped because the queue was full.
+    '''
+    def __init__(self, level=logging.INFO, maxsize=1000, batch_size=100,
+                 block_timeout=.05):
         # run the regular Handler __init__
-        logging.Handler.__init__(self)
+        logging.Handler.__init__(self, level=level)
+        self.batch_size = batch_size
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self._queue = Queue.Queue(maxsize=maxsize)
+        self._thread = threading.Thread(target=self._consume,
+                                        name='logging-plugins')
+        self._thread.daemon = True
+        self._thread.start()
 
     def emit(self, record):
-        if record.levelname == 'DEBUG':
-            plugin_manager.emit_signal('on_debug', [record], interface=ILoggingPlugin)
-        elif record.levelname == 'INFO':
-            plugin_manager.emit_signal('on_info', [record], interface=ILoggingPlugin)
-        elif record.levelname == 'WARNING':
-            plugin_manager.emit_signal('on_warning', [record], interface=ILoggingPlugin)
-        elif record.levelname == 'ERROR':
-            plugin_manager.emit_signal('on_error', [record], interface=ILoggingPlugin)
-        elif record.levelname == 'CRITICAL':
-            plugin_manager.emit_signal('on_critical', [record], interface=ILoggingPlugin)
+        '''
+        .. versionchanged:: 2.36.0
+            Queue record for dispatch from consumer thread.
+        '''
+        if record.thread == self._thread.ident:
+            # Record was logged while dispatching to a logging plugin.  Do not
+            # queue, since that may result in infinite recursion.
+            return
+        try:
+            # Format message in calling thread, since record arguments may be
+            # modified after logging call returns.
+            record.message = record.getMessage()
+            if record.levelno < logging.WARNING:
+                self._queue.put_nowait(record)
+            else:
+                self._queue.put(record, timeout=self.block_timeout)
+        except Queue.Full:
+            self.dropped += 1
+        except Exception:
+            self.handleError(record)
+
+    def flush(self, timeout=1.):
+        '''
+        Wait for queued records to be dispatched.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum time to wait (in seconds).
+
+        Returns
+        -------
+        bool
+            ``True`` if all queued records were dispatched before timeout.
+
+        .. versionadded:: 2.36.0
+        '''
+        deadline = timeit.default_timer() + timeout
+        # Wait on queue condition directly, rather than in a thread calling
+        # `Queue.join()` (which does not support a timeout).
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - timeit.default_timer()
+                if remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self):
+        '''
+        .. versionadded:: 2.36.0
+        '''
+        self.flush()
+        logging.Handler.close(self)
+
+    def _consume(self):
+        '''
+        Dispatch queued records to logging plugins in batches.
+
+        .. versionadded:: 2.36.0
+        '''
+        while True:
+            batch = [self._queue.get()]
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self._queue.get_nowait())
+            except Queue.Empty:
+                pass
+            try:
+                self._dispatch(batch)
+            finally:
+                for i in xrange(len(batch)):
+                    self._queue.task_done()
+
+    def _dispatch(self, records):
+        '''
+        Dispatch records to logging plugins, in order.
+
+        Observers and schedule for each callback are looked up once per
+        batch.
+
+        .. versionadded:: 2.36.0
+        '''
+        schedules = {}
+        for record in records:
+            function = LEVEL_CALLBACKS.get(record.levelno)
+            if function is None:
+                continue
+            if function not in schedules:
+                try:
+                    observers = plugin_manager.get_observers(function,
+                                                             ILoggingPlugin)
+                    schedules[function] = \
+                        [observers[name] for name in
+                         plugin_manager.get_schedule(observers, function)]
+                except Exception:
+                    schedules[function] = []
+            for observer in schedules[function]:
+                try:
+                    getattr(observer, function)(record)
+                except Exception:
+                    # Do not try to log, since that may result in infinite
+                    # recursion.  Instead, just continue onto the next plugin.
+                    continue
 
 logger = logging.getLogger()
@@ -35,28 +35,56 @@ def except_handler(*args, **kwargs):
     traceback.print_tb(args[2])
 
 
+#: Modules defining core singleton plugins, in import order.
+#:
+#: .. versionadded:: 2.36.0
+CORE_PLUGIN_MODULES = ['microdrop.core_plugins.zmq_hub_plugin',
+                       'microdrop.core_plugins.command_plugin',
+                       'microdrop.core_plugins.device_info_plugin',
+                       'microdrop.core_plugins.electrode_controller_plugin'
+                       '.pyutilib',
+                       'microdrop.core_plugins.prompt_plugin',
+                       'microdrop.gui.experiment_log_controller',
+                       'microdrop.gui.config_controller',
+                       'microdrop.gui.main_window_controller',
+                       'microdrop.gui.dmf_device_controller',
+                       'microdrop.core_plugins.protocol_controller',
+                       'microdrop.gui.protocol_grid_controller',
+                       'microdrop.gui.plugin_manager_controller',
+                       'microdrop.gui.app_options_controller']
+
+
 def initialize_core_plugins():
+    '''
+    .. versionchanged:: 2.36.0
+        Import modules listed in :data:`CORE_PLUGIN_MODULES` and record import
+        duration of each (see :data:`microdrop.plugin_manager.IMPORT_TIMES`).
+    '''
+    from .plugin_manager import import_module
+
     # These imports automatically load (and initialize) core singleton plugins.
-    from .core_plugins import zmq_hub_plugin
-    from .core_plugins import command_plugin
-    from .core_plugins import device_info_plugin
-    from .core_plugins.electrode_controller_plugin import pyutilib
-    from .core_plugins import prompt_plugin
-    from .gui import experiment_log_controller
-    from .gui import config_controller
-    from .gui import main_window_controller
-    from .gui import dmf_device_controller
-    from .core_plugins import protocol_controller
-    from .gui import protocol_grid_controller
-    from .gui import plugin_manager_controller
-    from .gui import app_options_controller
+    for module_name_i in CORE_PLUGIN_MODULES:
+        import_module(module_name_i)
 
 
 def main():
+    '''
+    .. versionchanged:: 2.36.0
+        Time import of core plugins and creation of application if
+        ``--profile-startup`` is specified (see
+        :mod:`microdrop.startup_profile`).
+    '''
     import logging
 
     import gtk
 
+    from .startup_profile import STARTUP_PROFILER, parse_args
+
+    profile_args = parse_args()
+    if profile_args.profile_startup:
+        STARTUP_PROFILER.start(cprofile=profile_args.profile_startup ==
+                               'cprofile')
+
     settings = gtk.settings_get_default()
     # Use a button ordering more consistent with Windows
     print 'Use a button ordering more consistent with Windows'
@@ -66,11 +94,13 @@ def main():
                         '%(message)s', datefmt=r'%Y-%m-%d %H:%M:%S',
                         level=logging.INFO)
 
-    initialize_core_plugins()
+    with STARTUP_PROFILER.phase('import core plugins'):
+        initialize_core_plugins()
 
     # XXX Import from `app` module automatically instantiates instance of `App`
     # class.
-    from app import App
+    with STARTUP_PROFILER.phase('create app'):
+        from app import App
     from app_context import get_app
 
     gtk.threads_init()
@@ -5,15 +5,23 @@ import threading
 
 from microdrop_utility import Version
 from logging_helpers import _L
+import gobject
 import path_helpers as ph
 import yaml
 
 from .app_context import get_app
 from .plugin_manager import (IPlugin, ExtensionPoint, emit_signal,
-                             get_service_instance_by_name)
+                             get_service_handle)
 
 logger = logging.getLogger(__name__)
 
+#: .. versionadded:: 2.36.0
+_PROTOCOL_CONTROLLER = get_service_handle('microdrop.gui.protocol_controller',
+                                          env='microdrop')
+#: .. versionadded:: 2.36.0
+_ZMQ_HUB_PLUGIN = get_service_handle('microdrop.zmq_hub_plugin',
+                                     env='microdrop')
+
 PluginMetaData = namedtuple('PluginMetaData',
                             'package_name plugin_name version')
 PluginMetaData.as_dict = lambda self: dict([(k, str(v))
@@ -65,6 +73,10 @@ class AppDataController(object):
     def on_plugin_enable(self):
         """
         Handler called once the plugin instance has been enabled.
+
+        .. versionchanged:: 2.36.0
+            Add missing config section through
+            :meth:`microdrop.config.Config.update_section` (thread-safe).
         """
         app = get_app()
         defaults = self.get_default_app_options()
@@ -80,7 +92,8 @@ class AppDataController(object):
         app.set_data(self.name, data)
 
         if not self.name in app.config.data:
-            app.config.data[self.name] = self.get_app_values()
+            app.config.update_section(self.name, self.get_app_values(),
+                                      mark_dirty=False)
 
     ###########################################################################
     # Accessor methods
@@ -207,10 +220,12 @@ class StepOptionsController(object):
 
         This should maintain backwards compatibility while simplifying the
         addition of arbitrary Python data types as step options.
+
+
+        .. versionchanged:: 2.36.0
+            Use cached service handle to look up protocol controller.
         '''
-        protocol_controller =\
-            get_service_instance_by_name('microdrop.gui.protocol_controller',
-                                         env='microdrop')
+        protocol_controller = _PROTOCOL_CONTROLLER.service
         if step_number is None:
             step_number = protocol_controller.protocol_state['step_number']
         _L().debug('set_step[%d]: values_dict=%s', step_number, values_dict)
@@ -229,8 +244,107 @@ class StepOptionsController(object):
             app = get_app()
             step = app.protocol.steps[step_number]
             step.set_data(self.name, values)
+            with self._step_options_changed_lock:
+                # Step options changed signal is emitted below, so there is no
+                # need to emit any pending coalesced signal for this step.
+                self._step_options_changed_pending.discard(step_number)
+            emit_signal('on_step_options_changed', [self.name, step_number],
+                        interface=IPlugin)
+
+    def set_step_value(self, name, value, step_number=None):
+        '''
+        Set a single step option value.
+
+        Unlike :meth:`set_step_values`, only the specified field is validated
+        (if it is listed in ``StepFields``) and the value is updated in place.
+
+        The ``on_step_options_changed`` signal is emitted in the main (i.e.,
+        GTK) thread at most once per :attr:`step_options_changed_interval_ms`
+        for each step, i.e., rapid successive changes are coalesced.
+
+        May be called from any thread.
+
+        Parameters
+        ----------
+        name : str
+            Step option name.
+        value : object
+            Step option value.
+        step_number : int, optional
+            Step number.  If ``None``, set value for active step.
+
+        Raises
+        ------
+        ValueError
+            If value is not valid for the corresponding ``StepFields`` field.
+
+
+        .. versionadded:: 2.36.0
+        '''
+        app = get_app()
+        if step_number is None:
+            step_number = app.protocol_controller.protocol_state['step_number']
+        form_class = self.get_step_form_class()
+        if form_class is not None and name in form_class.field_schema_mapping:
+            element = form_class.field_schema_mapping[name](value)
+            if not element.validate():
+                raise ValueError('Invalid value: %s=%s (%s)' %
+                                 (name, value, element.errors))
+            if element.value is not None:
+                value = element.value
+        options = self.get_step_options(step_number)
+        options[name] = value
+        self._schedule_step_options_changed(step_number)
+
+    # Minimum interval between coalesced `on_step_options_changed` signals
+    # (~one frame at 60 Hz).
+    step_options_changed_interval_ms = 16
+
+    @property
+    def _step_options_changed_lock(self):
+        if '_step_options_lock' not in self.__dict__:
+            # Note: `dict.setdefault` is atomic.
+            self.__dict__.setdefault('_step_options_lock', threading.Lock())
+        return self.__dict__['_step_options_lock']
+
+    @property
+    def _step_options_changed_pending(self):
+        return self.__dict__.setdefault('_step_options_pending', set())
+
+    def _schedule_step_options_changed(self, step_number):
+        '''
+        Schedule coalesced ``on_step_options_changed`` signal for step.
+
+        .. versionadded:: 2.36.0
+        '''
+        with self._step_options_changed_lock:
+            schedule = not self._step_options_changed_pending
+            self._step_options_changed_pending.add(step_number)
+        if schedule:
+            gobject.timeout_add(self.step_options_changed_interval_ms,
+                                self._emit_step_options_changed)
+
+    def _emit_step_options_changed(self):
+        '''
+        Emit ``on_step_options_changed`` signal for each step with pending
+        changes.
+
+        Returns
+        -------
+        bool
+            ``False`` (i.e., do not repeat :func:`gobject.timeout_add`
+            callback).
+
+
+        .. versionadded:: 2.36.0
+        '''
+        with self._step_options_changed_lock:
+            step_numbers = sorted(self._step_options_changed_pending)
+            self._step_options_changed_pending.clear()
+        for step_number in step_numbers:
             emit_signal('on_step_options_changed', [self.name, step_number],
                         interface=IPlugin)
+        return False
 
     def get_step_options(self, step_number=None):
         app = get_app()
@@ -254,9 +368,11 @@ def _hub_method(method_name, *args, **kwargs):
 
 
     .. versionadded:: 2.25
+
+    .. versionchanged:: 2.36.0
+        Use cached service handle to look up hub plugin.
     '''
-    plugin = get_service_instance_by_name('microdrop.zmq_hub_plugin',
-                                          env='microdrop')
+    plugin = _ZMQ_HUB_PLUGIN.service
 
     done = threading.Event()
 
@@ -302,3 +418,33 @@ def hub_execute(*args, **kwargs):
         message = 'hub_execute(args=`%s`, kwargs=`%s`)' % (args, kwargs)
         map(logger.debug, message.splitlines())
     return _hub_method('execute', *args, **kwargs)
+
+
+def hub_execute_packed(target, command, **kwargs):
+    '''
+    Execute hub command with request data packed using ``msgpack`` (see
+    :mod:`microdrop.hub_codec`), such that handlers supporting packed data
+    (see :func:`microdrop.hub_codec.msgpack_reply`) reply with packed data.
+
+    Falls back to the default encoding if ``msgpack`` is not installed.
+
+    Parameters
+    ----------
+    target : str
+        Target plugin name.
+    command : str
+        Command name.
+    **kwargs
+        Command arguments.
+
+    Returns
+    -------
+    object
+        Decoded reply data.
+
+
+    .. versionadded:: 2.36.0
+    '''
+    from .hub_codec import decode_data, packed_kwargs
+
+    return decode_data(hub_execute(target, command, **packed_kwargs(**kwargs)))
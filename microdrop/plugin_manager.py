@@ -1,9 +1,13 @@
 from StringIO import StringIO
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 from contextlib import closing
+import concurrent.futures
+import functools as ft
+import importlib
 import logging
 import pprint
 import sys
+import timeit
 import traceback
 
 from pyutilib.component.core import ExtensionPoint, PluginGlobals
@@ -23,7 +27,147 @@ logger = logging.getLogger(__name__)
 ScheduleRequest = namedtuple('ScheduleRequest', 'before after')
 
 
-def load_plugins(plugins_dir='plugins', import_from_parent=True):
+#: Plugin found by :func:`load_plugins`, but not imported.
+#:
+#: .. versionadded:: 2.36.0
+DeferredPlugin = namedtuple('DeferredPlugin', 'package_path plugins_dir '
+                            'import_from_parent plugin_info')
+
+#: Plugins deferred by :func:`load_plugins`, indexed by plugin directory
+#: name.
+#:
+#: .. versionadded:: 2.36.0
+_DEFERRED_PLUGINS = OrderedDict()
+
+#: Import duration (in seconds) of each module imported using
+#: :func:`import_module`, in import order.
+#:
+#: .. versionadded:: 2.36.0
+IMPORT_TIMES = OrderedDict()
+
+
+def import_module(module_name):
+    '''
+    Import module and record import duration to :data:`IMPORT_TIMES`.
+
+    Parameters
+    ----------
+    module_name : str
+        Fully qualified module name.
+
+    Returns
+    -------
+    module
+        Imported module.
+
+
+    .. versionadded:: 2.36.0
+    '''
+    start = timeit.default_timer()
+    module = importlib.import_module(module_name)
+    IMPORT_TIMES[module_name] = timeit.default_timer() - start
+    return module
+
+
+def get_plugin_module_name(plugin_root):
+    '''
+    Get importable Python module name of plugin from plugin properties
+    metadata **without importing the plugin**.
+
+    Parameters
+    ----------
+    plugin_root : str
+        Path to plugin directory.
+
+    Returns
+    -------
+    (str, namedtuple)
+        Plugin module name and plugin metadata (see
+        :func:`microdrop.plugin_helpers.get_plugin_info`).  If plugin has no
+        metadata, module name is the name of the plugin directory and
+        metadata is ``None``.
+
+
+    .. versionadded:: 2.36.0
+    '''
+    # Import here to avoid circular import.
+    from .plugin_helpers import get_plugin_info
+
+    plugin_root = ph.path(plugin_root)
+    try:
+        plugin_info = get_plugin_info(plugin_root)
+    except Exception:
+        _L().debug('Error reading `%s` plugin metadata.', plugin_root.name,
+                   exc_info=True)
+        plugin_info = None
+    if plugin_info is None:
+        return plugin_root.name, None
+    # XXX Plugins are currently Python modules, but Conda package name
+    # conventions may include `.` and `-` characters.
+    module_name = plugin_info.package_name.split('.')[-1].replace('-', '_')
+    return module_name, plugin_info
+
+
+def _import_plugins(packages):
+    '''
+    Import plugin packages and create a disabled service instance of each
+    newly imported plugin class.
+
+    Parameters
+    ----------
+    packages : list[tuple]
+        List of ``(package_path, plugins_dir, import_from_parent)`` tuples.
+
+    Returns
+    -------
+    list
+        Newly created plugins.
+
+
+    .. versionadded:: 2.36.0
+        Refactored from :func:`load_plugins`.
+    '''
+    logger = _L()  # use logger with function context
+    e = PluginGlobals.env('microdrop.managed')
+    initial_plugins = set(e.plugin_registry.values())
+    imported_plugins = set()
+
+    for package_i, plugins_dir, import_from_parent in packages:
+        try:
+            plugin_module = package_i.name
+            if package_i.joinpath('pyutilib.py').isfile():
+                plugin_module = '.'.join([plugin_module, 'pyutilib'])
+            if import_from_parent:
+                plugin_module = '.'.join([plugins_dir.name, plugin_module])
+            logger.debug('import %s', plugin_module)
+            import_module(plugin_module)
+            all_plugins = set(e.plugin_registry.values())
+            current_plugin = list(all_plugins - initial_plugins -
+                                  imported_plugins)[0]
+            logger.info('\t Imported: %s (%s, %.3f s)',
+                        current_plugin.__name__, package_i,
+                        IMPORT_TIMES[plugin_module])
+            imported_plugins.add(current_plugin)
+        except Exception:
+            map(logger.info, traceback.format_exc().splitlines())
+            logger.error('Error loading %s plugin.', package_i.name,
+                         exc_info=True)
+
+    # For each newly imported plugin class, create a service instance
+    # initialized to the disabled state.
+    new_plugins = []
+    for class_ in imported_plugins:
+        service = class_()
+        service.disable()
+        new_plugins.append(service)
+    update_service_index('microdrop.managed')
+    logger.debug('\t Created new plugin services: %s',
+                 ','.join([p.__class__.__name__ for p in new_plugins]))
+    return new_plugins
+
+
+def load_plugins(plugins_dir='plugins', import_from_parent=True,
+                 enabled=None):
     '''
     Import each Python plugin module in the specified directory and create an
     instance of each contained plugin class for which an instance has not yet
@@ -40,6 +184,14 @@ def load_plugins(plugins_dir='plugins', import_from_parent=True):
         ..notes::
             **Not recommended**, but kept as default to maintain legacy
             protocol compatibility.
+    enabled : list[str], optional
+        Module names of plugins to import (e.g.,
+        ``config['plugins']['enabled']``).  Other plugins are **not**
+        imported until :func:`load_deferred_plugins` is called (e.g., by the
+        plugin manager dialog).  Module names are read from plugin properties
+        metadata (see :func:`get_plugin_module_name`).
+
+        By default, import all plugins.
 
     Returns
     -------
@@ -53,6 +205,13 @@ def load_plugins(plugins_dir='plugins', import_from_parent=True):
 
     .. versionchanged:: 2.30
         Import from `pyutilib` submodule in plugin instead, if it exists.
+
+    .. versionchanged:: 2.36.0
+        Update service index (see :func:`get_service_index`).
+
+    .. versionchanged:: 2.36.0
+        Add :data:`enabled` parameter.  Record import duration of each plugin
+        to :data:`IMPORT_TIMES`.
     '''
     logger = _L()  # use logger with function context
     logger.info('plugins_dir=`%s`', plugins_dir)
@@ -62,10 +221,9 @@ def load_plugins(plugins_dir='plugins', import_from_parent=True):
     if plugins_root not in sys.path:
         sys.path.insert(0, plugins_root)
 
-    # Create an instance of each of the plugins, but set it to disabled
     e = PluginGlobals.env('microdrop.managed')
     initial_plugins = set(e.plugin_registry.values())
-    imported_plugins = set()
+    packages = []
 
     for package_i in plugins_dir.dirs():
         if package_i.isjunction() and not package_i.readlink().isdir():
@@ -85,36 +243,83 @@ def load_plugins(plugins_dir='plugins', import_from_parent=True):
                         package_i.name)
             continue
 
-        try:
-            plugin_module = package_i.name
-            if package_i.joinpath('pyutilib.py').isfile():
-                plugin_module = '.'.join([plugin_module, 'pyutilib'])
-            if import_from_parent:
-                plugin_module = '.'.join([plugins_dir.name, plugin_module])
-            import_statement = 'import {}'.format(plugin_module)
-            logger.debug(import_statement)
-            exec(import_statement)
-            all_plugins = set(e.plugin_registry.values())
-            current_plugin = list(all_plugins - initial_plugins -
-                                  imported_plugins)[0]
-            logger.info('\t Imported: %s (%s)', current_plugin.__name__,
-                        package_i)
-            imported_plugins.add(current_plugin)
-        except Exception:
-            map(logger.info, traceback.format_exc().splitlines())
-            logger.error('Error loading %s plugin.', package_i.name,
-                         exc_info=True)
+        if enabled is not None:
+            module_name, plugin_info = get_plugin_module_name(package_i)
+            if module_name not in enabled and package_i.name not in enabled:
+                # Plugin is not enabled.  Defer import.
+                logger.info('\t Deferred: %s (%s)', module_name, package_i)
+                _DEFERRED_PLUGINS[package_i.name] = \
+                    DeferredPlugin(package_i, plugins_dir, import_from_parent,
+                                   plugin_info)
+                continue
+        _DEFERRED_PLUGINS.pop(package_i.name, None)
+        packages.append((package_i, plugins_dir, import_from_parent))
 
-    # For each newly imported plugin class, create a service instance
-    # initialized to the disabled state.
-    new_plugins = []
-    for class_ in imported_plugins:
-        service = class_()
-        service.disable()
-        new_plugins.append(service)
-    logger.debug('\t Created new plugin services: %s',
-                 ','.join([p.__class__.__name__ for p in new_plugins]))
-    return new_plugins
+    # Create an instance of each of the plugins, but set it to disabled
+    return _import_plugins(packages)
+
+
+def get_deferred_plugins():
+    '''
+    Returns
+    -------
+    OrderedDict
+        Plugins found by :func:`load_plugins` but not yet imported, as
+        :data:`DeferredPlugin` tuples indexed by plugin directory name.
+
+
+    .. versionadded:: 2.36.0
+    '''
+    return _DEFERRED_PLUGINS.copy()
+
+
+def get_deferred_plugin_names():
+    '''
+    Returns
+    -------
+    list[str]
+        Plugin names (according to plugin properties metadata, e.g.,
+        ``['dmf_control_board_plugin', ...]``) of plugins found by
+        :func:`load_plugins` but not yet imported.
+
+
+    .. versionadded:: 2.36.0
+    '''
+    return [plugin_i.plugin_info.plugin_name
+            for plugin_i in _DEFERRED_PLUGINS.values()
+            if plugin_i.plugin_info is not None]
+
+
+def load_deferred_plugins(names=None):
+    '''
+    Import plugins deferred by :func:`load_plugins` and create a disabled
+    service instance of each plugin.
+
+    Parameters
+    ----------
+    names : list[str], optional
+        Plugin directory names of deferred plugins to import.  By default,
+        import all deferred plugins.
+
+    Returns
+    -------
+    list
+        Newly created plugins.
+
+
+    .. versionadded:: 2.36.0
+    '''
+    if names is None:
+        names = list(_DEFERRED_PLUGINS.keys())
+    packages = []
+    for name_i in names:
+        plugin_i = _DEFERRED_PLUGINS.pop(name_i)
+        packages.append((plugin_i.package_path, plugin_i.plugins_dir,
+                         plugin_i.import_from_parent))
+    if not packages:
+        return []
+    _L().info('Loading deferred plugins:')
+    return _import_plugins(packages)
 
 
 def log_summary():
@@ -154,6 +359,183 @@ def get_plugin_names(env=None):
     return list(e.plugin_registry.keys())
 
 
+class ServiceIndex(object):
+    '''
+    Index of plugin service instances registered in a ``pyutilib`` plugin
+    environment, keyed by plugin name, plugin package name, and plugin class.
+
+    The index is rebuilt by :meth:`update` (called on plugin load, enable, and
+    disable), or on lookup if the number of registered services has changed
+    since the last update (e.g., a plugin class was defined on import).
+
+    Attributes
+    ----------
+    version : int
+        Incremented each time the index is rebuilt.
+
+
+    .. versionadded:: 2.36.0
+    '''
+    def __init__(self, env):
+        self.env = env
+        self.version = 0
+        self.by_name = {}
+        self.by_package_name = {}
+        self.by_class = {}
+        self._service_count = None
+        self._handles = {}
+
+    def update(self):
+        '''
+        Rebuild index from services registered in plugin environment.
+        '''
+        services = list(PluginGlobals.env(self.env).services)
+        by_name = {}
+        by_package_name = {}
+        by_class = {}
+        for service in services:
+            name = getattr(service, 'name', None)
+            if name is not None:
+                by_name.setdefault(name, service)
+            module_name = service.__class__.__module__.split('.')[0]
+            by_package_name.setdefault(get_plugin_package_name(module_name),
+                                       service)
+            by_class.setdefault(service.__class__, service)
+        self.by_name = by_name
+        self.by_package_name = by_package_name
+        self.by_class = by_class
+        self._service_count = len(services)
+        self.version += 1
+
+    def refresh(self):
+        '''
+        Rebuild index if the number of registered services has changed.
+
+        Returns
+        -------
+        ServiceIndex
+            This index.
+        '''
+        if len(PluginGlobals.env(self.env).services) != self._service_count:
+            self.update()
+        return self
+
+    def handle(self, name):
+        '''
+        Returns
+        -------
+        ServiceHandle
+            Cached handle for service with specified plugin name.
+        '''
+        if name not in self._handles:
+            self._handles[name] = ServiceHandle(self, name)
+        return self._handles[name]
+
+
+class ServiceHandle(object):
+    '''
+    Handle to a plugin service instance, looked up by plugin name.
+
+    Handles may be safely cached by callers; the service instance is only
+    looked up again after the corresponding :class:`ServiceIndex` has been
+    rebuilt.
+
+    Example
+    -------
+
+    >>> handle = get_service_handle('microdrop.zmq_hub_plugin',
+    ...                             env='microdrop')
+    >>> handle.service.hub_uri
+
+
+    .. versionadded:: 2.36.0
+    '''
+    __slots__ = ('index', 'name', '_service', '_version')
+
+    def __init__(self, index, name):
+        self.index = index
+        self.name = name
+        self._service = None
+        self._version = None
+
+    @property
+    def service(self):
+        '''
+        Raises
+        ------
+        KeyError
+            If no plugin is found registered with the handle name.
+        '''
+        index = self.index.refresh()
+        if self._version != index.version:
+            if self.name not in index.by_name:
+                raise KeyError('No plugin registered with name: %s' %
+                               self.name)
+            self._service = index.by_name[self.name]
+            self._version = index.version
+        return self._service
+
+    def __repr__(self):
+        return '<ServiceHandle name=%r env=%r>' % (self.name, self.index.env)
+
+
+#: .. versionadded:: 2.36.0
+_SERVICE_INDEXES = {}
+
+
+def get_service_index(env='microdrop.managed'):
+    '''
+    Parameters
+    ----------
+    env : str, optional
+        Name of ``pyutilib.component.core`` plugin environment (e.g.,
+        ``'microdrop.managed``').
+
+    Returns
+    -------
+    ServiceIndex
+        Up-to-date service index for plugin environment.
+
+
+    .. versionadded:: 2.36.0
+    '''
+    if env not in _SERVICE_INDEXES:
+        _SERVICE_INDEXES[env] = ServiceIndex(env)
+    return _SERVICE_INDEXES[env].refresh()
+
+
+def update_service_index(env='microdrop.managed'):
+    '''
+    Rebuild service index for plugin environment.
+
+    .. versionadded:: 2.36.0
+    '''
+    if env not in _SERVICE_INDEXES:
+        _SERVICE_INDEXES[env] = ServiceIndex(env)
+    _SERVICE_INDEXES[env].update()
+
+
+def get_service_handle(name, env='microdrop.managed'):
+    '''
+    Parameters
+    ----------
+    name : str
+        Plugin name (e.g., ``microdrop.zmq_hub_plugin``).
+    env : str, optional
+        Name of ``pyutilib.component.core`` plugin environment (e.g.,
+        ``'microdrop.managed``').
+
+    Returns
+    -------
+    ServiceHandle
+        Cacheable handle to service instance with specified plugin name.
+
+
+    .. versionadded:: 2.36.0
+    '''
+    return get_service_index(env).handle(name)
+
+
 def get_service_class(name, env='microdrop.managed'):
     '''
     Parameters
@@ -200,11 +582,14 @@ def get_service_instance_by_name(name, env='microdrop.managed'):
     ------
     KeyError
         If no plugin is found registered with the specified name.
+
+
+    .. versionchanged:: 2.36.0
+        Look up service using service index (see :func:`get_service_index`).
     '''
-    e = PluginGlobals.env(env)
-    plugins = [p for i, p in enumerate(e.services) if name == p.name]
-    if plugins:
-        return plugins[0]
+    index = get_service_index(env)
+    if name in index.by_name:
+        return index.by_name[name]
     else:
         raise KeyError('No plugin registered with name: %s' % name)
 
@@ -225,13 +610,14 @@ def get_service_instance_by_package_name(name, env='microdrop.managed'):
     -------
     object
         Active service instance matching specified plugin module name.
+
+
+    .. versionchanged:: 2.36.0
+        Look up service using service index (see :func:`get_service_index`).
     '''
-    e = PluginGlobals.env(env)
-    plugins = [p for i, p in enumerate(e.services)
-               if name ==
-               get_plugin_package_name(p.__class__.__module__.split('.')[0])]
-    if plugins:
-        return plugins[0]
+    index = get_service_index(env)
+    if name in index.by_package_name:
+        return index.by_package_name[name]
     else:
         raise KeyError('No plugin registered with package name: %s' % name)
 
@@ -269,7 +655,16 @@ def get_service_instance(class_, env='microdrop.managed'):
 
         Returns ``None`` if no service is registered for the specified plugin
         class type.
+
+
+    .. versionchanged:: 2.36.0
+        Look up service by exact class using service index (see
+        :func:`get_service_index`) before falling back to scanning services
+        for an instance of a subclass.
     '''
+    index = get_service_index(env)
+    if class_ in index.by_class:
+        return index.by_class[class_]
     e = PluginGlobals.env(env)
     for service in e.services:
         if isinstance(service, class_):
@@ -371,7 +766,7 @@ def get_observers(function, interface=IPlugin):
     return observers
 
 
-def emit_signal(function, args=None, interface=IPlugin):
+def emit_signal(function, args=None, interface=IPlugin, observers=None):
     '''
     Call specified function on each enabled plugin implementing the function
     and collect results.
@@ -382,6 +777,11 @@ def emit_signal(function, args=None, interface=IPlugin):
         Name of function to generate schedule for.
     interface : class, optional
         Plugin interface class.
+    observers : dict, optional
+        Mapping from service names to service instances to call.
+
+        By default, all enabled plugins implementing :data:`function` are
+        called.
 
     Returns
     -------
@@ -391,6 +791,9 @@ def emit_signal(function, args=None, interface=IPlugin):
 
     .. versionchanged:: 2.20
         Log caller at info level, and log args and observers at debug level.
+
+    .. versionchanged:: 2.36.0
+        Add :data:`observers` parameter.
     '''
     logger = _L()  # use logger with function context
     i = 0
@@ -401,7 +804,8 @@ def emit_signal(function, args=None, interface=IPlugin):
         caller = caller_name(skip=i)
 
     try:
-        observers = get_observers(function, interface)
+        if observers is None:
+            observers = get_observers(function, interface)
         schedule = get_schedule(observers, function)
 
         return_codes = {}
@@ -441,6 +845,205 @@ def emit_signal(function, args=None, interface=IPlugin):
         return {}
 
 
+def get_schedule_graph(observers, function):
+    '''
+    Get dependency graph of scheduling requests for specified function.
+
+    Parameters
+    ----------
+    observers : dict
+        Mapping from service names to service instances.
+    function : str
+        Name of function to generate dependency graph for.
+
+    Returns
+    -------
+    dict
+        Mapping from each observer service name to the set of names of
+        observers that must be called **before** the observer.  Requests
+        involving services not in :data:`observers` are ignored.
+
+
+    .. versionadded:: 2.36.0
+    '''
+    dependencies = {name: set() for name in observers}
+    for name, observer in observers.items():
+        if hasattr(observer, 'get_schedule_requests'):
+            for before, after in observer.get_schedule_requests(function):
+                if (before != after and before in dependencies and after in
+                        dependencies):
+                    dependencies[after].add(before)
+    return dependencies
+
+
+def emit_signal_concurrent(function, args=None, interface=IPlugin,
+                           observers=None, max_workers=None, durations=None):
+    '''
+    Call specified function on each enabled plugin implementing the function,
+    calling functions of plugins that do not depend on each other (according
+    to scheduling requests; see :func:`get_schedule_graph`) concurrently.
+
+    The function is only called in a background thread for plugins listing
+    the function name in a ``threadsafe_callbacks`` attribute.  Otherwise
+    (e.g., for GTK-bound plugins), the function is called in the calling
+    (i.e., main) thread, while any thread-safe calls continue in the
+    background.
+
+    If scheduling requests contain a cycle, remaining functions are called
+    serially, in service name order.
+
+    Parameters
+    ----------
+    function : str
+        Name of function to call.
+    args : list, optional
+        Function arguments.
+    interface : class, optional
+        Plugin interface class.
+    observers : dict, optional
+        Mapping from service names to service instances to call.
+
+        By default, all enabled plugins implementing :data:`function` are
+        called.
+    max_workers : int, optional
+        Maximum number of background threads.  By default, use one thread per
+        thread-safe observer.
+    durations : dict, optional
+        If specified, set duration (in seconds) of each function call, indexed
+        by service name.
+
+    Returns
+    -------
+    dict
+        Mapping from each service name to the respective function return value.
+
+
+    .. versionadded:: 2.36.0
+    '''
+    logger = _L()  # use logger with function context
+
+    if observers is None:
+        observers = get_observers(function, interface)
+    if args is None:
+        args = []
+    elif not isinstance(args, list):
+        args = [args]
+
+    # Use serial schedule order to call ready observers in a consistent order.
+    # Note that `get_schedule()` returns `None` if scheduling requests cannot
+    # be satisfied (e.g., contain a cycle).
+    order = get_schedule(observers, function) or sorted(observers)
+    dependencies = get_schedule_graph(observers, function)
+    threadsafe = set(name for name, observer in observers.items()
+                     if function in getattr(observer, 'threadsafe_callbacks',
+                                            ()))
+    return_codes = {}
+
+    def _call(name):
+        logger.debug('  call: %s.%s(...)', name, function)
+        start = timeit.default_timer()
+        try:
+            return getattr(observers[name], function)(*args)
+        finally:
+            if durations is not None:
+                durations[name] = timeit.default_timer() - start
+
+    def _completed(name, call):
+        try:
+            return_codes[name] = call()
+        except Exception:
+            logger.error('%s plugin crashed processing %s signal.', name,
+                         function, exc_info=True)
+        for dependencies_i in dependencies.values():
+            dependencies_i.discard(name)
+
+    if not threadsafe:
+        max_workers = 1
+    elif max_workers is None:
+        max_workers = len(threadsafe)
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+    futures = {}
+    try:
+        while dependencies or futures:
+            ready = [name for name in order
+                     if name in dependencies and not dependencies[name]]
+            main_thread_ready = []
+            for name in ready:
+                del dependencies[name]
+                if name in threadsafe:
+                    futures[executor.submit(_call, name)] = name
+                else:
+                    main_thread_ready.append(name)
+            if main_thread_ready:
+                # Call (e.g., GTK-bound) functions in calling thread while
+                # thread-safe calls continue in background.
+                for name in main_thread_ready:
+                    _completed(name, ft.partial(_call, name))
+                continue
+            elif not futures:
+                # No observer is ready or running, so remaining dependencies
+                # must contain a cycle.
+                logger.warning('Cyclic schedule requests for `%s`; calling '
+                               'remaining plugins serially: %s', function,
+                               sorted(dependencies))
+                for name in [n for n in order if n in dependencies]:
+                    _completed(name, ft.partial(_call, name))
+                break
+            done, _ = concurrent.futures.wait(futures,
+                                              return_when=concurrent.futures
+                                              .FIRST_COMPLETED)
+            for future in done:
+                _completed(futures.pop(future), future.result)
+    finally:
+        executor.shutdown(wait=True)
+    return return_codes
+
+
+def emit_batch_signal(function, args, compat_function, compat_args,
+                      interface=IPlugin):
+    '''
+    Emit a batched signal, e.g., ``on_steps_inserted``, to each plugin
+    implementing it.
+
+    Plugins that *only* implement the corresponding per-item compatibility
+    signal (e.g., ``on_step_created``) receive one compatibility signal for
+    each item in :data:`compat_args` instead.
+
+    Parameters
+    ----------
+    function : str
+        Name of batched signal function.
+    args : list
+        Arguments for batched signal.
+    compat_function : str
+        Name of per-item compatibility signal function.
+    compat_args : list
+        List of argument lists, one per compatibility signal to emit.
+    interface : class, optional
+        Plugin interface class.
+
+    Returns
+    -------
+    dict
+        Mapping from each service name to the respective batched function
+        return value.
+
+
+    .. versionadded:: 2.36.0
+    '''
+    return_codes = emit_signal(function, args=args, interface=interface)
+
+    batch_observers = get_observers(function, interface)
+    compat_observers = dict([(name, observer) for name, observer in
+                             get_observers(compat_function, interface)
+                             .iteritems() if name not in batch_observers])
+    if compat_observers:
+        for args_i in compat_args:
+            emit_signal(compat_function, args=args_i, interface=interface,
+                        observers=compat_observers)
+    return return_codes
+
+
 def enable(name, env='microdrop.managed'):
     '''
     Enable specified plugin.
@@ -454,16 +1057,61 @@ def enable(name, env='microdrop.managed'):
     env : str, optional
         Name of ``pyutilib.component.core`` plugin environment (e.g.,
         ``'microdrop.managed``').
+
+
+    .. versionchanged:: 2.36.0
+        Update service index (see :func:`get_service_index`).
     '''
     service = get_service_instance_by_name(name, env)
     if not service.enabled():
         service.enable()
+        update_service_index(env)
         _L().info('[PluginManager] Enabled plugin: %s', name)
     if hasattr(service, "on_plugin_enable"):
         service.on_plugin_enable()
     emit_signal('on_plugin_enabled', [env, service])
 
 
+def enable_all(names, env='microdrop.managed', max_workers=None,
+               durations=None):
+    '''
+    Enable specified plugins, calling ``on_plugin_enable`` of plugins that do
+    not depend on each other concurrently (see
+    :func:`emit_signal_concurrent`).
+
+    Parameters
+    ----------
+    names : list[str]
+        Plugin names (e.g., ``microdrop.zmq_hub_plugin``).
+    env : str, optional
+        Name of ``pyutilib.component.core`` plugin environment (e.g.,
+        ``'microdrop.managed``').
+    max_workers : int, optional
+        Maximum number of background threads.
+    durations : dict, optional
+        If specified, set duration (in seconds) of each ``on_plugin_enable``
+        call, indexed by plugin name.
+
+
+    .. versionadded:: 2.36.0
+    '''
+    services = OrderedDict((name, get_service_instance_by_name(name, env))
+                           for name in names)
+    for name, service in services.items():
+        if not service.enabled():
+            service.enable()
+            _L().info('[PluginManager] Enabled plugin: %s', name)
+    update_service_index(env)
+    emit_signal_concurrent('on_plugin_enable',
+                           observers={name: service for name, service in
+                                      services.items()
+                                      if hasattr(service,
+                                                 'on_plugin_enable')},
+                           max_workers=max_workers, durations=durations)
+    for service in services.values():
+        emit_signal('on_plugin_enabled', [env, service])
+
+
 def disable(name, env='microdrop.managed'):
     '''
     Disable specified plugin.
@@ -477,10 +1125,15 @@ def disable(name, env='microdrop.managed'):
     env : str, optional
         Name of ``pyutilib.component.core`` plugin environment (e.g.,
         ``'microdrop.managed``').
+
+
+    .. versionchanged:: 2.36.0
+        Update service index (see :func:`get_service_index`).
     '''
     service = get_service_instance_by_name(name, env)
     if service and service.enabled():
         service.disable()
+        update_service_index(env)
         if hasattr(service, "on_plugin_disable"):
             service.on_plugin_disable()
         emit_signal('on_plugin_disabled', [env, service])
@@ -16,13 +16,14 @@ import types
 
 from microdrop_utility import Version, FutureVersionError
 import jsonschema
+import numpy as np
 import pandas as pd
 import path_helpers as ph
 import yaml
 import zmq_plugin as zp
 import zmq_plugin.schema
 
-from .plugin_manager import emit_signal
+from .plugin_manager import emit_signal, emit_batch_signal
 from logging_helpers import _L, caller_name  #: .. versionadded:: 2.20
 
 
@@ -267,6 +268,102 @@ def _plugin_data_from_dict(plugin_data_dict):
     return result
 
 
+class FrozenDict(dict):
+    '''
+    Read-only dictionary.
+
+    Any attempt to modify the dictionary raises a :class:`TypeError`.  Use
+    :meth:`copy` to get a (shallow) mutable copy.
+
+
+    .. versionadded:: 2.36.0
+    '''
+    def _read_only(self, *args, **kwargs):
+        raise TypeError('%s is read-only.' % self.__class__.__name__)
+
+    __setitem__ = __delitem__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def copy(self):
+        '''
+        Returns
+        -------
+        dict
+            Mutable shallow copy.
+        '''
+        return dict(self)
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self), ))
+
+    def __repr__(self):
+        return '%s(%s)' % (self.__class__.__name__, dict.__repr__(self))
+
+
+def freeze(obj):
+    '''
+    Create a read-only view of an object **without copying data**.
+
+     - :class:`dict` objects are converted to :class:`FrozenDict`.
+     - :class:`list` objects are converted to :class:`tuple`.
+     - :class:`numpy.ndarray`, :class:`pandas.Series`, and
+       :class:`pandas.DataFrame` objects are wrapped as read-only views,
+       sharing memory with the original object.  Data of extension types
+       (e.g., time zone aware or categorical values) cannot be marked as
+       read-only and is **copied** instead.
+     - Any other objects are returned as is.
+
+    Parameters
+    ----------
+    obj : object
+        Object to freeze.
+
+    Returns
+    -------
+    object
+        Read-only view of :data:`obj`.
+
+
+    .. versionadded:: 2.36.0
+
+    .. versionchanged:: 2.36.0
+        Freeze data frame columns of each dtype separately (i.e., do not
+        cast mixed dtypes to ``object``) and copy extension type data (e.g.,
+        time zone aware series), rather than discarding the type.
+    '''
+    if isinstance(obj, FrozenDict):
+        return obj
+    elif isinstance(obj, dict):
+        return FrozenDict((k, freeze(v)) for k, v in obj.iteritems())
+    elif isinstance(obj, (list, tuple)):
+        return tuple(freeze(v) for v in obj)
+    elif isinstance(obj, np.ndarray):
+        # Set flag on a new view to leave original array writeable.
+        view = obj.view()
+        view.flags.writeable = False
+        return view
+    elif isinstance(obj, pd.Series):
+        if not isinstance(obj.dtype, np.dtype):
+            # Extension type, e.g., time zone aware datetimes.
+            return obj.copy()
+        return pd.Series(freeze(obj.values), index=obj.index, name=obj.name,
+                         copy=False)
+    elif isinstance(obj, pd.DataFrame):
+        # Note that constructing a frame from frozen columns consolidates
+        # columns of the same dtype into new (writeable) blocks, i.e., copies
+        # data.  Instead, freeze the blocks of a shallow copy (one per dtype),
+        # leaving the blocks of the original frame writeable.
+        frozen = obj.copy(deep=False)
+        for block in frozen._data.blocks:
+            if isinstance(block.values, np.ndarray):
+                block.values = freeze(block.values)
+            else:
+                # Extension type, e.g., time zone aware datetimes.
+                block.values = block.values.copy()
+        return frozen
+    return obj
+
+
 def protocol_to_dict(protocol, loaded=True):
     '''
     Convert a :class:`Protocol` to a dictionary representation.
@@ -832,6 +929,18 @@ class Protocol():
         '''
         return protocol_from_dict(protocol_dict)
 
+    def snapshot(self):
+        '''
+        Returns
+        -------
+        tuple[FrozenDict]
+            Read-only snapshot of each step (see :meth:`Step.snapshot`).
+
+
+        .. versionadded:: 2.36.0
+        '''
+        return tuple(step.snapshot() for step in self.steps)
+
     def to_frame(self):
         '''
         Returns
@@ -1058,55 +1167,111 @@ class Protocol():
 
 
     def insert_steps(self, step_number=None, count=None, values=None):
+        '''
+        Insert one or more steps as a single batch.
+
+        Parameters
+        ----------
+        step_number : int, optional
+            Index to insert steps at.  By default, insert at active step.
+        count : int, optional
+            Number of default steps to insert.
+        values : list[Step], optional
+            Steps to insert.
+
+        Returns
+        -------
+        list[int]
+            Inserted step numbers.
+
+
+        .. versionchanged:: 2.36.0
+            Insert all steps with a single list operation and emit a single
+            ``on_steps_inserted`` signal.  Plugins only implementing
+            ``on_step_created`` are notified once per inserted step.
+        '''
         if values is None and count is None:
             raise ValueError('Either count or values must be specified')
         elif values is None:
-            values = [Step()] * count
-        for value in values[::-1]:
-            self.insert_step(step_number, value, notify=False)
-        emit_signal('on_steps_inserted', args=range(step_number, step_number +
-                                                    len(values)))
-
-    def insert_step(self, step_number=None, value=None, notify=True):
-        from .app_context import get_app
-
-        app = get_app()
+            values = [Step() for i in xrange(count)]
         if step_number is None:
+            from .app_context import get_app
+
+            app = get_app()
             step_number = app.protocol_controller.protocol_state['step_number']
+        self.steps[step_number:step_number] = values
+        step_numbers = range(step_number, step_number + len(values))
+        emit_batch_signal('on_steps_inserted', [step_numbers],
+                          'on_step_created', [[i] for i in step_numbers])
+        return step_numbers
+
+    def insert_step(self, step_number=None, value=None, notify=True):
+        '''
+        .. versionchanged:: 2.36.0
+            Insert using :meth:`insert_steps`.
+        '''
         if value is None:
             value = Step()
-        self.steps.insert(step_number, value)
-        emit_signal('on_step_created', args=[step_number])
+        step_number = self.insert_steps(step_number, values=[value])[0]
         if notify:
             emit_signal('on_step_inserted', args=[step_number])
 
     def delete_step(self, step_number):
+        '''
+        .. versionchanged:: 2.36.0
+            Delete using :meth:`delete_steps`.
+        '''
+        self.delete_steps([step_number])
+
+    def delete_steps(self, step_ids):
+        '''
+        Delete one or more steps as a single batch.
+
+        If all steps are deleted, a new default step is inserted.
+
+        Parameters
+        ----------
+        step_ids : list[int]
+            Step numbers to delete.
+
+
+        .. versionchanged:: 2.36.0
+            Delete all steps with a single list operation, emit a single
+            ``on_steps_removed`` signal, and go to the resulting active step
+            once.  Plugins only implementing ``on_step_removed`` are notified
+            once per deleted step (in descending step order).
+        '''
         from .app_context import get_app
 
-        app = get_app()
-        step_to_remove = self.steps[step_number]
-        del self.steps[step_number]
-        emit_signal('on_step_removed', args=[step_number, step_to_remove])
+        step_numbers = sorted(set(step_ids))
+        if not step_numbers:
+            return
+        removed_steps = [self.steps[i] for i in step_numbers]
+        removed = set(step_numbers)
+        self.steps = [s for i, s in enumerate(self.steps) if i not in removed]
+        # Process compatibility signals in reverse order to avoid ID mismatch
+        # due to deleted rows.
+        emit_batch_signal('on_steps_removed', [step_numbers, removed_steps],
+                          'on_step_removed',
+                          [[i, s] for i, s in zip(step_numbers,
+                                                  removed_steps)][::-1])
 
-        active_step_number = (app.protocol_controller
-                              .protocol_state['step_number'])
+        app = get_app()
         if len(self.steps) == 0:
             # If we deleted the last remaining step, we need to insert a new
             # default Step
             self.insert_step(0, Step())
             app.protocol_controller.goto_step(0)
-        elif len(self.steps) == active_step_number:
-            app.protocol_controller.goto_step(step_number - 1)
         else:
-            app.protocol_controller.goto_step(active_step_number)
-
-    def delete_steps(self, step_ids):
-        sorted_ids = sorted(step_ids)
-        # Process deletion of steps in reverse order to avoid ID mismatch due
-        # to deleted rows.
-        sorted_ids.reverse()
-        for id in sorted_ids:
-            self.delete_step(id)
+            # Follow the active step to its new position.  If the active step
+            # was deleted, select the step following it (or the last step).
+            active_step_number = (app.protocol_controller
+                                  .protocol_state['step_number'])
+            removed_before = len([i for i in step_numbers
+                                  if i < active_step_number])
+            app.protocol_controller.goto_step(min(active_step_number -
+                                                  removed_before,
+                                                  len(self.steps) - 1))
 
 
 class Step(object):
@@ -1119,6 +1284,22 @@ class Step(object):
     def copy(self):
         return Step(plugin_data=copy.deepcopy(self.plugin_data))
 
+    def snapshot(self):
+        '''
+        Returns
+        -------
+        FrozenDict
+            Read-only snapshot of step plugin data, keyed by plugin name,
+            sharing memory with the step plugin data (see :func:`freeze`).
+
+            Plugin data implementing ``to_dict`` are converted (as in
+            :meth:`Protocol.to_dict`).
+
+
+        .. versionadded:: 2.36.0
+        '''
+        return freeze(_plugin_data_to_dict(self.plugin_data))
+
     @property
     def plugins(self):
         return set(self.plugin_data.keys())
@@ -0,0 +1,203 @@
+'''
+Startup profiling, enabled with the ``--profile-startup`` command-line flag.
+
+Each startup phase (e.g., config validation, plugin loading, plugin enable,
+device load, protocol load, GUI setup) and each plugin ``on_plugin_enable``
+call are timed, and the results are saved as a JSON report to the
+``startup-profiles`` directory in the MicroDrop data directory.
+
+Use ``--profile-startup cprofile`` to also capture :mod:`cProfile` stats for
+each (top-level) phase.
+
+.. versionadded:: 2.36.0
+'''
+from argparse import ArgumentParser
+from collections import OrderedDict
+from contextlib import contextmanager
+import cProfile
+import datetime as dt
+import json
+import pstats
+import sys
+import timeit
+
+import path_helpers as ph
+
+try:
+    from time import monotonic
+except ImportError:
+    # Python 2: use highest resolution timer available.  Note: not imported
+    # from `step_timing` module to avoid importing `pandas` before timing
+    # starts.
+    monotonic = timeit.default_timer
+
+#: Parser for startup profiling command-line arguments.
+PROFILE_STARTUP_PARSER = ArgumentParser(add_help=False)
+PROFILE_STARTUP_PARSER.add_argument('--profile-startup', nargs='?',
+                                    const='timing', default=None,
+                                    choices=('timing', 'cprofile'),
+                                    help='Time each startup phase and save '
+                                    'report to data directory.  Use '
+                                    '`cprofile` to also capture cProfile '
+                                    'stats for each phase.')
+
+
+class StartupProfiler(object):
+    '''
+    Attributes
+    ----------
+    enabled : bool
+        If ``False``, phases are not timed.
+    cprofile : bool
+        If ``True``, capture :mod:`cProfile` stats for each top-level phase.
+    phases : list[dict]
+        Timed phases, in start order, each with the keys ``name``,
+        ``parent``, ``start_s`` (relative to profiler start), and
+        ``duration_s``.
+    plugin_enable : OrderedDict
+        Duration (in seconds) of each plugin ``on_plugin_enable`` call.
+    '''
+    def __init__(self):
+        self.enabled = False
+        self.cprofile = False
+        self.phases = []
+        self.plugin_enable = OrderedDict()
+        self._stats = OrderedDict()
+        self._stack = []
+        self._start = None
+
+    def start(self, cprofile=False):
+        '''
+        Enable profiler.
+
+        Parameters
+        ----------
+        cprofile : bool, optional
+            If ``True``, capture :mod:`cProfile` stats for each top-level
+            phase.
+        '''
+        self.enabled = True
+        self.cprofile = cprofile
+        self._start = monotonic()
+
+    @contextmanager
+    def phase(self, name):
+        '''
+        Time startup phase (no-op if profiler is not enabled).
+
+        Phases may be nested.
+
+        Parameters
+        ----------
+        name : str
+            Phase name.
+        '''
+        if not self.enabled:
+            yield
+            return
+
+        record = {'name': name,
+                  'parent': self._stack[-1]['name'] if self._stack else None,
+                  'start_s': monotonic() - self._start}
+        # Note: only one `cProfile` profiler may be active at a time.
+        profile = (cProfile.Profile() if self.cprofile and not self._stack
+                   else None)
+        self._stack.append(record)
+        self.phases.append(record)
+        start = monotonic()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+                self._stats[name] = profile
+            record['duration_s'] = monotonic() - start
+            self._stack.pop()
+
+    def report(self, top=20):
+        '''
+        Parameters
+        ----------
+        top : int, optional
+            Number of functions (sorted by cumulative time) to include for
+            each phase with :mod:`cProfile` stats.
+
+        Returns
+        -------
+        dict
+            Startup profiling report.
+        '''
+        report = {'timestamp': dt.datetime.now().isoformat(),
+                  'total_s': (monotonic() - self._start
+                              if self._start is not None else None),
+                  'phases': self.phases,
+                  'plugin_enable': self.plugin_enable}
+        if self._stats:
+            report['cprofile'] = OrderedDict((name, _top_functions(profile,
+                                                                   top))
+                                             for name, profile in
+                                             self._stats.items())
+        return report
+
+    def save(self, directory, **kwargs):
+        '''
+        Save JSON report (and raw :mod:`cProfile` stats, if available) to
+        directory.
+
+        Parameters
+        ----------
+        directory : str
+            Output directory (created if it does not exist).
+        **kwargs
+            Extra report fields (e.g., plugin versions).
+
+        Returns
+        -------
+        path_helpers.path
+            Path to JSON report.
+        '''
+        directory = ph.path(directory)
+        directory.makedirs_p()
+        report = self.report()
+        report.update(kwargs)
+        stem = dt.datetime.now().strftime('startup-%Y%m%d-%H%M%S')
+        for i, (name_i, profile_i) in enumerate(self._stats.items()):
+            profile_i.dump_stats(directory.joinpath('%s-%02d.prof' %
+                                                    (stem, i)))
+        output_path = directory.joinpath(stem + '.json')
+        with output_path.open('w') as output:
+            json.dump(report, output, indent=4, default=str)
+        return output_path
+
+
+def _top_functions(profile, top):
+    '''
+    Returns
+    -------
+    list[dict]
+        Functions with highest cumulative time.
+    '''
+    stats = pstats.Stats(profile)
+    functions = []
+    for (filename, line, function), (cc, nc, tt, ct, callers) in \
+            sorted(stats.stats.items(), key=lambda v: v[1][3],
+                   reverse=True)[:top]:
+        functions.append({'function': '%s:%d(%s)' % (filename, line,
+                                                    function),
+                          'ncalls': nc, 'tottime_s': tt, 'cumtime_s': ct})
+    return functions
+
+
+def parse_args(args=None):
+    '''
+    Parse startup profiling arguments (other arguments are ignored).
+    '''
+    if args is None:
+        args = sys.argv[1:]
+    return PROFILE_STARTUP_PARSER.parse_known_args(args)[0]
+
+
+#: Startup profiler (disabled unless started, e.g., by ``--profile-startup``).
+STARTUP_PROFILER = StartupProfiler()
@@ -0,0 +1,233 @@
+'''
+High-resolution step execution timing instrumentation.
+
+Timestamped events (e.g., ``step-started``, each plugin ``on_step_run()``
+coroutine start and finish, waveform set calls, actuation requests, and
+``step-completed``) are recorded to a fixed-size ring buffer, from which
+per-plugin latency histograms are computed.
+
+Example
+-------
+
+Record an event for the current step and get per-plugin latencies::
+
+    from microdrop.step_timing import STEP_TIMING
+
+    STEP_TIMING.record('on_step_run', plugin='my_plugin', phase='start')
+    ...
+    STEP_TIMING.record('on_step_run', plugin='my_plugin', phase='end')
+    STEP_TIMING.histograms()
+
+.. versionadded:: 2.36.0
+'''
+import collections
+import threading
+import timeit
+
+import numpy as np
+import pandas as pd
+import trollius as asyncio
+
+try:
+    from time import monotonic
+except ImportError:
+    # Python 2: use highest resolution timer available (i.e.,
+    # `time.clock()` on Windows, which is monotonic).
+    monotonic = timeit.default_timer
+
+
+#: Columns of each recorded event.
+EVENT_COLUMNS = ['timestamp', 'step_id', 'step', 'event', 'plugin', 'phase']
+
+#: Default latency histogram bin edges (in seconds).
+DEFAULT_BIN_EDGES = np.logspace(-5, 2, 29)
+
+
+class StepTimingRecorder(object):
+    '''
+    Ring buffer of timestamped step execution events.
+
+    Each event is recorded as a tuple of :data:`EVENT_COLUMNS` values, where
+    ``timestamp`` is a :func:`monotonic` time in seconds.
+
+    Parameters
+    ----------
+    size : int, optional
+        Maximum number of events to keep.  Oldest events are discarded
+        first.
+
+    Attributes
+    ----------
+    enabled : bool
+        If ``False``, events are not recorded.
+    step_id : int
+        Sequence number of the step most recently started (unique across
+        protocol repeats).
+    step : int
+        Index of the step most recently started.
+    '''
+    def __init__(self, size=20000):
+        self.enabled = True
+        self.step_id = -1
+        self.step = None
+        self._events = collections.deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    @property
+    def size(self):
+        return self._events.maxlen
+
+    def __len__(self):
+        return len(self._events)
+
+    def start_step(self, step):
+        '''
+        Record ``step-started`` event, and associate all subsequent events
+        with the started step.
+
+        Parameters
+        ----------
+        step : int
+            Step index.
+        '''
+        with self._lock:
+            self.step_id += 1
+            self.step = step
+        self.record('step-started')
+
+    def record(self, event, plugin=None, phase=None):
+        '''
+        Record event for current step.
+
+        Parameters
+        ----------
+        event : str
+            Event name, e.g., ``"on_step_run"``.
+        plugin : str, optional
+            Name of plugin (or signal receiver) the event relates to.
+        phase : str, optional
+            Event phase, i.e., ``"start"`` or ``"end"``.
+        '''
+        if self.enabled:
+            # Note: appending to a `deque` is thread-safe.
+            self._events.append((monotonic(), self.step_id, self.step, event,
+                                 plugin, phase))
+
+    @asyncio.coroutine
+    def timed(self, event, coro, plugin=None):
+        '''
+        XXX Coroutine XXX
+
+        Record ``start`` and ``end`` events around a coroutine (or future).
+
+        Parameters
+        ----------
+        event : str
+            Event name.
+        coro : coroutine or asyncio.Future
+            Coroutine to wait for.
+        plugin : str, optional
+            Name of plugin (or signal receiver) executing the coroutine.
+
+        Returns
+        -------
+        object
+            Return value of :data:`coro`.
+        '''
+        self.record(event, plugin=plugin, phase='start')
+        try:
+            result = yield asyncio.From(coro)
+        finally:
+            self.record(event, plugin=plugin, phase='end')
+        raise asyncio.Return(result)
+
+    def clear(self):
+        self._events.clear()
+
+    def frame(self):
+        '''
+        Returns
+        -------
+        pandas.DataFrame
+            Table of recorded events (oldest first), with the columns
+            :data:`EVENT_COLUMNS`.
+        '''
+        return pd.DataFrame(list(self._events), columns=EVENT_COLUMNS)
+
+    def latencies(self):
+        '''
+        Match ``start`` and ``end`` events to compute latencies.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Table with the columns ``step_id``, ``step``, ``event``,
+            ``plugin``, ``start`` (timestamp), and ``duration_s``.
+        '''
+        df_events = self.frame().fillna({'plugin': '', 'step': -1})
+        df_events = df_events.loc[df_events.phase.isin(['start',
+                                                        'end'])].copy()
+        keys = ['step_id', 'step', 'event', 'plugin']
+        # Number each repeated start/end event for the same step and plugin
+        # (e.g., dynamic actuations), to match start and end events.
+        df_events['n'] = df_events.groupby(keys + ['phase']).cumcount()
+        df_start = df_events.loc[df_events.phase == 'start']
+        df_end = df_events.loc[df_events.phase == 'end']
+        df_latencies = pd.merge(df_start, df_end, on=keys + ['n'],
+                                suffixes=('_start', '_end'))
+        df_latencies['duration_s'] = (df_latencies.timestamp_end -
+                                      df_latencies.timestamp_start)
+        df_latencies.rename(columns={'timestamp_start': 'start'},
+                            inplace=True)
+        return df_latencies[keys + ['start', 'duration_s']]
+
+    def histograms(self, bin_edges=None):
+        '''
+        Compute latency histograms, grouped by event and plugin.
+
+        Parameters
+        ----------
+        bin_edges : array-like, optional
+            Histogram bin edges (in seconds).  Latencies outside of the range
+            are counted in the first or last bin.  By default, use
+            :data:`DEFAULT_BIN_EDGES`.
+
+        Returns
+        -------
+        dict
+            Mapping from each event name to a mapping from each plugin name
+            to a dictionary with the keys ``count``, ``mean_s``, ``max_s``,
+            ``bin_edges_s``, and ``counts``.
+        '''
+        if bin_edges is None:
+            bin_edges = DEFAULT_BIN_EDGES
+        bin_edges = np.asarray(bin_edges, dtype=float)
+        df_latencies = self.latencies()
+        histograms = {}
+        for (event_i, plugin_i), durations_i in \
+                df_latencies.groupby(['event', 'plugin']).duration_s:
+            counts_i, _ = np.histogram(durations_i.clip(bin_edges[0],
+                                                        bin_edges[-1]),
+                                       bins=bin_edges)
+            histograms.setdefault(event_i, {})[plugin_i] = \
+                {'count': int(durations_i.count()),
+                 'mean_s': float(durations_i.mean()),
+                 'max_s': float(durations_i.max()),
+                 'bin_edges_s': bin_edges.tolist(),
+                 'counts': counts_i.tolist()}
+        return histograms
+
+
+def receiver_name(receiver):
+    '''
+    Returns
+    -------
+    str
+        Name of blinker signal receiver, e.g., ``"module.function"``.
+    '''
+    return '%s.%s' % (getattr(receiver, '__module__', None),
+                      getattr(receiver, '__name__', receiver))
+
+
+#: Step timing events recorded during execution.
+STEP_TIMING = StepTimingRecorder()
@@ -0,0 +1,95 @@
+from nose.tools import eq_, ok_, raises
+
+from microdrop.core_plugins.command_plugin.plugin import CommandZmqPlugin
+
+
+def commands_plugin(**kwargs):
+    # Set class attributes (e.g., `change_log_size`) on a subclass.
+    cls = type('StubCommandZmqPlugin', (CommandZmqPlugin, ), kwargs)
+    return cls(None, 'commands', 'tcp://localhost:31000')
+
+
+def rows(df):
+    return [tuple(row_i) for row_i in df.values]
+
+
+def test_register_command():
+    plugin = commands_plugin()
+    plugin.register_command('foo', 'run_all')
+    eq_(plugin.version, 1)
+    eq_(rows(plugin.commands), [('', 'foo', 'run_all', 'Run all')])
+    # Registering same command and title again is not a change.
+    plugin.register_command('foo', 'run_all')
+    eq_(plugin.version, 1)
+    plugin.register_command('foo', 'run_all', title='Run')
+    eq_(plugin.version, 2)
+    eq_(rows(plugin.commands), [('', 'foo', 'run_all', 'Run')])
+
+
+def test_unregister_command():
+    plugin = commands_plugin()
+    plugin.register_command('foo', 'run_all')
+    plugin.register_command('foo', 'stop', namespace='bar')
+    # Title does not match, so command is not unregistered.
+    plugin.unregister_command('foo', 'run_all', title='Run')
+    eq_(plugin.version, 2)
+    plugin.unregister_command('foo', 'run_all')
+    eq_(plugin.version, 3)
+    plugin.unregister_command('foo', 'run_all')
+    eq_(plugin.version, 3)
+    eq_(rows(plugin.commands), [('bar', 'foo', 'stop', 'Stop')])
+
+
+def test_get_changes():
+    plugin = commands_plugin()
+    plugin.register_command('foo', 'a')
+    plugin.register_command('foo', 'b')
+    version = plugin.version
+
+    # Up-to-date client.
+    changes = plugin.get_changes(version)
+    eq_((changes['version'], changes['reset']), (version, False))
+    ok_(changes['registered'].empty and changes['unregistered'].empty)
+
+    # Recent client; only the last change for each command is returned.
+    plugin.register_command('foo', 'c')
+    plugin.register_command('foo', 'a', title='Alpha')
+    plugin.unregister_command('foo', 'b')
+    plugin.register_command('foo', 'd')
+    plugin.unregister_command('foo', 'd')
+    changes = plugin.get_changes(version)
+    eq_((changes['version'], changes['reset']), (version + 5, False))
+    eq_(rows(changes['registered']), [('', 'foo', 'c', 'C'),
+                                      ('', 'foo', 'a', 'Alpha')])
+    eq_(rows(changes['unregistered']), [('', 'foo', 'b', 'B'),
+                                        ('', 'foo', 'd', 'D')])
+
+
+def test_get_changes_reset():
+    plugin = commands_plugin(change_log_size=2)
+    for name in 'abc':
+        plugin.register_command('foo', name)
+
+    for version in (0, plugin.version + 1, -1):
+        # Expired (i.e., no longer in change log) or invalid version.
+        changes = plugin.get_changes(version)
+        ok_(changes['reset'])
+        eq_(rows(changes['registered']), rows(plugin.commands))
+        ok_(changes['unregistered'].empty)
+    ok_(not plugin.get_changes(1)['reset'])
+
+
+def test_commands_cached():
+    plugin = commands_plugin()
+    plugin.register_command('foo', 'a')
+    commands = plugin.commands
+    ok_(plugin.commands is commands)
+
+    @raises(ValueError)
+    def set_title():
+        commands.iloc[0, 3] = 'B'
+
+    set_title()
+    plugin.register_command('foo', 'b')
+    ok_(plugin.commands is not commands)
+    eq_(len(commands), 1)
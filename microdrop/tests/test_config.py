@@ -0,0 +1,96 @@
+import os
+import shutil
+import tempfile
+import time
+
+from nose.tools import eq_, ok_, raises
+from configobj import ConfigObj
+
+from microdrop.config import Config, replace_file
+
+
+class TestConfig(object):
+    def setup(self):
+        self.directory = tempfile.mkdtemp(prefix='microdrop-config-')
+        self.filename = os.path.join(self.directory, 'microdrop.ini')
+        with open(self.filename, 'w') as output:
+            output.write('data_dir = %s\n' % self.directory)
+        self.config = Config(self.filename)
+        self.config.flush_delay_s = .05
+
+    def teardown(self):
+        self.config._cancel_flush()
+        shutil.rmtree(self.directory)
+
+    def read(self, filename=None):
+        return ConfigObj(filename or self.filename)
+
+    def test_mark_dirty_debounce(self):
+        for i in range(5):
+            self.config.update_section('my_plugin', {'value': str(i)})
+        ok_(self.config.dirty)
+        start = time.time()
+        while self.config.dirty:
+            ok_(time.time() - start < 5, 'Timed out waiting for flush.')
+            time.sleep(.01)
+        # All changes are written at once, after the most recent change.
+        eq_(self.config._save_count, 1)
+        eq_(self.read()['my_plugin']['value'], '4')
+
+    def test_flush(self):
+        ok_(not self.config.flush())
+        self.config.update_section('my_plugin', {'value': 'a'})
+        ok_(self.config.flush())
+        ok_(not self.config.dirty)
+        ok_(self.config._flush_timer is None)
+        eq_(self.read()['my_plugin']['value'], 'a')
+        ok_(not self.config.flush())
+
+    def test_save_temp_file_rename(self):
+        self.config.update_section('my_plugin', {'value': 'a'},
+                                   mark_dirty=False)
+        other = os.path.join(self.directory, 'other.ini')
+        self.config.save(other)
+        eq_(self.read(other)['my_plugin']['value'], 'a')
+        eq_(sorted(os.listdir(self.directory)), ['microdrop.ini',
+                                                 'other.ini', 'plugins'])
+
+    @raises(OSError)
+    def test_save_failure_keeps_file(self):
+        self.config.save()
+        self.config.update_section('my_plugin', {'value': 'a'},
+                                   mark_dirty=False)
+        rename = os.rename
+
+        def _rename(*args):
+            raise OSError('rename failed')
+
+        os.rename = _rename
+        try:
+            self.config.save()
+        finally:
+            os.rename = rename
+            # Existing file is untouched and temporary file is removed.
+            ok_('my_plugin' not in self.read())
+            eq_(sorted(os.listdir(self.directory)), ['microdrop.ini',
+                                                     'plugins'])
+
+    def test_replace_file(self):
+        source = os.path.join(self.directory, 'source.ini')
+        with open(source, 'w') as output:
+            output.write('value = a\n')
+        replace_file(source, self.filename)
+        ok_(not os.path.exists(source))
+        eq_(self.read()['value'], 'a')
+
+    def test_locked(self):
+        self.config.update_section('plugins', {'enabled': ['a', 'b']},
+                                   mark_dirty=False)
+        with self.config.locked() as data:
+            ok_(data is self.config.data)
+            # Lock is reentrant, i.e., sections may be updated while locked.
+            enabled = [name for name in data['plugins']['enabled']
+                       if name != 'a']
+            self.config.update_section('plugins', {'enabled': enabled})
+        eq_(self.config['plugins']['enabled'], ['b'])
+        ok_(self.config.dirty)
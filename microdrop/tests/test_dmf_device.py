@@ -1,7 +1,8 @@
 import time
 
 from path_helpers import path
-from nose.tools import raises, eq_
+from nose.tools import raises, eq_, ok_
+from zmq_plugin.schema import get_execute_request
 
 from dmf_device import DmfDevice
 from microdrop_utility import Version
@@ -71,3 +72,112 @@ def test_import_device(root=None):
         root = path(root)
     for i in range(6):
         yield _import_device, i, root
+
+
+DEVICE_PATH = path(__file__).parent.parent.joinpath('devices',
+                                                    'SCI-BOTS 90-pin array',
+                                                    'device.svg')
+
+
+def _load_versioned_device(**kwargs):
+    # Set class attributes (e.g., `CHANNEL_EDITS_MAXLEN`) on a subclass.
+    cls = type('Device', (DmfDevice, ), kwargs)
+    return cls(DEVICE_PATH)
+
+
+def test_channel_edits_unchanged():
+    """
+    test device version is unchanged if channels are not changed
+    """
+    device = _load_versioned_device()
+    etag = device.etag
+    channels = device.channels_by_electrode[['electrode000']].tolist()
+    device.set_electrode_channels('electrode000', channels)
+    eq_(device.version, 0)
+    eq_(device.etag, etag)
+    eq_(device.channel_edits(etag), {})
+
+
+def test_channel_edits_delta():
+    """
+    test channel edits since device version
+    """
+    device = _load_versioned_device()
+    etag = device.etag
+    device.set_electrode_channels('electrode000', [1, 2])
+    device.set_electrode_channels('electrode001', [])
+    device.set_electrode_channels('electrode000', [3])
+    eq_(device.version, 3)
+    ok_(device.etag != etag)
+    eq_(device.channel_edits(etag), {'electrode000': [3],
+                                     'electrode001': []})
+    eq_(device.channel_edits(device.etag), {})
+
+
+def test_channel_edits_unavailable():
+    """
+    test channel edits are not available for foreign or future versions
+    """
+    device = _load_versioned_device()
+    other = _load_versioned_device()
+    device.set_electrode_channels('electrode000', [1, 2])
+    eq_(device.channel_edits(other.etag), None)
+    future_etag = '%s:%d' % (device.etag.rsplit(':', 1)[0],
+                             device.version + 1)
+    eq_(device.channel_edits(future_etag), None)
+    for etag in (None, '', 'not-a-version'):
+        eq_(device.channel_edits(etag), None)
+
+
+def test_channel_edits_overflow():
+    """
+    test channel edits are not available after edit log overflows
+    """
+    device = _load_versioned_device(CHANNEL_EDITS_MAXLEN=2)
+    etags = [device.etag]
+    for channel in range(3):
+        device.set_electrode_channels('electrode000', [channel])
+        etags.append(device.etag)
+    eq_(device.channel_edits(etags[0]), None)
+    eq_(device.channel_edits(etags[1]), {'electrode000': [2]})
+
+
+class StubApp(object):
+    def __init__(self, dmf_device):
+        self.dmf_device = dmf_device
+
+
+def test_check_version():
+    """
+    test device info plugin replies according to `if_version` argument
+    """
+    from microdrop.core_plugins import device_info_plugin
+    from microdrop.core_plugins.device_info_plugin import (NOT_MODIFIED,
+                                                           DeviceInfoZmqPlugin)
+
+    device = _load_versioned_device()
+    plugin = DeviceInfoZmqPlugin('device_info', 'tcp://localhost:31000')
+
+    def check_version(if_version, **kwargs):
+        data = {} if if_version is None else {'if_version': if_version}
+        request = get_execute_request('test', 'device_info', 'get_device',
+                                      data=data)
+        return plugin.check_version(request, **kwargs)
+
+    get_app = device_info_plugin.get_app
+    device_info_plugin.get_app = lambda: StubApp(device)
+    try:
+        etag = device.etag
+        # No version specified, so full response is required.
+        eq_(check_version(None), None)
+        eq_(check_version(etag), {'status': NOT_MODIFIED, 'version': etag})
+        device.set_electrode_channels('electrode000', [1, 2])
+        eq_(check_version(etag), {'status': 'delta', 'version': device.etag,
+                                  'electrode_channels': {'electrode000':
+                                                         [1, 2]}})
+        # Requested data does not depend on channels.
+        eq_(check_version(etag, channels=False),
+            {'status': NOT_MODIFIED, 'version': device.etag})
+        eq_(check_version(_load_versioned_device().etag), None)
+    finally:
+        device_info_plugin.get_app = get_app
@@ -0,0 +1,66 @@
+from nose.tools import eq_, raises
+import numpy as np
+
+from microdrop.droplet_routing import (DropletRouter, RoutingError,
+                                       grid_adjacency)
+
+
+def _check_routes(router, adjacency, droplets, routes):
+    eq_(routes.iloc[0].tolist(), [d[0] for d in droplets])
+    eq_(routes.iloc[-1].tolist(), [d[1] for d in droplets])
+    eq_(router.conflicts(routes), [])
+    # Each droplet waits or moves to a neighbouring electrode at each step.
+    for droplet_i in routes:
+        path = router.electrode_ids.get_indexer(routes[droplet_i])
+        moves = path[1:] != path[:-1]
+        assert (adjacency[path[:-1], path[1:]][moves] > 0).all()
+
+
+def test_route_droplets():
+    adjacency, electrode_ids = grid_adjacency(10, 10)
+    router = DropletRouter(adjacency, electrode_ids)
+    eq_(router.distances('electrode000')['electrode099'], 18)
+
+    # Swap droplets in opposite corners of the grid.
+    droplets = [('electrode000', 'electrode099'),
+                ('electrode099', 'electrode000'),
+                ('electrode009', 'electrode090')]
+    routes = router.route(droplets)
+    _check_routes(router, adjacency, droplets, routes)
+
+    schedule = router.schedule(routes)
+    eq_(len(schedule), routes.shape[0])
+    eq_(schedule[0].index.tolist(), sorted(d[0] for d in droplets))
+
+
+def test_route_random_droplets():
+    adjacency, electrode_ids = grid_adjacency(20, 20)
+    router = DropletRouter(adjacency, electrode_ids)
+    random = np.random.RandomState(0)
+    for i in range(5):
+        while True:
+            electrodes = random.choice(router.electrode_ids, 16,
+                                       replace=False)
+            droplets = zip(electrodes[:8], electrodes[8:])
+            try:
+                routes = router.route(droplets)
+            except RoutingError:
+                # Sources or targets interfere; try again.
+                continue
+            break
+        _check_routes(router, adjacency, droplets, routes)
+
+
+@raises(RoutingError)
+def test_route_neighbouring_sources():
+    router = DropletRouter(*grid_adjacency(5, 5))
+    router.route([('electrode000', 'electrode024'),
+                  ('electrode001', 'electrode020')])
+
+
+@raises(RoutingError)
+def test_route_blocked_corridor():
+    # Droplets cannot pass each other in a single-file corridor.
+    router = DropletRouter(*grid_adjacency(1, 10))
+    router.route([('electrode000', 'electrode009'),
+                  ('electrode009', 'electrode000')])
@@ -0,0 +1,20 @@
+from nose.tools import eq_
+import pandas as pd
+
+from microdrop.core_plugins.electrode_controller_plugin.execute import \
+    ElectrodeStatesMerger
+
+
+def test_merge_electrode_states():
+    merger = ElectrodeStatesMerger(['electrode%03d' % i for i in range(10)])
+    states = merger.merge([pd.Series([1, 0], index=['electrode001',
+                                                    'electrode002']),
+                           pd.Series([2, 1], index=['electrode001',
+                                                    'electrode100'])])
+    eq_(states.to_dict(), {'electrode001': 2, 'electrode100': 1})
+    eq_(len(merger.electrode_ids), 11)
+
+    # Merged states are reset between merges.
+    states = merger.merge([pd.Series([1], index=['electrode003'])])
+    eq_(states.to_dict(), {'electrode003': 1})
+    eq_(merger.merge([]).shape[0], 0)
@@ -0,0 +1,95 @@
+from nose.tools import eq_, ok_
+
+from microdrop import gtk_dispatch
+from microdrop.gtk_dispatch import GtkUpdateDispatcher
+
+
+class StubGobject(object):
+    '''
+    Record callbacks scheduled with ``idle_add`` and ``timeout_add``.
+    '''
+    def __init__(self):
+        self.scheduled = []
+
+    def idle_add(self, callback):
+        self.scheduled.append((None, callback))
+        return len(self.scheduled)
+
+    def timeout_add(self, interval_ms, callback):
+        self.scheduled.append((interval_ms, callback))
+        return len(self.scheduled)
+
+    def run_pending(self):
+        scheduled, self.scheduled = self.scheduled, []
+        for interval_ms, callback in scheduled:
+            eq_(callback(), False)
+
+
+class TestGtkUpdateDispatcher(object):
+    def setup(self):
+        self._gobject = gtk_dispatch.gobject
+        self.gobject = StubGobject()
+        gtk_dispatch.gobject = self.gobject
+        self.dispatcher = GtkUpdateDispatcher(max_rate_hz=10, max_pending=3)
+        self.calls = []
+
+    def teardown(self):
+        gtk_dispatch.gobject = self._gobject
+
+    def update(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+
+    def test_coalesce(self):
+        for i in range(3):
+            ok_(self.dispatcher.submit('a', self.update, i, value=i))
+        # Only one callback is scheduled for all pending updates.
+        eq_(len(self.gobject.scheduled), 1)
+        self.gobject.run_pending()
+        eq_(self.calls, [((2, ), {'value': 2})])
+        stats = self.dispatcher.stats()
+        eq_((stats['submitted'], stats['coalesced'], stats['run'],
+             stats['batches'], stats['pending']), (3, 2, 1, 1, 0))
+
+    def test_no_coalesce(self):
+        for i in range(3):
+            self.dispatcher.submit(None, self.update, i)
+        self.gobject.run_pending()
+        eq_(self.calls, [((i, ), {}) for i in range(3)])
+        eq_(self.dispatcher.counts['coalesced'], 0)
+
+    def test_order(self):
+        self.dispatcher.submit('a', self.update, 'a0')
+        self.dispatcher.submit(None, self.update, 'x')
+        self.dispatcher.submit('b', self.update, 'b0')
+        # Coalesced update runs in order of most recent submission.
+        self.dispatcher.submit('a', self.update, 'a1')
+        self.gobject.run_pending()
+        eq_([args[0] for args, kwargs in self.calls], ['x', 'b0', 'a1'])
+
+    def test_dropped_failed(self):
+        def fail():
+            raise RuntimeError('update failed')
+
+        self.dispatcher.submit(None, fail)
+        self.dispatcher.submit('a', self.update, 0)
+        self.dispatcher.submit('b', self.update, 1)
+        # Pending updates limit reached; new updates are dropped, but
+        # updates with a pending key are coalesced.
+        ok_(not self.dispatcher.submit('c', self.update, 2))
+        ok_(self.dispatcher.submit('b', self.update, 3))
+        self.gobject.run_pending()
+        eq_(self.calls, [((0, ), {}), ((3, ), {})])
+        eq_(self.dispatcher.stats(),
+            {'submitted': 5, 'coalesced': 1, 'dropped': 1, 'run': 2,
+             'failed': 1, 'batches': 1, 'pending': 0})
+        self.dispatcher.reset_stats()
+        eq_(set(self.dispatcher.counts.values()), {0})
+
+    def test_rate_limit(self):
+        self.dispatcher.submit('a', self.update, 0)
+        eq_(self.gobject.scheduled[0][0], None)
+        self.gobject.run_pending()
+        # Next batch is delayed until `1 / max_rate_hz` after last batch.
+        self.dispatcher.submit('a', self.update, 1)
+        interval_ms = self.gobject.scheduled[0][0]
+        ok_(0 < interval_ms <= 100)
@@ -0,0 +1,96 @@
+import json
+
+from nose.tools import eq_, ok_
+import numpy as np
+import pandas as pd
+
+from microdrop import hub_codec
+
+
+def round_trip(data):
+    # Encode as for a hub message, i.e., packed data in a JSON message.
+    return hub_codec.decode_data(json.loads(json.dumps(hub_codec
+                                                       .encode_data(data))))
+
+
+def test_series():
+    series = pd.Series([1., 0, 2], index=['electrode000', 'electrode001',
+                                          'electrode002'], name='states')
+    result = round_trip({'series': series})['series']
+    ok_(result.equals(series))
+    eq_(result.name, 'states')
+    eq_(result.index.tolist(), series.index.tolist())
+
+
+def test_data_frame():
+    df = pd.DataFrame({'id': ['a', 'b', 'c'], 'x': [.5, 1.5, 2.5],
+                       'i': np.arange(3, dtype='uint16'),
+                       'on': [True, False, True],
+                       'time': pd.date_range('2020-01-01', periods=3)},
+                      columns=['id', 'x', 'i', 'on', 'time'],
+                      index=pd.Index([3, 4, 5], name='vertex'))
+    result = round_trip(df)
+    ok_(result.equals(df))
+    eq_(result.columns.tolist(), df.columns.tolist())
+    eq_(result.dtypes.tolist(), df.dtypes.tolist())
+    eq_(result.index.name, 'vertex')
+
+
+def test_ndarray_and_scalars():
+    array = np.arange(6, dtype='int32').reshape(2, 3)
+    result = round_trip({'array': array, 'int': np.int64(3),
+                         'float': np.float32(.5), 'bool': np.bool_(True),
+                         'values': [1, u'x']})
+    ok_((result['array'] == array).all())
+    eq_(result['array'].dtype, array.dtype)
+    # Result array is writeable (i.e., not a view of the message buffer).
+    result['array'][0, 0] = 10
+    eq_((result['int'], result['float'], result['bool']), (3, .5, True))
+    eq_(result['values'], [1, u'x'])
+
+
+class Plugin(object):
+    @hub_codec.msgpack_reply
+    def on_execute__echo(self, request):
+        return hub_codec.decode_content_data(request)
+
+
+def request(data):
+    from zmq_plugin.schema import get_execute_request
+
+    return get_execute_request('a', 'b', 'echo', data=data)
+
+
+def test_msgpack_reply():
+    series = pd.Series([1, 0], index=['a', 'b'])
+    reply = Plugin().on_execute__echo(request(hub_codec.packed_kwargs(
+        series=series)))
+    ok_(hub_codec.is_packed(reply))
+    ok_(hub_codec.decode_data(reply)['series'].equals(series))
+    # Unpacked request, i.e., default encoding.
+    eq_(Plugin().on_execute__echo(request({'a': 1})), {'a': 1})
+
+
+def test_json_fallback():
+    msgpack = hub_codec.msgpack
+    hub_codec.msgpack = None
+    try:
+        ok_(not hub_codec.msgpack_available())
+        # Keyword arguments are not packed without `msgpack`.
+        eq_(hub_codec.packed_kwargs(a=1), {'a': 1})
+        eq_(Plugin().on_execute__echo(request(hub_codec.packed_kwargs(a=1))),
+            {'a': 1})
+    finally:
+        hub_codec.msgpack = msgpack
+
+
+def test_unsupported_reply_fallback():
+    class TzPlugin(object):
+        @hub_codec.msgpack_reply
+        def on_execute__times(self, request):
+            return pd.Series(pd.date_range('2020-01-01', periods=2,
+                                           tz='UTC'))
+
+    # Time zone aware values cannot be packed; reply is returned as is.
+    reply = TzPlugin().on_execute__times(request(hub_codec.packed_kwargs()))
+    ok_(isinstance(reply, pd.Series))
@@ -0,0 +1,43 @@
+from nose.tools import eq_
+
+from microdrop.hub_metrics import HubMetrics, RollingCounter
+
+
+def test_rolling_counter():
+    counter = RollingCounter(window_s=10)
+    for now in range(20):
+        counter.add(now=now + .5)
+    eq_(counter.total(now=19.5), 10)
+    eq_(counter.total(now=25.5), 4)
+    eq_(counter.total(now=40), 0)
+
+
+def test_hub_metrics_latency():
+    metrics = HubMetrics(bin_edges=[0, 1, 2, 3])
+    metrics.record_request('a', 'b', 'ping', 's0', size=100, now=0)
+    metrics.record_request('a', 'b', 'ping', 's1', size=200, now=0)
+    metrics.record_request('b', 'c', 'get', 's2', now=0)
+    eq_(metrics.in_flight, 3)
+    metrics.record_reply('b', 'a', 'ping', 's0', size=10, now=.5)
+    metrics.record_reply('b', 'a', 'ping', 's1', size=20, error=True,
+                         now=2.5)
+
+    result = metrics.metrics(now=3)
+    eq_(result['in_flight'], 1)
+    ping = result['messages']['a']['b']['ping']
+    eq_((ping['requests'], ping['replies'], ping['errors']), (2, 2, 1))
+    eq_((ping['request_bytes'], ping['max_reply_bytes']), (300, 20))
+    eq_(ping['counts'], [1, 0, 1])
+    eq_(ping['mean_latency_s'], 1.5)
+    eq_(result['messages']['b']['c']['get']['in_flight'], 1)
+    eq_(result['targets']['b']['requests'], 2)
+    eq_(result['sources']['b']['in_flight'], 1)
+    eq_(metrics.frame(now=3).shape[0], 2)
+
+
+def test_hub_metrics_expired():
+    metrics = HubMetrics(max_in_flight=2)
+    for i in range(5):
+        metrics.record_request('a', 'b', 'ping', 's%d' % i)
+    eq_((metrics.in_flight, metrics.expired), (2, 3))
+    eq_(metrics.frame().in_flight.tolist(), [2])
@@ -0,0 +1,117 @@
+import logging
+import threading
+
+from nose.tools import eq_, ok_
+
+from microdrop import logger as logger_module
+from microdrop.logger import CustomHandler
+
+
+class StubLoggingPlugin(object):
+    '''
+    Logging plugin recording the message of each dispatched record.
+
+    Dispatching blocks on :attr:`release` once :attr:`block` is set.
+    '''
+    name = 'stub_logging_plugin'
+
+    def __init__(self):
+        self.messages = []
+        self.block = False
+        self.blocked = threading.Event()
+        self.release = threading.Event()
+        self.log = None
+
+    def _record(self, record):
+        self.messages.append(record.message)
+        if self.log is not None:
+            # Log from consumer thread (i.e., while dispatching).
+            self.log.info('nested %s', record.message)
+        if self.block:
+            self.blocked.set()
+            self.release.wait(5)
+
+    on_debug = on_info = on_warning = on_error = on_critical = _record
+
+
+class TestCustomHandler(object):
+    def setup(self):
+        self.plugin = StubLoggingPlugin()
+        self.batches = []
+        self._get_observers = logger_module.plugin_manager.get_observers
+        self._get_schedule = logger_module.plugin_manager.get_schedule
+
+        def get_observers(function, interface):
+            # Observers are looked up once per batch (and callback).
+            self.batches.append(function)
+            return {self.plugin.name: self.plugin}
+
+        logger_module.plugin_manager.get_observers = get_observers
+        logger_module.plugin_manager.get_schedule = \
+            lambda observers, function: observers.keys()
+        self.handlers = []
+
+    def teardown(self):
+        self.plugin.release.set()
+        for handler in self.handlers:
+            handler.close()
+        logger_module.plugin_manager.get_observers = self._get_observers
+        logger_module.plugin_manager.get_schedule = self._get_schedule
+
+    def get_logger(self, **kwargs):
+        handler = CustomHandler(**kwargs)
+        self.handlers.append(handler)
+        log = logging.Logger('microdrop.tests.test_logger')
+        log.addHandler(handler)
+        return log, handler
+
+    def block_consumer(self, log):
+        # Consumer thread blocks while dispatching first record.
+        self.plugin.block = True
+        log.info('block')
+        ok_(self.plugin.blocked.wait(5))
+        self.plugin.block = False
+
+    def test_level(self):
+        log, handler = self.get_logger(level=logging.WARNING)
+        log.debug('debug')
+        log.info('info')
+        log.warning('warning')
+        log.error('error %d', 1)
+        ok_(handler.flush())
+        eq_(self.plugin.messages, ['warning', 'error 1'])
+        eq_(handler.dropped, 0)
+
+    def test_dropped(self):
+        log, handler = self.get_logger(maxsize=2, block_timeout=.01)
+        self.block_consumer(log)
+        for i in range(3):
+            log.info('info %d', i)
+        log.warning('warning')
+        eq_(handler.dropped, 2)
+        # Consumer is blocked, so queued records are not dispatched.
+        ok_(not handler.flush(timeout=.01))
+        self.plugin.release.set()
+        ok_(handler.flush())
+        eq_(self.plugin.messages, ['block', 'info 0', 'info 1'])
+
+    def test_batches(self):
+        log, handler = self.get_logger(batch_size=3)
+        self.block_consumer(log)
+        for i in range(5):
+            log.info('info %d', i)
+        self.plugin.release.set()
+        ok_(handler.flush())
+        eq_(self.plugin.messages, ['block'] + ['info %d' % i
+                                               for i in range(5)])
+        eq_(len(self.batches), 3)
+
+    def test_consumer_thread_ignored(self):
+        log, handler = self.get_logger()
+        self.plugin.log = log
+        log.info('info')
+        ok_(handler.flush())
+        # Record logged while dispatching is not queued (i.e., not
+        # dispatched recursively).
+        eq_(self.plugin.messages, ['info'])
+        eq_(handler.dropped, 0)
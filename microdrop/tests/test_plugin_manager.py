@@ -0,0 +1,106 @@
+import threading
+import time
+
+from nose.tools import eq_, ok_
+
+from microdrop.plugin_manager import (ScheduleRequest, emit_signal_concurrent,
+                                      get_schedule_graph)
+
+
+class StubObserver(object):
+    '''
+    Observer recording calls to ``on_test``, in call order, to :data:`calls`.
+    '''
+    def __init__(self, name, calls, requests=None, threadsafe=True,
+                 delay_s=0, error=False):
+        self.name = name
+        self.calls = calls
+        self.requests = requests or []
+        if threadsafe:
+            self.threadsafe_callbacks = ['on_test']
+        self.delay_s = delay_s
+        self.error = error
+
+    def get_schedule_requests(self, function):
+        return self.requests if function == 'on_test' else []
+
+    def on_test(self, value):
+        time.sleep(self.delay_s)
+        self.calls.append((self.name, threading.current_thread()))
+        if self.error:
+            raise RuntimeError('%s failed' % self.name)
+        return value + self.name
+
+
+def observers(calls, **kwargs):
+    return {name: StubObserver(name, calls, **kwargs_i)
+            for name, kwargs_i in kwargs.items()}
+
+
+def test_get_schedule_graph():
+    result = get_schedule_graph(observers([], a={}, b={'requests':
+                                                       [ScheduleRequest('a',
+                                                                        'b'),
+                                                        ('b', 'b'),
+                                                        ('x', 'b')]},
+                                          c={'requests': [('b', 'c')]}),
+                                'on_test')
+    # Self and unknown observer requests are ignored.
+    eq_(result, {'a': set(), 'b': {'a'}, 'c': {'b'}})
+
+
+def test_emit_signal_concurrent_order():
+    calls = []
+    # `a` is slowest, but must still be called before `b`.
+    stubs = observers(calls, a={'delay_s': .1}, b={'requests': [('a', 'b')]},
+                      c={'requests': [('b', 'c')]}, d={})
+    durations = {}
+    result = emit_signal_concurrent('on_test', args=['-'], observers=stubs,
+                                    durations=durations)
+    eq_(result, {'a': '-a', 'b': '-b', 'c': '-c', 'd': '-d'})
+    order = [name for name, thread in calls]
+    ok_(order.index('a') < order.index('b') < order.index('c'))
+    # `d` does not depend on `a`, so it completes while `a` is running.
+    ok_(order.index('d') < order.index('a'))
+    eq_(sorted(durations), ['a', 'b', 'c', 'd'])
+    ok_(durations['a'] >= .1)
+
+
+def test_emit_signal_concurrent_main_thread():
+    calls = []
+    stubs = observers(calls, a={}, b={'threadsafe': False},
+                      c={'threadsafe': False, 'requests': [('a', 'c')]})
+    emit_signal_concurrent('on_test', args=['-'], observers=stubs)
+    threads = dict(calls)
+    main_thread = threading.current_thread()
+    ok_(threads['a'] is not main_thread)
+    ok_(threads['b'] is main_thread)
+    ok_(threads['c'] is main_thread)
+
+
+def test_emit_signal_concurrent_cycle():
+    calls = []
+    stubs = observers(calls, a={'requests': [('b', 'a')]},
+                      b={'requests': [('a', 'b')]}, c={})
+    durations = {}
+    result = emit_signal_concurrent('on_test', args=['-'], observers=stubs,
+                                    durations=durations)
+    # Each observer is called exactly once.
+    eq_(sorted(name for name, thread in calls), ['a', 'b', 'c'])
+    eq_(result, {'a': '-a', 'b': '-b', 'c': '-c'})
+    eq_(sorted(durations), ['a', 'b', 'c'])
+
+
+def test_emit_signal_concurrent_error():
+    calls = []
+    stubs = observers(calls, a={'error': True},
+                      b={'requests': [('a', 'b')]},
+                      c={'error': True, 'threadsafe': False},
+                      d={'requests': [('c', 'd')], 'threadsafe': False})
+    durations = {}
+    result = emit_signal_concurrent('on_test', args=['-'], observers=stubs,
+                                    durations=durations)
+    # Failed observers have no return value, but do not stop the others.
+    eq_(result, {'b': '-b', 'd': '-d'})
+    eq_(sorted(name for name, thread in calls), ['a', 'b', 'c', 'd'])
+    eq_(sorted(durations), ['a', 'b', 'c', 'd'])
@@ -1,7 +1,9 @@
 from path_helpers import path
 from nose.tools import raises
+import numpy as np
+import pandas as pd
 
-from protocol import Protocol
+from protocol import FrozenDict, Protocol, Step, freeze
 from microdrop_utility import Version
 
 def test_load_protocol():
@@ -35,3 +37,85 @@ def test_load_non_existant_protocol():
     Protocol.load(path(__file__).parent /
                    path('protocols') /
                    path('no protocol'))
+
+
+def test_insert_steps():
+    '''
+    test batch insertion of steps
+    '''
+    protocol = Protocol()
+    first_step = protocol[0]
+    step_numbers = protocol.insert_steps(0, count=3)
+    assert step_numbers == [0, 1, 2]
+    assert len(protocol) == 4
+    # Each inserted default step must be a distinct object.
+    assert len(set(map(id, protocol.steps))) == 4
+    assert protocol[3] is first_step
+
+    values = [Step(), Step()]
+    step_numbers = protocol.insert_steps(2, values=values)
+    assert step_numbers == [2, 3]
+    assert protocol.steps[2:4] == values
+
+
+def test_step_snapshot():
+    '''
+    test read-only step snapshot
+    '''
+    states = pd.Series([1, 0], index=['electrode000', 'electrode001'])
+    step = Step(plugin_data={'foo': {'electrode_states': states,
+                                     'values': [1, 2]}})
+    snapshot = step.snapshot()
+    assert isinstance(snapshot, FrozenDict)
+    assert isinstance(snapshot['foo'], FrozenDict)
+    assert snapshot['foo']['values'] == (1, 2)
+    snapshot_states = snapshot['foo']['electrode_states']
+    assert (snapshot_states == step.get_data('foo')['electrode_states']).all()
+
+    @raises(TypeError)
+    def set_item():
+        snapshot['foo']['values'] = None
+
+    @raises(ValueError)
+    def set_state():
+        snapshot_states['electrode000'] = 0
+
+    set_item()
+    set_state()
+    # Original step data must remain writeable.
+    step.get_data('foo')['electrode_states']['electrode000'] = 0
+    assert snapshot_states['electrode000'] == 0
+
+
+def test_freeze_mixed_dtypes():
+    '''
+    test read-only view of data frame with mixed column dtypes
+    '''
+    df = pd.DataFrame({'id': ['a', 'b'], 'i': [1, 2], 'x': [.5, 1.5]},
+                      columns=['id', 'i', 'x'])
+    frozen = freeze(df)
+    assert frozen.dtypes.tolist() == df.dtypes.tolist()
+    assert frozen.equals(df)
+    for column in df.columns:
+        assert np.shares_memory(frozen[column].values, df[column].values)
+
+    @raises(ValueError)
+    def set_value():
+        frozen.iloc[0, 1] = 0
+
+    set_value()
+    # Original frame must remain writeable.
+    df.iloc[0, 1] = 0
+    assert frozen.iloc[0, 1] == 0
+
+
+def test_freeze_tz_aware():
+    '''
+    test time zone aware series is copied with time zone
+    '''
+    times = pd.Series(pd.date_range('2020-01-01', periods=2, tz='UTC'))
+    frozen = freeze(times)
+    assert frozen.dtype == times.dtype
+    assert frozen.equals(times)
+    frozen_frame = freeze(pd.DataFrame({'time': times}))
+    assert frozen_frame['time'].dtype == times.dtype
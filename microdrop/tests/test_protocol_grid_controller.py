@@ -0,0 +1,115 @@
+from nose.tools import eq_, ok_
+
+from microdrop import app_context
+from microdrop.gui import protocol_grid_controller
+from microdrop.gui.protocol_grid_controller import (LazyCombinedRow,
+                                                    ProtocolGridController,
+                                                    ProtocolGridView)
+from microdrop.protocol import Protocol
+
+
+class StubGridView(list):
+    '''
+    List of rows with the row bookkeeping of :class:`ProtocolGridView`, i.e.,
+    without creating a GTK widget (no display required).
+    '''
+    insert_rows = ProtocolGridView.__dict__['insert_rows']
+    remove_rows = ProtocolGridView.__dict__['remove_rows']
+
+    def __init__(self):
+        self._defer_row_ids = False
+        self.resets = 0
+
+    def reset_row_ids(self):
+        # Same as `ProtocolGridView.reset_row_ids()`, followed by
+        # `CombinedFields.reset_row_ids()`.
+        if not self._defer_row_ids:
+            self.resets += 1
+            for i, combined_row in enumerate(self):
+                combined_row.set_row_fields_attr('__DefaultFields', 'id',
+                                                 i + 1)
+
+
+class StubProtocolController(object):
+    def __init__(self):
+        self.protocol_state = {'step_number': 0}
+
+    def goto_step(self, step_number):
+        self.protocol_state['step_number'] = step_number
+
+
+class StubApp(object):
+    def __init__(self, protocol):
+        self.protocol = protocol
+        self.protocol_controller = StubProtocolController()
+
+
+class StubGridController(object):
+    _check_row_count = ProtocolGridController.__dict__['_check_row_count']
+
+    def __init__(self, widget):
+        self.widget = widget
+        self.updates = 0
+
+    def update_grid(self):
+        self.updates += 1
+
+
+class TestProtocolGridRows(object):
+    def setup(self):
+        self.protocol = Protocol()
+        self.protocol.insert_steps(0, count=3)
+        self.grid = StubGridView()
+        self.grid.insert_rows(range(len(self.protocol)))
+        # Step corresponding to each row when row was inserted.
+        self.row_steps = {}
+        self._track_rows()
+        self.app = StubApp(self.protocol)
+        self._get_app = (app_context.get_app,
+                         protocol_grid_controller.get_app)
+        app_context.get_app = protocol_grid_controller.get_app = \
+            lambda: self.app
+
+    def teardown(self):
+        app_context.get_app, protocol_grid_controller.get_app = self._get_app
+
+    def _track_rows(self):
+        for row in self.grid:
+            if id(row) not in self.row_steps:
+                self.row_steps[id(row)] = self.protocol[row.step_number]
+
+    def check_rows(self):
+        eq_(len(self.grid), len(self.protocol))
+        eq_([row.step_number for row in self.grid],
+            range(len(self.protocol)))
+        for row in self.grid:
+            ok_(self.protocol[row.step_number] is self.row_steps[id(row)])
+
+    def test_insert_rows(self):
+        eq_(self.grid.resets, 1)
+        self.check_rows()
+        ok_(all(isinstance(row, LazyCombinedRow) for row in self.grid))
+        step_numbers = self.protocol.insert_steps(1, count=2)
+        self.grid.insert_rows(step_numbers)
+        self._track_rows()
+        # Row IDs are reset once per batch.
+        eq_(self.grid.resets, 2)
+        self.check_rows()
+
+    def test_remove_rows(self):
+        self.protocol.insert_steps(3, count=2)
+        self.grid.insert_rows([3, 4])
+        self._track_rows()
+        self.protocol.delete_steps([0, 2, 3])
+        self.grid.remove_rows([0, 2, 3])
+        eq_(self.grid.resets, 3)
+        self.check_rows()
+
+    def test_check_row_count(self):
+        controller = StubGridController(self.grid)
+        controller._check_row_count()
+        eq_(controller.updates, 0)
+        # Step inserted without a corresponding row.
+        self.protocol.insert_steps(0, count=1)
+        controller._check_row_count()
+        eq_(controller.updates, 1)
@@ -0,0 +1,135 @@
+import threading
+import time
+import Queue
+
+from nose.tools import eq_
+import pandas as pd
+import trollius as asyncio
+
+from microdrop.core_plugins.protocol_controller import realtime
+from microdrop.core_plugins.protocol_controller.execution_loop import \
+    ExecutionLoop
+from microdrop.core_plugins.protocol_controller.realtime import \
+    ELECTRODE_CONTROLLER, RealtimeStepScheduler, \
+    electrode_states_only_changed
+
+
+def step(states, voltage=100):
+    return {ELECTRODE_CONTROLLER: {'Voltage (V)': voltage,
+                                   'electrode_states':
+                                   pd.Series(1, index=states)},
+            'other_plugin': {'values': pd.Series([1, 2])}}
+
+
+def test_electrode_states_only_changed():
+    assert electrode_states_only_changed(step(['a']), step(['a', 'b']))
+    assert not electrode_states_only_changed(step(['a']),
+                                             step(['a', 'b'], voltage=90))
+    other = step(['a'])
+    other['other_plugin'] = {'values': pd.Series([1, 3])}
+    assert not electrode_states_only_changed(step(['a']), other)
+
+
+def wait_for(predicate, timeout_s=5.):
+    start = time.time()
+    while not predicate():
+        assert time.time() - start < timeout_s, 'Timed out.'
+        time.sleep(.001)
+
+
+class StubSteps(object):
+    '''
+    Stub for :func:`realtime.execute_step`, where each step runs until
+    :attr:`done` is set, and electrode state updates are recorded.
+    '''
+    def __init__(self):
+        self.started = []
+        self.updates = []
+        self.done = threading.Event()
+
+    @asyncio.coroutine
+    def execute_step(self, plugin_kwargs, signals=None):
+        def _on_updated(sender, electrode_states=None):
+            self.updates.append(electrode_states)
+            return False
+
+        signals.signal('electrode-states-updated').connect(_on_updated,
+                                                           weak=False)
+        self.started.append(plugin_kwargs)
+        while not self.done.is_set():
+            yield asyncio.From(asyncio.sleep(.001))
+
+
+class SchedulerTest(object):
+    def setup(self):
+        self.steps = StubSteps()
+        self.execute_step = realtime.execute_step
+        realtime.execute_step = self.steps.execute_step
+        self.execution_loop = ExecutionLoop(name='test-realtime')
+        self.queue = Queue.Queue()
+        self.scheduler = RealtimeStepScheduler(self.execution_loop,
+                                               self.queue)
+
+    def teardown(self):
+        self.steps.done.set()
+        self.execution_loop.stop(timeout=5)
+        realtime.execute_step = self.execute_step
+
+    def block_loop(self):
+        '''
+        Block event loop until returned event is set.
+        '''
+        blocked = threading.Event()
+        release = threading.Event()
+
+        @asyncio.coroutine
+        def _block():
+            blocked.set()
+            release.wait()
+
+        self.execution_loop.submit(_block)
+        blocked.wait()
+        return release
+
+
+class TestRealtimeStepScheduler(SchedulerTest):
+    def test_first_request_starts_step(self):
+        state = step(['a'])
+        self.scheduler.request(state)
+        wait_for(lambda: self.scheduler.counts['started'] == 1)
+        assert self.steps.started[0] is state
+        eq_(self.scheduler.counts['dropped'], 0)
+
+    def test_burst_before_start_coalesced(self):
+        release = self.block_loop()
+        states = [step(['a'], voltage=v) for v in (90, 100, 110)]
+        for state_i in states:
+            self.scheduler.request(state_i)
+        release.set()
+        wait_for(lambda: self.scheduler.counts['started'] == 1)
+        # Only most recent state is executed.
+        assert self.steps.started[0] is states[-1]
+        eq_(self.scheduler.counts['requested'], 3)
+        eq_(self.scheduler.counts['dropped'], 2)
+
+    def test_electrode_states_update(self):
+        self.scheduler.request(step(['a']))
+        wait_for(lambda: self.scheduler.counts['started'] == 1)
+        self.scheduler.request(step(['a', 'b']))
+        wait_for(lambda: self.scheduler.counts['updates'] == 1)
+        # Running step is updated, i.e., not restarted.
+        eq_(len(self.steps.started), 1)
+        eq_(self.steps.updates[0].index.tolist(), ['a', 'b'])
+
+    def test_cancel_before_start(self):
+        release = self.block_loop()
+        self.scheduler.request(step(['a'], voltage=90))
+        # Cancel step before it starts (see `ProtocolController.cancel_steps`).
+        while not self.queue.empty():
+            self.execution_loop.cancel(self.queue.get_nowait())
+        release.set()
+        state = step(['a'])
+        for i in range(3):
+            self.scheduler.request(state)
+        wait_for(lambda: self.scheduler.counts['started'] == 1)
+        assert self.steps.started[0] is state
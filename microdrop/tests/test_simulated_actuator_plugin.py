@@ -0,0 +1,120 @@
+import timeit
+
+from nose.tools import eq_, ok_, raises
+import blinker
+import pandas as pd
+import trollius as asyncio
+
+from microdrop.core_plugins.simulated_actuator_plugin import (
+    SimulatedActuationError, SimulatedActuatorPlugin)
+
+
+class TestSimulatedActuatorPlugin(object):
+    def setup(self):
+        # Note: `asyncio.sleep()` schedules on the current thread's loop.
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        # Plugin is a singleton, so reset state of shared instance.
+        self.plugin = SimulatedActuatorPlugin()
+        self.plugin.__init__()
+        self.plugin.configure(time_scale=0, seed=0)
+        self.states = pd.Series([1, 0, 1], index=['electrode000',
+                                                  'electrode001',
+                                                  'electrode002'])
+
+    def teardown(self):
+        asyncio.set_event_loop(None)
+        self.loop.close()
+
+    def _run(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def test_trace(self):
+        self.plugin.configure(electrode_ids=['electrode000'])
+        self.plugin.set_voltage(100)
+        self.plugin.set_frequency(10e3)
+        actuated = self._run(self.plugin.on_actuation_request(self.states,
+                                                             duration_s=1))
+        eq_(actuated, ['electrode000'])
+        eq_(len(self.plugin.trace), 1)
+        record = self.plugin.trace[0]
+        eq_(record['requested'], ['electrode000', 'electrode002'])
+        eq_(record['actuated'], ['electrode000'])
+        eq_((record['duration_s'], record['voltage'], record['frequency'],
+             record['failed']), (1, 100, 10e3, False))
+        ok_(record['start'] <= record['end'])
+        eq_(self.plugin.trace_frame().shape[0], 1)
+        self.plugin.clear_trace()
+        eq_(self.plugin.trace, [])
+
+    def test_delta_trace(self):
+        self._run(self.plugin.on_actuation_delta_request(self.states))
+        states = pd.Series([False, True], index=['electrode000',
+                                                 'electrode001'])
+        actuated = self._run(self.plugin.on_actuation_delta_request(states))
+        eq_(actuated, ['electrode001', 'electrode002'])
+        actuated = self._run(self.plugin
+                            .on_actuation_delta_request(states, full=True))
+        eq_(actuated, ['electrode001'])
+        eq_(len(self.plugin.trace), 3)
+
+    def test_failure_rate(self):
+        self.plugin.configure(failure_rate=0)
+        for i in range(10):
+            self._run(self.plugin.on_actuation_request(self.states))
+        self.plugin.configure(failure_rate=1)
+        for i in range(10):
+            try:
+                self._run(self.plugin.on_actuation_request(self.states))
+            except SimulatedActuationError:
+                pass
+            else:
+                raise AssertionError('Actuation did not fail.')
+        # Failed actuations are also recorded.
+        eq_([record['failed'] for record in self.plugin.trace],
+            10 * [False] + 10 * [True])
+
+    @raises(ValueError)
+    def test_invalid_failure_rate(self):
+        self.plugin.configure(failure_rate=1.5)
+
+    def test_time_scale(self):
+        self.plugin.configure(latency_s=10, jitter_s=10)
+        start = timeit.default_timer()
+        self._run(self.plugin.on_actuation_request(self.states,
+                                                  duration_s=100))
+        # Simulated delays are not waited for.
+        ok_(timeit.default_timer() - start < 1)
+
+        self.plugin.configure(latency_s=.05, jitter_s=0, time_scale=1)
+        start = timeit.default_timer()
+        self._run(self.plugin.on_actuation_request(self.states,
+                                                  duration_s=.05))
+        ok_(timeit.default_timer() - start >= .1)
+
+    def test_waveform_signals(self):
+        signals = blinker.Namespace()
+        self._run(self.plugin.on_step_run({}, signals))
+        ok_(signals.signal('on-actuation-request').receivers)
+        ok_(not signals.signal('on-actuation-delta-request').receivers)
+
+        for key, value in (('voltage', 90), ('frequency', 5e3)):
+            responses = signals.signal('set-%s' % key).send(value)
+            eq_([self._run(coro_i) for receiver_i, coro_i in responses],
+                [value])
+            eq_(getattr(self.plugin, key), value)
+
+        responses = signals.signal('on-actuation-request')\
+            .send(self.states, duration_s=0)
+        eq_([self._run(coro_i) for receiver_i, coro_i in responses],
+            [['electrode000', 'electrode002']])
+
+    def test_delta_signals(self):
+        self.plugin.configure(delta=True)
+        signals = blinker.Namespace()
+        self._run(self.plugin.on_step_run({}, signals))
+        ok_(not signals.signal('on-actuation-request').receivers)
+        responses = signals.signal('on-actuation-delta-request')\
+            .send(self.states, full=True)
+        eq_([self._run(coro_i) for receiver_i, coro_i in responses],
+            [['electrode000', 'electrode002']])
@@ -0,0 +1,29 @@
+from nose.tools import eq_
+
+from microdrop.step_timing import StepTimingRecorder
+
+
+def test_step_timing_ring_buffer():
+    recorder = StepTimingRecorder(size=10)
+    for i in range(20):
+        recorder.start_step(i)
+    eq_(len(recorder), 10)
+    eq_(recorder.frame().step.tolist(), range(10, 20))
+
+
+def test_step_timing_histograms():
+    recorder = StepTimingRecorder()
+    for i in range(3):
+        recorder.start_step(i)
+        for plugin_i in ('a', 'b'):
+            recorder.record('on_step_run', plugin=plugin_i, phase='start')
+            recorder.record('on_step_run', plugin=plugin_i, phase='end')
+        recorder.record('step-completed')
+
+    df_latencies = recorder.latencies()
+    eq_(df_latencies.shape[0], 6)
+    assert (df_latencies.duration_s >= 0).all()
+
+    histograms = recorder.histograms(bin_edges=[0, 1, 2])
+    eq_(sorted(histograms['on_step_run']), ['a', 'b'])
+    eq_(histograms['on_step_run']['a']['counts'], [3, 0])
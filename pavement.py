@@ -15,8 +15,9 @@ install_requires = ['application_repository>=0.5', 'blinker', 'configobj',
                     'matplotlib>=1.5.0',
                     'microdrop-device-converter>=0.1.post5',
                     'microdrop-plugin-template>=1.1.post30',
-                    'microdrop_utility>=0.4.post2', 'networkx',
-                    'openpyxl', 'pandas>=0.17.1', 'path-helpers>=0.2.post4',
+                    'microdrop_utility>=0.4.post2', 'msgpack>=0.5.2',
+                    'networkx', 'openpyxl', 'pandas>=0.17.1',
+                    'path-helpers>=0.2.post4',
                     'paver>=1.2.4', 'pip-helpers>=0.6',
                     'pygtk_textbuffer_with_undo', 'pyparsing',
                     'pyutilib.component.core>=4.4.1',